@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import numpy as np
 
+from core.catalog import load_catalog
+
 
 # ============================================================================
 # GÉNÉRATEUR DE PROMPTS POUR ILLUSTRATIONS
@@ -237,13 +239,7 @@ class AssetGenerator:
 
     def load_cards_database(self) -> Dict:
         """Charge la base de données des cartes"""
-        # Simuler le chargement depuis cards.json
-        return {
-            "forest_spine_frog": {"name": "Grenouille Épineuse", "biome": "forest"},
-            "forest_azure_spider": {"name": "Mygale d'Azur", "biome": "forest"},
-            "dunes_solar_fennec": {"name": "Fennec Solaire", "biome": "dunes"},
-            # ... toutes les cartes
-        }
+        return load_catalog().records
 
     def save_prompts_to_file(self, prompts: List[CardPrompt]):
         """Sauvegarde tous les prompts dans des fichiers"""
@@ -369,18 +365,8 @@ class PlaceholderGenerator:
         img.save(output_path)
 
     def load_cards_database(self) -> Dict:
-        """Charge la base de données simplifiée"""
-        # Ici on devrait charger depuis cards.json
-        # Pour l'exemple, on retourne quelques cartes
-        return {
-            f"card_{i}": {
-                "name": f"Carte {i}",
-                "biome": ["forest", "dunes", "cliffs", "river", "volcano", "ruins"][i % 6],
-                "atk": (i % 5) + 1,
-                "dur": (i % 7) + 2
-            }
-            for i in range(100)
-        }
+        """Charge la base de données des cartes"""
+        return load_catalog().records
 
 
 # ============================================================================
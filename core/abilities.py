@@ -0,0 +1,69 @@
+# core/abilities.py
+"""Compilation des capacités de cartes en instructions - plus de dictionnaires en combat"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from entities import StatusEffect, STATUS_INDEX, ABILITIES
+
+
+class Op(IntEnum):
+    """Opérations d'une capacité compilée"""
+    STATUS = 0  # Altération sur la cible
+    SHIELD = 1  # Boucliers pour la cible
+    SHIELD_BACK_ALLY = 2  # Déploiement: boucliers au premier allié de la ligne arrière
+    BUFF_ALLIES = 3  # Déploiement: ATQ pour tous les autres alliés
+
+
+# (opération, statut, valeur, indice du statut) - forme unique pour un dépaquetage direct
+Instruction = Tuple[Op, Optional[StatusEffect], int, int]
+Program = Tuple[Instruction, ...]
+
+
+@dataclass(frozen=True)
+class CompiledAbilities:
+    """Programmes des déclencheurs d'un modèle de carte"""
+    on_deploy: Program = ()
+    on_attack: Program = ()
+    on_hit: Program = ()
+    on_death: Program = ()
+
+
+def compile_effect(effect_data: Dict[str, Any], trigger: str) -> Program:
+    """Instructions d'une définition d'effet, dans l'ordre où le moteur les applique.
+
+    Pour on_attack / on_hit / on_death: l'altération ('effect', ignorée si ce
+    n'est pas un StatusEffect) puis les boucliers ('type': 'shield').
+    Pour on_deploy: 'shield_ally' (cible 'back' uniquement) et 'buff_allies'.
+    """
+    effect_type = effect_data.get('type')
+
+    if trigger == 'on_deploy':
+        if effect_type == 'shield_ally' and effect_data.get('target', 'back') == 'back':
+            return ((Op.SHIELD_BACK_ALLY, None, effect_data.get('value', 1), -1),)
+        if effect_type == 'buff_allies':
+            return ((Op.BUFF_ALLIES, None, effect_data.get('atk', 0), -1),)
+        return ()
+
+    program = []
+    value = effect_data.get('value', 1)
+    status = effect_data.get('effect')
+    if isinstance(status, StatusEffect):
+        program.append((Op.STATUS, status, value, STATUS_INDEX[status]))
+    if effect_type == 'shield':
+        program.append((Op.SHIELD, None, value, -1))
+    return tuple(program)
+
+
+def compile_ability(effects: Iterable[Dict[str, Any]], trigger: str) -> Program:
+    """Programme d'un déclencheur (les instructions de ses effets, bout à bout)"""
+    return tuple(instruction for effect_data in effects
+                 for instruction in compile_effect(effect_data, trigger))
+
+
+def compile_template(template: Any) -> CompiledAbilities:
+    """Compile les quatre déclencheurs d'un CardTemplate"""
+    return CompiledAbilities(**{
+        ability: compile_ability(getattr(template, ability), ability) for ability in ABILITIES
+    })
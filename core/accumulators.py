@@ -0,0 +1,118 @@
+# core/accumulators.py
+"""Accumulateurs statistiques en ligne, fusionnables entre processus"""
+
+from dataclasses import dataclass, field
+from math import sqrt
+from typing import Tuple
+
+
+# Quantile normal des intervalles à 95%
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> Tuple[float, float]:
+    """Intervalle de Wilson d'une proportion (reste dans [0, 1], même à 0 ou n succès)"""
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    z2 = z * z
+    denominator = 1 + z2 / trials
+    center = (p + z2 / (2 * trials)) / denominator
+    margin = z * sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / denominator
+    low = 0.0 if successes == 0 else max(0.0, center - margin)
+    high = 1.0 if successes == trials else min(1.0, center + margin)
+    return low, high
+
+
+@dataclass
+class RunningStat:
+    """Moyenne et variance d'observations entières, en une passe.
+
+    Les moments sont gardés en entiers exacts (effectif, somme, somme des
+    carrés): la variance n'a pas l'annulation catastrophique de la formule
+    naïve en flottants, comme avec Welford, et la fusion de deux agrégats
+    partiels est exacte, si bien qu'un calcul découpé entre processus donne
+    bit pour bit le résultat série.
+    """
+    count: int = 0
+    total: int = 0
+    total_sq: int = 0
+
+    def add(self, value: int):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+
+    def merge(self, other: 'RunningStat'):
+        """Ajoute les observations d'un autre agrégat"""
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def subtract(self, other: 'RunningStat'):
+        """Retire des observations déjà ajoutées (exact: moments entiers)"""
+        self.count -= other.count
+        self.total -= other.total
+        self.total_sq -= other.total_sq
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Variance d'échantillon (n - 1), calculée en entiers puis divisée une fois"""
+        n = self.count
+        if n < 2:
+            return 0.0
+        return (n * self.total_sq - self.total * self.total) / (n * (n - 1))
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    def interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """Intervalle de confiance normal de la moyenne"""
+        margin = z * sqrt(self.variance / self.count) if self.count else float('inf')
+        return self.mean - margin, self.mean + margin
+
+
+@dataclass
+class CardAccumulator:
+    """Agrégats partiels d'une carte sur des combats (un par carte du deck joueur)"""
+    wins: int = 0
+    survived: int = 0
+    damage_dealt: RunningStat = field(default_factory=RunningStat)
+    damage_taken: RunningStat = field(default_factory=RunningStat)
+
+    @property
+    def played(self) -> int:
+        return self.damage_dealt.count
+
+    @property
+    def losses(self) -> int:
+        return self.played - self.wins
+
+    def add(self, won: bool, survived: bool, damage_dealt: int, damage_taken: int):
+        self.wins += won
+        self.survived += survived
+        self.damage_dealt.add(damage_dealt)
+        self.damage_taken.add(damage_taken)
+
+    def merge(self, other: 'CardAccumulator'):
+        """Ajoute les combats d'un autre agrégat (ex: celui d'un processus)"""
+        self.wins += other.wins
+        self.survived += other.survived
+        self.damage_dealt.merge(other.damage_dealt)
+        self.damage_taken.merge(other.damage_taken)
+
+    def subtract(self, other: 'CardAccumulator'):
+        """Retire des combats déjà ajoutés (ex: combats resimulés)"""
+        self.wins -= other.wins
+        self.survived -= other.survived
+        self.damage_dealt.subtract(other.damage_dealt)
+        self.damage_taken.subtract(other.damage_taken)
+
+    def win_interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """Intervalle de Wilson du taux de victoire"""
+        return wilson_interval(self.wins, self.played, z)
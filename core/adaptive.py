@@ -0,0 +1,221 @@
+# core/adaptive.py
+"""Balayage d'équilibrage adaptatif: échantillonnage préférentiel des cartes incertaines"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import random
+
+import numpy as np
+
+from entities import Card
+from accumulators import wilson_interval
+from balance import CombatSimulator, CardStatistics, card_damage_dealt
+from rng import RngStreams
+
+
+@dataclass
+class CardEstimate:
+    """Estimation repondérée d'une carte sous la génération uniforme"""
+    card_id: str
+    win_rate: float
+    interval: Tuple[float, float]  # Wilson à 95% sur l'effectif efficace
+    effective_samples: float
+    plays: int
+
+
+# Sommes pondérées tenues par carte et par groupe (colonnes de AdaptiveSweep.sums)
+_W, _W2, _W_WON, _W_SURVIVED, _W_DEALT, _W_TAKEN = range(6)
+# Groupes: carte tirée selon q (tête du deck), carte tirée uniformément
+_HEAD, _OTHER = range(2)
+
+
+class AdaptiveSweep:
+    """Balayage qui concentre les combats sur les cartes mal connues.
+
+    La cible est la génération uniforme: deck_size cartes tirées avec remise
+    dans pool. Chaque tour de run() tire la première carte de chaque deck
+    selon une proposition q qui favorise les cartes dont l'intervalle du taux
+    de victoire est large, surtout s'il contient un seuil de
+    identify_problematic_cards; les autres restent uniformes.
+
+    Pour la carte de tête, tirée selon q, les partenaires suivent déjà la loi
+    cible: l'observation pèse 1. Pour les autres cartes du deck, seul le
+    partenaire de tête dévie de la cible: l'observation pèse
+    w = 1/(n·q[tête]). Chaque groupe donne une moyenne autonormalisée qui
+    vise la valeur de la génération uniforme quelle que soit q; les deux
+    sont combinées selon leurs effectifs efficaces (Σw)²/Σw². Un combat
+    supplémentaire sur une carte incertaine compte donc plein pour elle, et
+    le mélange avec l'uniforme (mixing) borne les poids des autres.
+    """
+
+    def __init__(self, simulator: CombatSimulator, pool: Sequence[Card],
+                 enemy_deck_generator: Callable[..., List[Card]], deck_size: int = 8,
+                 act: int = 1, threshold: float = 0.65, mixing: float = 0.2,
+                 batch_size: Optional[int] = None, seed: Optional[int] = None):
+        if not pool:
+            raise ValueError("Le pool de cartes est vide")
+        if not 0 < mixing <= 1:
+            raise ValueError("mixing doit être dans ]0, 1]")
+
+        self.simulator = simulator
+        self.pool = list(pool)
+        self.enemy_deck_generator = enemy_deck_generator
+        self.deck_size = deck_size
+        self.act = act
+        self.threshold = threshold
+        self.mixing = mixing
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+
+        self.ids = sorted({card.id for card in self.pool})
+        self._code = {card_id: i for i, card_id in enumerate(self.ids)}
+        self._slots = [self._code[card.id] for card in self.pool]
+        self.sums = np.zeros((len(self.ids), 2, 6))
+        self.plays = np.zeros(len(self.ids), dtype=np.int64)
+        self.proposal = np.full(len(self.pool), 1 / len(self.pool))
+        self.combats = 0
+
+    def run(self, num_simulations: int, round_size: int = 500,
+            target_width: Optional[float] = None) -> Dict[str, CardEstimate]:
+        """Joue au plus num_simulations combats par tours de round_size.
+
+        La proposition est recalculée après chaque tour; avec target_width,
+        le balayage s'arrête quand tous les intervalles sont assez étroits.
+        Les statistiques du simulateur (card_stats) reçoivent les estimations
+        repondérées.
+        """
+        remaining = num_simulations
+        while remaining > 0:
+            count = min(round_size, remaining)
+            self._play_round(count)
+            remaining -= count
+            self.proposal = self._next_proposal()
+
+            if target_width is not None and self.max_width() <= target_width:
+                break
+
+        self._update_card_stats()
+        return self.estimates()
+
+    def estimates(self) -> Dict[str, CardEstimate]:
+        """Taux de victoire repondérés des cartes jouées"""
+        estimates = {}
+        for code, card_id in enumerate(self.ids):
+            if not self.plays[code]:
+                continue
+            means, effective = self._means(code)
+            rate = means[_W_WON]
+            estimates[card_id] = CardEstimate(
+                card_id, rate, wilson_interval(rate * effective, effective),
+                effective, int(self.plays[code])
+            )
+        return estimates
+
+    def _means(self, code: int) -> Tuple[np.ndarray, float]:
+        """Moyennes (indexées comme les colonnes) et effectif efficace d'une carte"""
+        sums = self.sums[code]
+        weight = sums[:, _W]
+        played = weight > 0
+        effective = np.zeros(2)
+        effective[played] = weight[played] ** 2 / sums[played, _W2]
+        means = np.zeros(6)
+        for group in np.flatnonzero(played):
+            means += effective[group] * sums[group] / weight[group]
+        return means / effective.sum(), float(effective.sum())
+
+    def max_width(self) -> float:
+        """Plus grande largeur d'intervalle (1 si une carte n'a jamais été jouée)"""
+        widths = self._widths()
+        return float(widths.max())
+
+    # ------------------------------------------------------------------
+    # Tours
+    # ------------------------------------------------------------------
+
+    def _play_round(self, count: int):
+        uniform = 1 / len(self.pool)
+        indices = range(len(self.pool))
+
+        matchups, weights, decks = [], [], []
+        for _ in range(count):
+            # Premier emplacement selon q, les autres uniformes
+            focus = self.rng.choices(indices, weights=self.proposal)[0]
+            picks = [focus] + self.rng.choices(indices, k=self.deck_size - 1)
+            deck = [self.pool[i].clone() for i in picks]
+            enemies = self.enemy_deck_generator(
+                self.act, rng=random.Random(self.rng.getrandbits(64))
+            )
+            matchups.append((deck, enemies))
+            weights.append(uniform / self.proposal[focus])
+            decks.append(picks)
+
+        # Flux Philox d'une graine par tour: combats sans graines en collision
+        seeds = RngStreams(self.rng.getrandbits(64)).streams(0, count)
+        if self.batch_size:
+            results = []
+            for start in range(0, count, self.batch_size):
+                results.extend(self.simulator.simulate_combat_batch(
+                    matchups[start:start + self.batch_size],
+                    seeds=seeds[start:start + self.batch_size]
+                ))
+        else:
+            results = [self.simulator.simulate_combat(deck, enemies, rng_seed=seed)
+                       for (deck, enemies), seed in zip(matchups, seeds)]
+
+        for (deck, _), picks, weight, result in zip(matchups, decks, weights, results):
+            won = result.winner == "player"
+            dealt = card_damage_dealt(deck, result)
+            # Une ligne par carte du deck, comme les statistiques non pondérées
+            for position, (card, slot, damage) in enumerate(zip(deck, picks, dealt)):
+                # La carte tirée selon q voit des partenaires uniformes: poids 1
+                w = weight if position else 1.0
+                code = self._slots[slot]
+                row = self.sums[code, _OTHER if position else _HEAD]
+                row[_W] += w
+                row[_W_WON] += w * won
+                row[_W2] += w * w
+                row[_W_SURVIVED] += w * (card.current_dur > 0)
+                row[_W_DEALT] += w * damage
+                row[_W_TAKEN] += w * (card.base_dur - card.current_dur)
+                self.plays[code] += 1
+        self.combats += count
+
+    def _widths(self) -> np.ndarray:
+        widths = np.ones(len(self.ids))
+        for code, estimate in enumerate(self.estimates().get(card_id) for card_id in self.ids):
+            if estimate is not None:
+                widths[code] = estimate.interval[1] - estimate.interval[0]
+        return widths
+
+    def _next_proposal(self) -> np.ndarray:
+        """Proposition pour le prochain tour.
+
+        La priorité d'une carte est le gain de variance d'une observation de
+        plus, largeur² / effectif, doublée si l'intervalle contient un seuil.
+        """
+        priority = np.ones(len(self.ids))
+        for card_id, estimate in self.estimates().items():
+            low, high = estimate.interval
+            code = self._code[card_id]
+            priority[code] = (high - low) ** 2 / max(estimate.effective_samples, 1.0)
+            if low < self.threshold < high or low < 1 - self.threshold < high:
+                priority[code] *= 2
+
+        # Répartie entre les exemplaires d'une carte dans le pool
+        copies = np.bincount(self._slots, minlength=len(self.ids))
+        per_slot = priority[self._slots] / copies[self._slots]
+        return (1 - self.mixing) * per_slot / per_slot.sum() + self.mixing / len(self.pool)
+
+    def _update_card_stats(self):
+        for card_id, estimate in self.estimates().items():
+            means, _ = self._means(self._code[card_id])
+            self.simulator.card_stats[card_id] = CardStatistics(
+                card_id=card_id,
+                win_rate=estimate.win_rate,
+                avg_damage_dealt=means[_W_DEALT],
+                avg_damage_taken=means[_W_TAKEN],
+                avg_survival_rate=means[_W_SURVIVED],
+                avg_turns_alive=0.0,  # Non suivi par le balayage
+                usage_count=estimate.plays,
+                win_rate_interval=estimate.interval
+            )
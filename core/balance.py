@@ -2,16 +2,28 @@
 """Système d'équilibrage et simulateur de combat"""
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass, field
 import random
 import json
-from collections import defaultdict
+import inspect
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 import matplotlib.pyplot as plt
 import pandas as pd
 
-from entities import Card, Biome, Rarity, StatusEffect, Keyword
+from entities import Card, Biome, Rarity, StatusEffect, Keyword, STATUS_INDEX
 from combat import CombatResolver, CombatState
+from batch_combat import BatchCombatEngine, ONGOING, VICTORY, initial_state
+from events import CombatEventLog, LogLevel
+from policies import PlayPolicy, GreedyPolicy
+from endgame import EndgameSolver, is_endgame
+from result_store import ResultStore, card_damage_dealt
+from accumulators import CardAccumulator, Z_95
+from synergy import SynergyMatrix
+from rng import PhiloxRandom, RngStreams, Purpose
 
 
 @dataclass
@@ -25,7 +37,9 @@ class SimulationResult:
     enemy_cards_lost: int
     player_final_presence: int
     enemy_final_presence: int
-    combat_log: List[str] = field(default_factory=list)
+    # Dégâts infligés par carte du deck joueur, dans l'ordre du deck (journalisé seulement)
+    card_damage: Optional[Tuple[int, ...]] = None
+    events: Optional[CombatEventLog] = None  # Seulement si le simulateur journalise
 
 
 @dataclass
@@ -39,6 +53,8 @@ class CardStatistics:
     avg_turns_alive: float
     usage_count: int
     synergy_scores: Dict[str, float] = field(default_factory=dict)
+    win_rate_interval: Tuple[float, float] = (0.0, 1.0)  # Wilson à 95%
+    damage_dealt_std: float = 0.0
 
     def power_score(self) -> float:
         """Calcule un score de puissance global"""
@@ -53,23 +69,35 @@ class CardStatistics:
 class CombatSimulator:
     """Simulateur de combat pour l'équilibrage"""
 
-    def __init__(self, seed: Optional[int] = None):
+    def __init__(self, seed: Optional[int] = None, log_level: LogLevel = LogLevel.OFF,
+                 policy: Optional[PlayPolicy] = None, endgame_shortcut: bool = True):
         self.rng = random.Random(seed)
+        self.log_level = log_level
+        self.policy = policy or GreedyPolicy()
+        # Fin de combat résolue d'un bloc une fois la main vide (sans journal seulement)
+        self.endgame = EndgameSolver() if endgame_shortcut else None
         self.results: List[SimulationResult] = []
         self.card_stats: Dict[str, CardStatistics] = {}
+        self.synergy = SynergyMatrix()
+        # Agrégats derrière card_stats quand ils couvrent tout un magasin (voir resimulate)
+        self.card_accumulators: Optional[Dict[str, CardAccumulator]] = None
 
     def simulate_combat(
             self,
             player_deck: List[Card],
             enemy_deck: List[Card],
-            max_turns: int = 20
+            max_turns: int = 20,
+            rng_seed: Optional[Any] = None
     ) -> SimulationResult:
-        """Simule un combat complet"""
+        """Simule un combat complet (rng_seed: graine entière ou flux rng.PhiloxRandom)"""
+
+        if rng_seed is None:
+            rng_seed = PhiloxRandom(self.rng.getrandbits(64))
 
         # Créer l'état de combat
         state = CombatState()
         state.deck = player_deck.copy()
-        resolver = CombatResolver(state, rng_seed=self.rng.randint(0, 999999))
+        resolver = CombatResolver(state, rng_seed=rng_seed, log_level=self.log_level)
 
         # Placer les ennemis
         for i, enemy in enumerate(enemy_deck[:6]):
@@ -77,6 +105,7 @@ class CombatSimulator:
 
         # Démarrer le combat
         resolver.start_combat()
+        self.policy.begin_combat(resolver, state, rng_seed)
 
         # Tracking
         initial_player_presence = sum(c.current_dur for c in player_deck)
@@ -84,16 +113,21 @@ class CombatSimulator:
         player_damage_dealt = 0
         enemy_damage_dealt = 0
 
-        # Simuler les tours
+        # Simuler les tours (le terrain joueur est vide avant le premier
+        # déploiement: on ne teste la fin du combat qu'après chaque tour)
         turn_count = 0
-        while turn_count < max_turns and state.is_combat_over() is None:
-            turn_count += 1
+        while turn_count < max_turns:
+            if self.endgame is not None and not self.log_level and is_endgame(state):
+                # Plus rien à poser: la suite est jouée d'un bloc, boucles sautées
+                turn_count += self.endgame.fast_forward(resolver, max_turns - turn_count)
+            else:
+                turn_count += 1
 
-            # IA simple pour jouer des cartes
-            self._ai_play_cards(resolver, state)
+                # Le joueur pose ses cartes
+                self._ai_play_cards(resolver, state)
 
-            # Résoudre le tour
-            resolver.process_turn()
+                # Résoudre le tour
+                resolver.process_turn()
 
             # Calculer les dégâts
             current_player_presence = state.get_presence(True)
@@ -102,6 +136,9 @@ class CombatSimulator:
             player_damage_dealt = initial_enemy_presence - current_enemy_presence
             enemy_damage_dealt = initial_player_presence - current_player_presence
 
+            if state.is_combat_over() is not None:
+                break
+
         # Déterminer le gagnant
         victory = state.is_combat_over()
         if victory is None:
@@ -121,98 +158,428 @@ class CombatSimulator:
             enemy_cards_lost=enemy_cards_lost,
             player_final_presence=state.get_presence(True),
             enemy_final_presence=state.get_presence(False),
-            combat_log=resolver.action_log
+            card_damage=(tuple(resolver.events.dealt_by(c) for c in player_deck)
+                         if self.log_level else None),
+            events=resolver.events if self.log_level else None
         )
 
-    def _ai_play_cards(self, resolver: CombatResolver, state: CombatState):
-        """IA simple pour jouer des cartes"""
-        # Jouer des cartes tant qu'on a de l'énergie
-        while state.energy > 0 and state.hand:
-            # Trier par coût croissant
-            playable = [c for c in state.hand if c.cost <= state.energy]
-            if not playable:
+    def simulate_combat_batch(
+            self,
+            matchups: List[Tuple[List[Card], List[Card]]],
+            max_turns: int = 20,
+            seeds: Optional[List[Any]] = None
+    ) -> List[SimulationResult]:
+        """Simule plusieurs combats en parallèle avec le moteur vectorisé.
+
+        Donne les mêmes issues que des appels successifs à simulate_combat
+        avec la même graine, sans événements de combat. Une politique non
+        batchable (ex: MCTS) ou un simulateur qui journalise joue combat par
+        combat.
+
+        Portée: un moteur en lockstep à résultats identiques, pas un gain
+        d'un ou deux ordres de grandeur. Gain mesuré par core/benchmarks.py
+        (decks du catalogue): x2 à x2,5, quelle que soit la taille des lots.
+        Ces combats durent environ deux tours; la part fixe par combat
+        qu'impose l'égalité avec simulate_combat (flux propre, mélange des
+        objets Card, main et deck en listes, réécriture des cartes) coûte à
+        elle seule plus de la moitié du temps vectorisé ('fixed_share'), ce
+        qui borne le gain vers x4 même avec des tours gratuits.
+        """
+        if seeds is None:
+            # Comme des appels successifs à simulate_combat
+            seeds = [PhiloxRandom(self.rng.getrandbits(64)) for _ in matchups]
+
+        if not self.policy.batchable or self.log_level:
+            return [
+                self.simulate_combat(player_deck, enemy_deck, max_turns, rng_seed=seed)
+                for (player_deck, enemy_deck), seed in zip(matchups, seeds)
+            ]
+
+        states = [initial_state(player_deck, enemy_deck) for player_deck, enemy_deck in matchups]
+        engine = BatchCombatEngine(states, seeds)
+        engine.start_combat()
+
+        # Tracking: DUR de toutes les cartes à plat, une tranche par deck (joueur, ennemi)
+        count = len(matchups)
+        decks = [deck for matchup in matchups for deck in matchup]
+        bounds = np.cumsum([0] + [len(deck) for deck in decks])
+        initial_player_presence = _deck_sums(_current_dur(decks, bounds), bounds)[0::2]
+        # Ennemis posés: DUR des tableaux (Venin de début de combat déjà appliqué)
+        initial_enemy_presence = engine.presence(False) + np.array(
+            [sum(c.current_dur for c in enemy_deck[6:]) for _, enemy_deck in matchups]
+        )
+        player_damage_dealt = np.zeros(count, dtype=np.int64)
+        enemy_damage_dealt = np.zeros(count, dtype=np.int64)
+        turns = np.zeros(count, dtype=np.int64)
+
+        # Simuler les tours en lockstep sur les combats encore en cours
+        active = np.ones(count, dtype=bool)
+        for _ in range(max_turns):
+            idx = np.flatnonzero(active)
+            if len(idx) == 0:
                 break
 
-            # Jouer la carte la plus chère qu'on peut se permettre
-            card = max(playable, key=lambda c: c.cost)
+            self.policy.play_batch(engine, idx)
 
-            # Trouver une position libre
-            for pos in range(6):
-                if state.player_field[pos] is None:
-                    if resolver.play_card(card, pos):
-                        break
-            else:
-                break  # Pas de position libre
+            engine.process_turn(active)
+            turns[idx] += 1
+
+            player_damage_dealt[idx] = initial_enemy_presence[idx] - engine.presence(False, idx)
+            enemy_damage_dealt[idx] = initial_player_presence[idx] - engine.presence(True, idx)
+
+            active[idx] = engine.outcome(idx) == ONGOING
+
+        engine.finalize(aggregates=False)
+
+        # Déterminer les gagnants (timeout: la plus grande présence gagne)
+        player_presence = engine.presence(True)
+        enemy_presence = engine.presence(False)
+        outcome = engine.outcome()
+        victory = np.where(outcome == ONGOING, player_presence > enemy_presence, outcome == VICTORY)
+
+        lost = _deck_sums(_current_dur(decks, bounds) <= 0, bounds)
+
+        columns = zip(
+            np.where(victory, "player", "enemy").tolist(), turns.tolist(),
+            player_damage_dealt.tolist(), enemy_damage_dealt.tolist(),
+            lost[0::2].tolist(), lost[1::2].tolist(),
+            player_presence.tolist(), enemy_presence.tolist()
+        )
+        return [SimulationResult(*row) for row in columns]
+
+    def _ai_play_cards(self, resolver: CombatResolver, state: CombatState):
+        """Fait jouer le tour du joueur par la politique du simulateur"""
+        self.policy.play_turn(resolver, state)
 
     def run_batch_simulation(
             self,
             num_simulations: int,
             player_deck_generator,
             enemy_deck_generator,
-            act: int = 1
+            act: int = 1,
+            batch_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            store: Optional[ResultStore] = None,
+            target_width: Optional[float] = None,
+            check_every: int = 1000
     ) -> Dict:
-        """Lance plusieurs simulations pour l'analyse statistique"""
-
-        results = []
-        card_performance = defaultdict(lambda: {
-            'wins': 0,
-            'losses': 0,
-            'damage_dealt': 0,
-            'damage_taken': 0,
-            'times_played': 0,
-            'times_survived': 0
-        })
-
-        for i in range(num_simulations):
-            # Générer les decks
-            player_deck = player_deck_generator(act)
-            enemy_deck = enemy_deck_generator(act)
-
-            # Simuler
-            result = self.simulate_combat(player_deck, enemy_deck)
-            results.append(result)
-
-            # Analyser les performances des cartes
-            for card in player_deck:
-                stats = card_performance[card.id]
-                stats['times_played'] += 1
+        """Lance plusieurs simulations pour l'analyse statistique.
+
+        Avec batch_size, les combats sont résolus par paquets avec le moteur
+        vectorisé (mêmes issues qu'en série, sans événements de combat).
+
+        La simulation index joue avec les flux Philox (graine du lot, index)
+        de rng: Purpose.COMBAT pour le combat, Purpose.DECK pour ses decks. La
+        graine du lot, tirée du RNG du simulateur, est rendue dans 'seed':
+        replay_combat(seed, index, ...) rejoue un combat seul.
+
+        Avec workers, les simulations sont découpées en tranches résolues dans
+        un pool de processus; une tranche ne reçoit que la graine du lot et
+        ses index. Les générateurs de decks doivent alors être picklables et
+        accepter un paramètre rng (random.Random), et le résultat est
+        identique à une exécution en série. La politique du simulateur est
+        envoyée à chaque processus (elle doit être picklable).
+
+        Avec store, les résultats sont versés au fil de l'eau dans le magasin
+        colonnaire au lieu d'être gardés en liste: les moyennes globales sont
+        des réductions du magasin (limitées aux combats de cet appel) et le
+        dictionnaire rendu contient 'store' à la place de 'results'.
+
+        Avec target_width, num_simulations devient un maximum: les combats
+        sont joués par tranches de check_every et la simulation s'arrête dès
+        que l'intervalle de Wilson du taux de victoire de chaque carte est
+        plus étroit que target_width. 'simulations' donne le nombre joué.
+        """
 
-                if result.winner == "player":
-                    stats['wins'] += 1
+        # Graine du lot: chaque simulation est adressée par son index
+        seed = self.rng.getrandbits(64)
+
+        parallel = bool(workers and workers > 1)
+        if parallel and not (_accepts_rng(player_deck_generator)
+                             and _accepts_rng(enemy_deck_generator)):
+            raise ValueError("Les générateurs de decks doivent accepter rng en mode parallèle")
+
+        results: List[SimulationResult] = []
+        accumulators: Dict[str, CardAccumulator] = defaultdict(CardAccumulator)
+        first = len(store) if store is not None else 0
+        step = check_every if target_width is not None else max(num_simulations, 1)
+        played = 0
+
+        with ProcessPoolExecutor(max_workers=workers) if parallel else nullcontext() as pool:
+            for start in range(0, num_simulations, step):
+                count = min(step, num_simulations - start)
+                if parallel:
+                    round_results, round_accumulators, round_synergy = self._simulate_parallel(
+                        pool, workers, player_deck_generator, enemy_deck_generator, act,
+                        seed, start, count, batch_size, store
+                    )
                 else:
-                    stats['losses'] += 1
+                    round_results, round_accumulators, round_synergy = self._simulate_range(
+                        player_deck_generator, enemy_deck_generator, act,
+                        seed, start, count, batch_size, store
+                    )
+                results.extend(round_results)
+                _merge_accumulators(accumulators, round_accumulators)
+                self.synergy.merge(round_synergy)
+                played += count
+
+                if target_width is not None and self._converged(accumulators, target_width):
+                    break
 
-                if card.current_dur > 0:
-                    stats['times_survived'] += 1
+        # Calculer les statistiques finales
+        if store is not None:
+            summary = store.summary(first)
+            summary['store'] = store
+        else:
+            count = max(played, 1)
+            summary = {
+                'overall_win_rate': sum(1 for r in results if r.winner == "player") / count,
+                'avg_turns': sum(r.turns for r in results) / count,
+                'avg_player_damage': sum(r.player_damage_dealt for r in results) / count,
+                'avg_enemy_damage': sum(r.enemy_damage_dealt for r in results) / count,
+                'results': results
+            }
+        summary['simulations'] = played
+        summary['seed'] = seed
+
+        self.card_accumulators = dict(accumulators) if store is not None and not first else None
+        self._update_card_stats(accumulators, summary['avg_turns'])
+        return summary
+
+    def load_results(self, store: ResultStore) -> Dict:
+        """Réanalyse un magasin de résultats existant sans resimuler"""
+        summary = store.summary()
+        self.card_accumulators = store.card_performance()
+        self._update_card_stats(self.card_accumulators, summary['avg_turns'])
+        summary['store'] = store
+        summary['simulations'] = len(store)
+        return summary
+
+    def resimulate(self, store: ResultStore, templates: Optional[Dict[str, Any]] = None,
+                   batch_size: Optional[int] = 256) -> Dict:
+        """Met le magasin à jour après une modification de cartes.
+
+        Seuls les combats où figure une carte dont le modèle a changé (selon
+        content_key) sont rejoués, avec leurs decks et leur graine d'origine
+        et les modèles actuels (templates, par défaut ceux de data/cards.json),
+        puis réécrits sur place. Les agrégats de card_stats sont corrigés de
+        la différence, sans relire tout le magasin; le résultat est celui d'une
+        simulation complète tant que la composition des decks ne dépend pas
+        des champs modifiés. 'resimulated' donne le nombre de combats rejoués.
+        """
+        if templates is None:
+            from catalog import load_catalog
+            templates = load_catalog().templates
+        if self.card_accumulators is None:
+            self.card_accumulators = store.card_performance()
+
+        accumulators = defaultdict(CardAccumulator, self.card_accumulators)
+        content_keys = {card_id: template.content_key for card_id, template in templates.items()}
+        replayed = 0
+        for index, lineups in store.stale_combats(content_keys).items():
+            rows = sorted(lineups)
+            matchups, seeds = [], []
+            for row in rows:
+                lineup = lineups[row]
+                missing = [i for i in lineup.player + lineup.enemies if i not in templates]
+                if missing or not lineup.replayable:
+                    raise ValueError(f"Combat non rejouable (modèles {missing}, graine {lineup.seed})")
+                matchups.append(([templates[i].instantiate() for i in lineup.player],
+                                 [templates[i].instantiate() for i in lineup.enemies]))
+                seeds.append(lineup.rng())
+
+            if batch_size:
+                results = []
+                for start in range(0, len(matchups), batch_size):
+                    results.extend(self.simulate_combat_batch(
+                        matchups[start:start + batch_size], seeds=seeds[start:start + batch_size]
+                    ))
+            else:
+                results = [self.simulate_combat(player_deck, enemy_deck, rng_seed=seed)
+                           for (player_deck, enemy_deck), seed in zip(matchups, seeds)]
 
-                # Estimer les dégâts (simplification)
-                stats['damage_dealt'] += card.base_atk * result.turns
-                stats['damage_taken'] += (card.base_dur - card.current_dur)
+            removed = store.replace(index, {
+                row: (result, player_deck, enemy_deck, seed)
+                for row, (player_deck, enemy_deck), seed, result in zip(rows, matchups, seeds, results)
+            })
+            for card_id, accumulator in removed.items():
+                accumulators[card_id].subtract(accumulator)
+            for (player_deck, _), result in zip(matchups, results):
+                self._record_card_performance(accumulators, player_deck, result)
+            replayed += len(rows)
+
+        self.card_accumulators = {card_id: accumulator for card_id, accumulator
+                                  in accumulators.items() if accumulator.played}
+        summary = store.summary()
+        self._update_card_stats(self.card_accumulators, summary['avg_turns'])
+        summary['store'] = store
+        summary['simulations'] = len(store)
+        summary['resimulated'] = replayed
+        return summary
+
+    def _simulate_parallel(
+            self,
+            pool: ProcessPoolExecutor,
+            workers: int,
+            player_deck_generator,
+            enemy_deck_generator,
+            act: int,
+            seed: int,
+            start: int,
+            count: int,
+            batch_size: Optional[int],
+            store: Optional[ResultStore]
+    ) -> Tuple[List[SimulationResult], Dict[str, CardAccumulator], SynergyMatrix]:
+        """Simule les combats start..start+count en tranches dans le pool"""
+        results = []
+        accumulators: Dict[str, CardAccumulator] = defaultdict(CardAccumulator)
+        synergy = SynergyMatrix()
+        window = workers * SHARDS_PER_WORKER
+        shard_size = max(1, -(-count // window))
+        if store is not None:
+            # Tranches bornées: la mémoire ne croît pas avec num_simulations
+            shard_size = min(shard_size, store.chunk_size)
+
+        def submit(offset: int) -> Future:
+            return pool.submit(
+                _simulate_shard, player_deck_generator, enemy_deck_generator, act,
+                seed, start + offset, min(shard_size, count - offset), batch_size,
+                self.policy, store is not None, self.log_level
+            )
+
+        # Au plus window tranches en vol: une tranche vidée est remplacée par
+        # la suivante et son Future (qui garde ses paquets) est abandonné
+        offsets = iter(range(0, count, shard_size))
+        pending = deque(submit(offset) for offset in islice(offsets, window))
+
+        # Fusionner dans l'ordre des tranches
+        while pending:
+            rows, shard_accumulators, shard_synergy = pending.popleft().result()
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(submit(offset))
+            if store is not None:
+                for chunk in rows:
+                    store.append_chunk(chunk)
+            else:
+                results.extend(SimulationResult(*row) for row in rows)
+            _merge_accumulators(accumulators, shard_accumulators)
+            synergy.merge(shard_synergy)
+            del rows
 
-        # Calculer les statistiques finales
-        win_rate = sum(1 for r in results if r.winner == "player") / num_simulations
-        avg_turns = sum(r.turns for r in results) / num_simulations
+        return results, accumulators, synergy
 
-        # Statistiques par carte
-        for card_id, stats in card_performance.items():
-            if stats['times_played'] > 0:
+    @staticmethod
+    def _converged(accumulators: Dict[str, CardAccumulator], target_width: float) -> bool:
+        """Vrai quand l'intervalle du taux de victoire de chaque carte est assez étroit"""
+        if not accumulators:
+            return False
+        for accumulator in accumulators.values():
+            low, high = accumulator.win_interval()
+            if high - low > target_width:
+                return False
+        return True
+
+    def _update_card_stats(self, accumulators: Dict[str, CardAccumulator], avg_turns: float):
+        """Statistiques par carte à partir des agrégats"""
+        for card_id, accumulator in accumulators.items():
+            played = accumulator.played
+            if played > 0:
                 self.card_stats[card_id] = CardStatistics(
                     card_id=card_id,
-                    win_rate=stats['wins'] / stats['times_played'],
-                    avg_damage_dealt=stats['damage_dealt'] / stats['times_played'],
-                    avg_damage_taken=stats['damage_taken'] / stats['times_played'],
-                    avg_survival_rate=stats['times_survived'] / stats['times_played'],
-                    avg_turns_alive=avg_turns * stats['times_survived'] / stats['times_played'],
-                    usage_count=stats['times_played']
+                    win_rate=accumulator.wins / played,
+                    avg_damage_dealt=accumulator.damage_dealt.mean,
+                    avg_damage_taken=accumulator.damage_taken.mean,
+                    avg_survival_rate=accumulator.survived / played,
+                    avg_turns_alive=avg_turns * accumulator.survived / played,
+                    usage_count=played,
+                    win_rate_interval=accumulator.win_interval(),
+                    damage_dealt_std=accumulator.damage_dealt.std
                 )
 
-        return {
-            'overall_win_rate': win_rate,
-            'avg_turns': avg_turns,
-            'avg_player_damage': sum(r.player_damage_dealt for r in results) / num_simulations,
-            'avg_enemy_damage': sum(r.enemy_damage_dealt for r in results) / num_simulations,
-            'results': results
-        }
+    def _simulate_range(
+            self,
+            player_deck_generator,
+            enemy_deck_generator,
+            act: int,
+            seed: int,
+            start: int,
+            count: int,
+            batch_size: Optional[int] = None,
+            store: Optional[ResultStore] = None
+    ) -> Tuple[List[SimulationResult], Dict[str, CardAccumulator], SynergyMatrix]:
+        """Simule les combats start..start+count du lot de graine seed.
+
+        Avec store, chaque paquet est versé dans le magasin au lieu d'être
+        gardé (la liste rendue est vide, seuls les agrégats restent).
+        """
+        results = []
+        accumulators: Dict[str, CardAccumulator] = defaultdict(CardAccumulator)
+        synergy = SynergyMatrix()
+        seeded = _accepts_rng(player_deck_generator) and _accepts_rng(enemy_deck_generator)
+        step = batch_size or 1
+
+        streams = RngStreams(seed)
+
+        for offset in range(0, count, step):
+            indices = range(start + offset, start + min(offset + step, count))
+            matchups = [self._generate_matchup(player_deck_generator, enemy_deck_generator,
+                                               act, streams, index, seeded)
+                        for index in indices]
+            rngs = [streams.stream(index) for index in indices]
+
+            # Simuler
+            if batch_size:
+                batch = self.simulate_combat_batch(matchups, seeds=rngs)
+            else:
+                batch = [
+                    self.simulate_combat(player_deck, enemy_deck, rng_seed=rng)
+                    for (player_deck, enemy_deck), rng in zip(matchups, rngs)
+                ]
+
+            for (player_deck, enemy_deck), rng, result in zip(matchups, rngs, batch):
+                self._record_card_performance(accumulators, player_deck, result)
+                if store is not None:
+                    store.append(result, player_deck, enemy_deck, rng)
+            synergy.add_batch([[card.id for card in player_deck] for player_deck, _ in matchups],
+                              [result.winner == "player" for result in batch])
+            if store is None:
+                results.extend(batch)
+
+        return results, accumulators, synergy
+
+    @staticmethod
+    def _generate_matchup(player_deck_generator, enemy_deck_generator, act: int,
+                          streams: RngStreams, index: int,
+                          seeded: bool) -> Tuple[List[Card], List[Card]]:
+        """Decks de la simulation index (flux Purpose.DECK si les générateurs acceptent rng)"""
+        if not seeded:
+            return player_deck_generator(act), enemy_deck_generator(act)
+        deck_rng = streams.stream(index, Purpose.DECK)
+        return player_deck_generator(act, rng=deck_rng), enemy_deck_generator(act, rng=deck_rng)
+
+    def replay_combat(self, seed: int, index: int, player_deck_generator, enemy_deck_generator,
+                      act: int = 1, max_turns: int = 20) -> SimulationResult:
+        """Rejoue seul le combat index d'un lot de run_batch_simulation (graine 'seed').
+
+        Les générateurs doivent accepter rng, comme en mode parallèle.
+        """
+        streams = RngStreams(seed)
+        player_deck, enemy_deck = self._generate_matchup(
+            player_deck_generator, enemy_deck_generator, act, streams, index, True
+        )
+        return self.simulate_combat(player_deck, enemy_deck, max_turns,
+                                    rng_seed=streams.stream(index))
+
+    @staticmethod
+    def _record_card_performance(accumulators: Dict[str, CardAccumulator],
+                                 player_deck: List[Card], result: SimulationResult):
+        """Analyse les performances des cartes d'un combat"""
+        won = result.winner == "player"
+        for card, dealt in zip(player_deck, card_damage_dealt(player_deck, result)):
+            accumulators[card.id].add(
+                won, card.current_dur > 0, dealt, card.base_dur - card.current_dur
+            )
 
     def analyze_card_balance(self) -> pd.DataFrame:
         """Analyse l'équilibrage des cartes"""
@@ -261,21 +628,28 @@ class CombatSimulator:
             'underpowered': sorted(underpowered, key=lambda x: x['win_rate'])
         }
 
-    def calculate_synergies(self) -> Dict[Tuple[str, str], float]:
-        """Calcule les synergies entre paires de cartes"""
-        synergies = {}
+    def calculate_synergies(self, min_plays: int = 30,
+                            z: float = Z_95) -> Dict[Tuple[str, str], float]:
+        """Calcule les synergies significatives entre paires de cartes.
 
-        # Analyser les résultats pour trouver les paires gagnantes
-        for result in self.results:
-            if result.winner == "player":
-                # Identifier les cartes jouées ensemble
-                # Calculer leur contribution à la victoire
-                pass
+        Lit la matrice de co-occurrences tenue par run_batch_simulation (voir
+        SynergyMatrix.scores) et renseigne synergy_scores des deux cartes.
+        """
+        synergies = self.synergy.scores(min_plays, z)
+
+        for (first, second), score in synergies.items():
+            for card_id, partner in ((first, second), (second, first)):
+                if card_id in self.card_stats:
+                    self.card_stats[card_id].synergy_scores[partner] = score
 
         return synergies
 
-    def generate_report(self, output_path: str = "balance_report.html"):
-        """Génère un rapport HTML complet d'équilibrage"""
+    def generate_report(self, output_path: str = "balance_report.html", matchups=None):
+        """Génère un rapport HTML complet d'équilibrage.
+
+        matchups (un matchups.MatchupMatrix) ajoute la carte de chaleur des
+        affrontements archétypes x pools d'ennemis.
+        """
 
         html_content = f"""
         <!DOCTYPE html>
@@ -311,6 +685,7 @@ class CombatSimulator:
 
             <h2>Distribution des Raretés</h2>
             {self._generate_rarity_distribution_html()}
+            {self._generate_matchups_html(matchups) if matchups is not None else ""}
         </body>
         </html>
         """
@@ -383,6 +758,91 @@ class CombatSimulator:
 
         return html
 
+    def _generate_matchups_html(self, matchups) -> str:
+        # Carte de chaleur: rouge si le joueur perd, vert s'il gagne
+        rates = matchups.win_rates
+        html = "<h2>Matrice des Affrontements</h2>"
+        html += "<table class='heatmap'><tr><th>Archétype</th>"
+        html += "".join(f"<th>{pool}</th>" for pool in matchups.pools) + "</tr>"
+        for i, archetype in enumerate(matchups.archetypes):
+            html += f"<tr><th>{archetype}</th>"
+            for j in range(len(matchups.pools)):
+                rate = float(rates[i, j])
+                color = f"hsl({120 * rate:.0f}, 70%, 75%)"
+                html += (f"<td style='background: {color}' title='{matchups.combats[i, j]} combats'>"
+                         f"{rate:.0%}</td>")
+            html += "</tr>"
+        html += "</table>"
+
+        return html
+
+
+# Tranches par processus: équilibre la charge entre combats courts et longs
+SHARDS_PER_WORKER = 4
+
+
+def _current_dur(decks: List[List[Card]], bounds: np.ndarray) -> np.ndarray:
+    """DUR courante de toutes les cartes des decks, à plat"""
+    return np.fromiter((c.current_dur for deck in decks for c in deck),
+                       dtype=np.int64, count=int(bounds[-1]))
+
+
+def _deck_sums(values: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """Somme de values sur chaque deck (tranches bounds[i]:bounds[i+1], vides comprises)"""
+    totals = np.concatenate([[0], np.cumsum(values, dtype=np.int64)])
+    return totals[bounds[1:]] - totals[bounds[:-1]]
+
+
+def _merge_accumulators(accumulators: Dict[str, CardAccumulator],
+                        partial: Dict[str, CardAccumulator]):
+    """Fusionne des agrégats partiels par carte (ex: ceux d'un processus)"""
+    for card_id, accumulator in partial.items():
+        accumulators[card_id].merge(accumulator)
+
+
+def _accepts_rng(generator) -> bool:
+    """Vérifie si un générateur de deck accepte un paramètre rng"""
+    try:
+        return 'rng' in inspect.signature(generator).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _simulate_shard(
+        player_deck_generator,
+        enemy_deck_generator,
+        act: int,
+        seed: int,
+        start: int,
+        count: int,
+        batch_size: Optional[int],
+        policy: Optional[PlayPolicy] = None,
+        columnar: bool = False,
+        log_level: LogLevel = LogLevel.OFF
+) -> Tuple[List[Any], Dict[str, CardAccumulator], SynergyMatrix]:
+    """Tâche d'un processus: simule une tranche et renvoie des agrégats compacts.
+
+    En mode columnar, renvoie les blocs d'un ResultStore en mémoire au lieu
+    des lignes de résultats.
+    """
+    simulator = CombatSimulator(policy=policy, log_level=log_level)
+    store = ResultStore(chunk_size=max(1, count)) if columnar else None
+    results, accumulators, synergy = simulator._simulate_range(
+        player_deck_generator, enemy_deck_generator, act,
+        seed, start, count, batch_size, store
+    )
+    if store is not None:
+        return store.take_chunks(), dict(accumulators), synergy
+
+    # Pas d'événements de combat: seulement les champs numériques
+    rows = [
+        (r.winner, r.turns, r.player_damage_dealt, r.enemy_damage_dealt,
+         r.player_cards_lost, r.enemy_cards_lost,
+         r.player_final_presence, r.enemy_final_presence, r.card_damage)
+        for r in results
+    ]
+    return rows, dict(accumulators), synergy
+
 
 class BalanceFormulas:
     """Formules d'équilibrage du jeu"""
@@ -427,23 +887,10 @@ class BalanceFormulas:
         return values.get(effect, 0.5)
 
     @staticmethod
-    def calculate_card_score(card: Card) -> float:
-        """Calcule le score théorique d'une carte"""
-        score = 0.0
-
-        # Stats de base
-        score += card.base_atk * 1.0
-        score += card.base_dur * 0.8
-        score += (card.base_spd - 1) * 0.5
-
-        # Mots-clés
-        for keyword in card.keywords:
-            score += BalanceFormulas.keyword_cost(keyword)
-
-        # Coût en énergie (négatif)
-        score -= card.cost * 0.5
-
-        return score
+    def calculate_card_score(card: Card, coefficients: Optional['FormulaCoefficients'] = None) -> float:
+        """Calcule le score théorique d'une carte (poids d'origine par défaut)"""
+        coefficients = coefficients or DEFAULT_COEFFICIENTS
+        return float(card_features(card) @ coefficients.vector())
 
     @staticmethod
     def validate_card(card: Card) -> Dict[str, Any]:
@@ -463,11 +910,11 @@ class BalanceFormulas:
     def _get_recommendation(difference: float) -> str:
         """Recommandation pour équilibrer une carte"""
         if difference > 1.0:
-            return "Carte trop puissante: réduire les stats ou augmenter le coût"
+            return RECOMMENDATIONS[0]
         elif difference < -1.0:
-            return "Carte trop faible: augmenter les stats ou réduire le coût"
+            return RECOMMENDATIONS[2]
         else:
-            return "Carte équilibrée"
+            return RECOMMENDATIONS[1]
 
     @staticmethod
     def calculate_enemy_scaling(act: int, is_elite: bool = False) -> Dict:
@@ -497,6 +944,158 @@ class BalanceFormulas:
         }
 
 
+@dataclass(frozen=True)
+class FormulaCoefficients:
+    """Poids de la formule de score d'une carte, dans l'ordre de card_features"""
+    atk: float = 1.0
+    dur: float = 0.8
+    spd: float = 0.5  # Par point au-delà de 1
+    cost: float = 0.5  # Retranché par point d'énergie
+    keywords: Tuple[float, ...] = tuple(BalanceFormulas.keyword_cost(k) for k in Keyword)
+    # La formule d'origine ne compte pas les altérations infligées
+    statuses: Tuple[float, ...] = (0.0,) * len(StatusEffect)
+
+    def vector(self) -> np.ndarray:
+        return np.array((self.atk, self.dur, self.spd, self.cost) + self.keywords + self.statuses)
+
+    @classmethod
+    def from_vector(cls, vector) -> 'FormulaCoefficients':
+        values = [float(v) for v in vector]
+        keywords = len(Keyword)
+        return cls(*values[:4], tuple(values[4:4 + keywords]), tuple(values[4 + keywords:]))
+
+    @staticmethod
+    def names() -> List[str]:
+        """Nom de chaque poids, dans l'ordre de vector()"""
+        return (['atk', 'dur', 'spd', 'cost'] + [k.name.lower() for k in Keyword]
+                + [s.value for s in StatusEffect])
+
+
+DEFAULT_COEFFICIENTS = FormulaCoefficients()
+
+
+def card_features(card) -> np.ndarray:
+    """Caractéristiques d'une carte ou d'un modèle, dans l'ordre de FormulaCoefficients.vector"""
+    statuses = [0] * len(StatusEffect)
+    for ability in ('on_attack', 'on_hit', 'on_death'):
+        for effect in getattr(card, ability):
+            status = effect.get('effect')
+            if isinstance(status, StatusEffect):
+                statuses[STATUS_INDEX[status]] += effect.get('value', 1)
+
+    keywords = card.keywords
+    return np.array(
+        [card.base_atk, card.base_dur, card.base_spd - 1, -card.cost]
+        + [keyword in keywords for keyword in Keyword]
+        + statuses,
+        dtype=float
+    )
+
+
+# Recommandations: trop puissante, équilibrée, trop faible
+RECOMMENDATIONS = (
+    "Carte trop puissante: réduire les stats ou augmenter le coût",
+    "Carte équilibrée",
+    "Carte trop faible: augmenter les stats ou réduire le coût",
+)
+
+
+@dataclass
+class CatalogValidation:
+    """Résultat de validate_card pour tout le catalogue, en colonnes"""
+    card_ids: List[str]
+    budget: np.ndarray
+    actual: np.ndarray
+    difference: np.ndarray
+    valid: np.ndarray
+    verdict: np.ndarray  # Indice dans RECOMMENDATIONS
+
+    @property
+    def recommendations(self) -> List[str]:
+        return [RECOMMENDATIONS[v] for v in self.verdict.tolist()]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'card_id': self.card_ids,
+            'budget': self.budget,
+            'actual': self.actual,
+            'difference': self.difference,
+            'valid': self.valid,
+            'recommendation': self.recommendations,
+        })
+
+
+class CatalogValidator:
+    """Validation de tout le catalogue en une passe NumPy.
+
+    Les modèles sont chargés une fois dans une matrice de caractéristiques
+    (voir card_features: stats, mots-clés en one-hot, valeurs des
+    altérations des capacités). Scores, écarts au budget et verdicts sont
+    alors un produit matrice-vecteur; what_if() essaie des coefficients
+    modifiés sans toucher à la formule courante, apply() les adopte.
+    """
+
+    def __init__(self, templates, coefficients: FormulaCoefficients = DEFAULT_COEFFICIENTS,
+                 tolerance: float = 1.0):
+        templates = list(templates)
+        self.card_ids = [template.id for template in templates]
+        self.features = np.array([card_features(t) for t in templates]).reshape(
+            len(templates), len(FormulaCoefficients.names())
+        )
+        self.budgets = np.array(
+            [BalanceFormulas.calculate_card_budget(t.rarity) for t in templates], dtype=float
+        )
+        self.tolerance = tolerance
+        self.columns = {name: i for i, name in enumerate(FormulaCoefficients.names())}
+        self.weights = coefficients.vector()
+
+    @classmethod
+    def from_catalog(cls, catalog=None, **kwargs) -> 'CatalogValidator':
+        """Validateur des modèles d'un catalogue (data/cards.json par défaut)"""
+        if catalog is None:
+            from catalog import load_catalog
+            catalog = load_catalog()
+        return cls(catalog.templates.values(), **kwargs)
+
+    @property
+    def coefficients(self) -> FormulaCoefficients:
+        return FormulaCoefficients.from_vector(self.weights)
+
+    def validate(self) -> CatalogValidation:
+        """Valide toutes les cartes avec les coefficients courants"""
+        return self._validate(self.weights)
+
+    def what_if(self, **changes: float) -> CatalogValidation:
+        """Valide avec quelques coefficients modifiés (noms de FormulaCoefficients.names)"""
+        return self._validate(self._weights_with(changes))
+
+    def apply(self, **changes: float):
+        """Adopte des coefficients modifiés"""
+        self.weights = self._weights_with(changes)
+
+    def _weights_with(self, changes: Dict[str, float]) -> np.ndarray:
+        weights = self.weights.copy()
+        for name, value in changes.items():
+            if name not in self.columns:
+                raise KeyError(f"Coefficient inconnu: {name}")
+            weights[self.columns[name]] = value
+        return weights
+
+    def _validate(self, weights: np.ndarray) -> CatalogValidation:
+        actual = self.features @ weights
+        difference = actual - self.budgets
+        # Mêmes seuils que _get_recommendation: 0 au-dessus, 2 au-dessous, 1 sinon
+        verdict = (difference < -1.0).astype(np.int8) * 2 + (np.abs(difference) <= 1.0)
+        return CatalogValidation(
+            card_ids=self.card_ids,
+            budget=self.budgets,
+            actual=actual,
+            difference=difference,
+            valid=np.abs(difference) <= self.tolerance,
+            verdict=verdict
+        )
+
+
 # Script de test d'équilibrage
 if __name__ == "__main__":
     import sys
@@ -515,7 +1114,7 @@ if __name__ == "__main__":
 
 
     # Générateurs de deck
-    def generate_player_deck(act: int) -> List[Card]:
+    def generate_player_deck(act: int, rng: random.Random = random) -> List[Card]:
         """Génère un deck joueur typique"""
         deck = []
         for _ in range(12):
@@ -524,15 +1123,15 @@ if __name__ == "__main__":
         return deck
 
 
-    def generate_enemy_deck(act: int) -> List[Card]:
+    def generate_enemy_deck(act: int, rng: random.Random = random) -> List[Card]:
         """Génère des ennemis selon l'acte"""
         deck = []
         for _ in range(2 + act):
             card = card_db.create_card("dunes_solar_fennec")
             # Scaling
             scaling = BalanceFormulas.calculate_enemy_scaling(act)
-            card.base_dur = random.randint(*scaling['hp_range'])
-            card.base_atk = random.randint(*scaling['atk_range'])
+            card.base_dur = rng.randint(*scaling['hp_range'])
+            card.base_atk = rng.randint(*scaling['atk_range'])
             card.current_dur = card.base_dur
             card.current_atk = card.base_atk
             deck.append(card)
@@ -0,0 +1,546 @@
+# core/batch_combat.py
+"""Moteur de combat vectorisé - N combats indépendants résolus en parallèle"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from array import array
+
+import numpy as np
+
+from entities import (
+    Card, CardTemplate, CombatState, StatusEffect, Keyword, STATUS_INDEX, KEYWORD_BIT, NO_STATUSES
+)
+from targeting import TARGET_TABLE, target_index
+from abilities import Op
+from rng import as_random, draw_block, shuffle, shuffle_many
+
+
+# Emplacements: 0-5 terrain joueur, 6-11 terrain ennemi
+SLOTS = 12
+FIELD_SIZE = 6
+HAND_LIMIT = 10  # Taille maximale de la main (voir CombatResolver.draw_cards)
+
+
+VENIN = STATUS_INDEX[StatusEffect.VENIN]
+BRULURE = STATUS_INDEX[StatusEffect.BRULURE]
+SAIGNEMENT = STATUS_INDEX[StatusEffect.SAIGNEMENT]
+FRACTURE = STATUS_INDEX[StatusEffect.FRACTURE]
+MALEDICTION = STATUS_INDEX[StatusEffect.MALEDICTION]
+OFFENSE_EMOUSSEE = STATUS_INDEX[StatusEffect.OFFENSE_EMOUSSEE]
+
+# Déclencheurs d'effets encodés
+ON_ATTACK = 0
+ON_HIT = 1
+ON_DEATH = 2
+TRIGGERS = ('on_attack', 'on_hit', 'on_death')
+
+# Ciblage par table (voir targeting.TARGET_TABLE)
+TARGET_ARRAY = np.array(TARGET_TABLE, dtype=np.int64)
+SLOT_BITS = 1 << np.arange(FIELD_SIZE)
+
+ONGOING = -1
+DEFEAT = 0
+VICTORY = 1
+
+
+def initial_state(player_deck: List[Card], enemy_deck: List[Card]) -> CombatState:
+    """État de départ d'un combat: deck du joueur, ennemis posés sans suivi (voir finalize)"""
+    state = CombatState()
+    state.deck = player_deck.copy()
+    for i, enemy in enumerate(enemy_deck[:FIELD_SIZE]):
+        list.__setitem__(state.enemy_field, i, enemy)
+    return state
+
+
+class BatchCombatEngine:
+    """Résout N combats en lockstep sur des tableaux NumPy (structure de tableaux).
+
+    Reproduit exactement CombatResolver pour les mêmes graines: chaque combat
+    garde son propre random.Random, consommé dans le même ordre (mélanges du
+    deck, une clé de départage d'initiative par unité en début de tour). Ces
+    tirages passent par draw_block (un bloc par combat pour un flux
+    rng.PhiloxRandom) et les mélanges de début de combat sont triés en un
+    seul lexsort.
+
+    Pendant le combat, l'état des cartes sur le terrain vit dans les tableaux;
+    les objets Card ne sont mis à jour qu'à leur mort et lors de finalize().
+    Les données statiques (effets des déclencheurs) sont lues dans des
+    tableaux indexés par modèle (template, templates), remplis une fois par
+    modèle rencontré.
+    Les poses et retraits sur les terrains des CombatState ne passent pas par
+    leur suivi incrémental: les agrégats (présence, hash...) ne sont
+    recalculés qu'une fois, dans finalize(). Un statut est considéré actif
+    dès que son compteur est non nul.
+
+    L'énergie et le coût des cartes en main de chaque combat sont aussi
+    tenus en tableaux (energy, hand_cost, -1 pour une case vide): une
+    politique peut choisir les poses de tous les combats d'un coup et les
+    appliquer avec deploy().
+    """
+
+    def __init__(self, states: List[CombatState], seeds: List[Optional[Any]]):
+        if len(states) != len(seeds):
+            raise ValueError("Il faut une graine par combat")
+
+        self.states = states
+        self.rngs = [as_random(seed) for seed in seeds]
+        self.size = len(states)
+
+        shape = (self.size, SLOTS)
+        self.atk = np.zeros(shape, dtype=np.int32)
+        self.dur = np.zeros(shape, dtype=np.int32)
+        self.spd = np.zeros(shape, dtype=np.int32)
+        self.shields = np.zeros(shape, dtype=np.int32)
+        self.keywords = np.zeros(shape, dtype=np.int32)
+        self.occupied = np.zeros(shape, dtype=bool)
+        self.tiebreak = np.zeros(shape)  # Départage d'initiative du tour (voir InitiativeScheduler)
+        self.statuses = np.zeros(shape + (len(STATUS_INDEX),), dtype=np.int32)
+
+        # Main et énergie du joueur, dans l'ordre de state.hand
+        self.energy = np.array([state.energy for state in states], dtype=np.int32)
+        width = max([HAND_LIMIT] + [len(state.hand) for state in states])
+        self.hand_cost = np.full((self.size, width), -1, dtype=np.int32)
+        self._load_hands()
+
+        # Modèle de chaque emplacement, indice dans templates: les données
+        # statiques (effets) sont lues dans des tableaux indexés par modèle
+        self.template = np.zeros(shape, dtype=np.int32)
+        self.templates: List[CardTemplate] = []
+        self._template_index: Dict[int, int] = {}  # id(modèle) -> indice
+
+        # Effets on_attack / on_hit / on_death par modèle: (statut, valeur, boucliers)
+        effect_shape = (0, len(TRIGGERS), 1)
+        self.effect_status = np.full(effect_shape, -1, dtype=np.int8)
+        self.effect_value = np.zeros(effect_shape, dtype=np.int32)
+        self.effect_shield = np.zeros(effect_shape, dtype=np.int32)
+
+        # Objets Card correspondant à chaque emplacement
+        self.cards: List[List[Optional[Card]]] = [[None] * SLOTS for _ in range(self.size)]
+        self._deaths: List[np.ndarray] = []
+        self._pending: List[Tuple[int, int, Card]] = []
+        self._deferred: List[Tuple[np.ndarray, int, int, int]] = []
+
+        for b, state in enumerate(states):
+            present = [(row, card) for row, card in enumerate(state.player_field + state.enemy_field)
+                       if card]
+            self._pending.extend((b, row, card) for row, card in present)
+        self._flush_pending()
+
+    # ------------------------------------------------------------------
+    # Chargement / écriture des cartes
+    # ------------------------------------------------------------------
+
+    def _load_cards(self, b: List[int], rows: List[int], cards: List[Card]):
+        """Copie l'état de plusieurs cartes dans les tableaux en une passe"""
+        for i, row, card in zip(b, rows, cards):
+            self.cards[i][row] = card
+
+        self.occupied[b, rows] = True
+        self.atk[b, rows] = [card.current_atk for card in cards]
+        self.dur[b, rows] = [card.current_dur for card in cards]
+        self.spd[b, rows] = [card.current_spd for card in cards]
+        self.shields[b, rows] = [card.shields for card in cards]
+        self.keywords[b, rows] = [card.keyword_mask for card in cards]
+        self.statuses[b, rows] = [card.status_values for card in cards]
+
+        index = self._template_index
+        known = len(self.templates)
+        for card in cards:
+            if id(card.template) not in index:
+                index[id(card.template)] = len(self.templates)
+                self.templates.append(card.template)
+        if len(self.templates) > known:
+            self._encode_effects(self.templates[known:])
+        self.template[b, rows] = [index[id(card.template)] for card in cards]
+
+    def _encode_effects(self, templates: List[CardTemplate]):
+        """Ajoute aux tableaux d'effets les instructions on_attack / on_hit / on_death compilées"""
+        programs = [[getattr(t.program, trigger) for trigger in TRIGGERS] for t in templates]
+        longest = max([self.effect_status.shape[-1]] + [len(p) for ps in programs for p in ps])
+
+        shape = (len(templates), len(TRIGGERS), longest)
+        status = np.full(shape, -1, dtype=np.int8)
+        value = np.zeros(shape, dtype=np.int32)
+        shield = np.zeros(shape, dtype=np.int32)
+        for i, triggers in enumerate(programs):
+            for t, program in enumerate(triggers):
+                for k, (op, _, amount, code) in enumerate(program):
+                    if op == Op.STATUS:
+                        status[i, t, k], value[i, t, k] = code, amount
+                    else:
+                        shield[i, t, k] = amount
+
+        pad = [(0, 0), (0, 0), (0, longest - self.effect_status.shape[-1])]
+        self.effect_status = np.concatenate([np.pad(self.effect_status, pad, constant_values=-1),
+                                             status])
+        self.effect_value = np.concatenate([np.pad(self.effect_value, pad), value])
+        self.effect_shield = np.concatenate([np.pad(self.effect_shield, pad), shield])
+
+    def _flush_pending(self):
+        """Charge les cartes déployées depuis le dernier chargement"""
+        if self._pending:
+            b, rows, cards = zip(*self._pending)
+            self._pending.clear()
+            self._load_cards(list(b), list(rows), list(cards))
+
+        # Effets de déploiement, dans l'ordre où ils ont été joués
+        for array, b, row, delta in self._deferred:
+            array[b, row] += delta
+        self._deferred.clear()
+
+    def _load_hands(self):
+        """Recopie le coût des cartes en main de chaque combat"""
+        self.hand_cost[:] = -1
+        for b, state in enumerate(self.states):
+            if state.hand:
+                self.hand_cost[b, :len(state.hand)] = [card.cost for card in state.hand]
+
+    def _store_cards(self, b: np.ndarray, rows: np.ndarray):
+        """Réécrit l'état des tableaux dans les objets Card"""
+        columns = zip(
+            self.atk[b, rows].tolist(), self.dur[b, rows].tolist(),
+            self.spd[b, rows].tolist(), self.shields[b, rows].tolist(),
+            self.statuses[b, rows].tolist()
+        )
+        for i, row, (atk, dur, spd, shields, statuses) in zip(b.tolist(), rows.tolist(), columns):
+            card = self.cards[i][row]
+            card.current_atk = atk
+            card.current_dur = dur
+            card.current_spd = spd
+            card.shields = shields
+            card.status_values = array('i', statuses) if any(statuses) else NO_STATUSES
+
+    def _field(self, b: int, row: int) -> List[Optional[Card]]:
+        state = self.states[b]
+        return state.player_field if row < FIELD_SIZE else state.enemy_field
+
+    def finalize(self, aggregates: bool = True):
+        """Réécrit toutes les cartes encore sur le terrain dans leurs objets Card.
+
+        Sans aggregates, les agrégats des états restent périmés (états que
+        l'appelant jette, voir CombatSimulator.simulate_combat_batch).
+        """
+        self._flush_pending()
+        self._flush_deaths()
+        self._store_cards(*np.nonzero(self.occupied))
+
+        # Les dégâts ont été résolus dans les tableaux: agrégats recalculés une fois
+        if aggregates:
+            for state in self.states:
+                state.recompute_aggregates()
+
+    # ------------------------------------------------------------------
+    # Début / fin de combat
+    # ------------------------------------------------------------------
+
+    def start_combat(self):
+        """Effets de début de combat, mélange et pioche pour tous les combats"""
+        occupied = self.occupied
+
+        # Venin tick au début
+        venin = self.statuses[:, :, VENIN]
+        poisoned = np.nonzero(occupied & (venin != 0))
+        self._take_damage(poisoned[0], poisoned[1], venin[poisoned])
+
+        # Malédiction réduit la vitesse
+        cursed = occupied & (self.statuses[:, :, MALEDICTION] != 0)
+        self.spd[cursed] = np.maximum(1, self.spd[cursed] - 1)
+
+        # Mélanger le deck (tous les combats d'un coup) et piocher la main
+        shuffle_many(self.rngs, [state.deck for state in self.states])
+        for b in range(self.size):
+            self._draw_cards(b, 5)
+        self._load_hands()
+
+        self._apply_terrain_modifiers()
+
+    def _apply_terrain_modifiers(self):
+        """Applique les modificateurs de terrain (Lave, Brouillard)"""
+        terrains = np.array([s.terrain_modifiers.get('type') or '' for s in self.states])
+        rows = np.arange(SLOTS)
+        front = (rows % FIELD_SIZE) < 3
+
+        lava = (terrains == 'LAVE')[:, None] & front & self.occupied
+        lava &= (self.keywords & KEYWORD_BIT[Keyword.VOL]) == 0
+        b, row = np.nonzero(lava)
+        self._apply_status(b, row, np.full(len(b), BRULURE), np.ones(len(b), dtype=np.int32))
+
+        fog = (terrains == 'BROUILLARD')[:, None] & ~front & self.occupied
+        self.spd[fog] = np.maximum(1, self.spd[fog] - 1)
+
+    def _burn(self, idx: np.ndarray):
+        """Brûlure de fin de combat pour les combats terminés"""
+        burning = self.occupied[idx] & (self.statuses[idx, :, BRULURE] != 0)
+        sub, row = np.nonzero(burning)
+        b = idx[sub]
+        self._take_damage(b, row, self.statuses[b, row, BRULURE])
+
+    def _draw_cards(self, b: int, count: int):
+        """Pioche des cartes du deck vers la main (voir CombatResolver.draw_cards)"""
+        state = self.states[b]
+        for _ in range(count):
+            if state.deck and len(state.hand) < 10:
+                state.hand.append(state.deck.pop(0))
+            elif state.discard:
+                state.deck = state.discard[:]
+                state.discard = []
+                shuffle(self.rngs[b], state.deck)
+                if state.deck:
+                    state.hand.append(state.deck.pop(0))
+
+    # ------------------------------------------------------------------
+    # Déploiement
+    # ------------------------------------------------------------------
+
+    def play_card(self, b: int, card: Card, position: int) -> bool:
+        """Joue une carte depuis la main du combat b (voir CombatResolver.play_card)"""
+        state = self.states[b]
+        if card.cost > state.energy:
+            return False
+
+        if position < 0 or position >= FIELD_SIZE:
+            return False
+
+        if state.player_field[position] is not None:
+            return False
+
+        for i, held in enumerate(state.hand):
+            if held is card:
+                break
+        else:
+            raise ValueError(f"{card.name} n'est pas dans la main")
+
+        self.energy[b] = state.energy  # L'état fait foi pour les politiques par vue
+        self.deploy(np.array([b]), np.array([i]), np.array([position]))
+        return True
+
+    def deploy(self, b: np.ndarray, hand_index: np.ndarray, position: np.ndarray):
+        """Pose la carte hand_index de la main de chaque combat de b en position.
+
+        Au plus une pose par combat; coût et emplacement libre sont à
+        vérifier par l'appelant (voir play_card).
+        """
+        self.energy[b] -= self.hand_cost[b, hand_index]
+        self.occupied[b, position] = True
+
+        # Retire les cartes des mains: la fin de chaque ligne recule d'une case
+        columns = np.arange(self.hand_cost.shape[1])
+        source = columns + (columns >= hand_index[:, None])
+        hands = np.take_along_axis(self.hand_cost[b], np.minimum(source, columns[-1]), axis=1)
+        hands[:, -1] = -1
+        self.hand_cost[b] = hands
+
+        for i, index, row in zip(b.tolist(), hand_index.tolist(), position.tolist()):
+            state = self.states[i]
+            card = state.hand.pop(index)
+            state.energy -= card.cost
+            list.__setitem__(state.player_field, row, card)
+
+            # Chargement différé: les déploiements sont copiés par paquets
+            self._pending.append((i, row, card))
+            for op, _, value, _ in card.program.on_deploy:
+                self._apply_on_deploy_effect(i, row, op, value)
+
+    def _apply_on_deploy_effect(self, b: int, source: int, op: Op, value: int):
+        """Applique une instruction de déploiement (différée jusqu'au chargement des cartes)"""
+        if op == Op.SHIELD_BACK_ALLY:
+            for row in range(3, FIELD_SIZE):
+                if self.occupied[b, row]:
+                    self._deferred.append((self.shields, b, row, value))
+                    break
+
+        elif op == Op.BUFF_ALLIES:
+            for row in range(FIELD_SIZE):
+                if self.occupied[b, row] and row != source:
+                    self._deferred.append((self.atk, b, row, value))
+
+    def resolver_view(self, b: int) -> 'BatchResolverView':
+        """Vue d'un combat compatible avec les IA qui appellent play_card"""
+        return BatchResolverView(self, b)
+
+    # ------------------------------------------------------------------
+    # Résolution des tours
+    # ------------------------------------------------------------------
+
+    def process_turn(self, active: Optional[np.ndarray] = None):
+        """Traite un tour complet pour tous les combats actifs"""
+        if active is None:
+            idx = np.arange(self.size)
+        else:
+            idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            return
+
+        self._flush_pending()
+        self.energy[idx] = 3
+        for b in idx.tolist():
+            self.states[b].turn += 1
+            self.states[b].energy = 3
+            # Départages du tour, une clé par unité comme InitiativeScheduler.new_turn
+            rows = np.flatnonzero(self.occupied[b])
+            self.tiebreak[b, rows] = draw_block(self.rngs[b], len(rows))
+
+        order, in_order = self._initiative_order(idx)
+
+        for step in range(SLOTS):
+            rows = order[:, step]
+            ready = in_order[:, step] & (self.dur[idx, rows] > 0)
+            if ready.any():
+                self._attack(idx[ready], rows[ready])
+
+        # Brûlure pour les combats qui viennent de se terminer
+        over = self.outcome(idx) != ONGOING
+        if over.any():
+            self._burn(idx[over])
+
+        self._flush_deaths()
+
+    def _initiative_order(self, idx: np.ndarray):
+        """Ordre d'attaque par vitesse décroissante, égalités départagées par la clé
+        tirée en début de tour (même ordre que InitiativeScheduler)"""
+        occupied = self.occupied[idx]
+        speeds = np.where(occupied, self.spd[idx], -1)
+
+        order = np.lexsort((self.tiebreak[idx], speeds), axis=1)[:, ::-1]
+        return order, np.take_along_axis(occupied, order, axis=1)
+
+    def _find_targets(self, b: np.ndarray, row: np.ndarray) -> np.ndarray:
+        """Cible de chaque attaquant (ligne du tableau) ou -1 (voir CombatResolver._find_target)"""
+        position = row % FIELD_SIZE
+        base = np.where(row < FIELD_SIZE, FIELD_SIZE, 0)
+        enemy_rows = base[:, None] + np.arange(FIELD_SIZE)
+        enemies = self.occupied[b[:, None], enemy_rows]
+        occupancy = enemies @ SLOT_BITS
+
+        # Percée: frappe l'arrière si l'avant en face a des boucliers
+        column = position % 3
+        pierce = (self.keywords[b, row] & KEYWORD_BIT[Keyword.PERCEE]) != 0
+        pierce &= enemies[np.arange(len(b)), column] & (self.shields[b, base + column] > 0)
+
+        target = TARGET_ARRAY[target_index(position, occupancy, pierce.astype(np.int64))]
+
+        # Bond: la créature avec le moins de DUR
+        bond = (self.keywords[b, row] & KEYWORD_BIT[Keyword.BOND]) != 0
+        if bond.any():
+            durs = np.where(enemies, self.dur[b[:, None], enemy_rows], np.iinfo(np.int32).max)
+            target = np.where(bond, durs.argmin(axis=1), target)
+
+        return np.where(occupancy != 0, base + target, -1)
+
+    def _attack(self, b: np.ndarray, row: np.ndarray):
+        """Chaque combat de b fait attaquer son unité row (voir CombatResolver._unit_attack)"""
+        target = self._find_targets(b, row)
+        engaged = target >= 0
+        b, row, target = b[engaged], row[engaged], target[engaged]
+
+        damage = self._effective_atk(b, row)
+
+        # Saignement de l'attaquant
+        bleed = self.statuses[b, row, SAIGNEMENT]
+        bleeding = bleed != 0
+        self._take_damage(b[bleeding], row[bleeding], bleed[bleeding])
+
+        # Carapace: convertit le coup en perte d'ATQ pour l'attaquant
+        shields = self.shields[b, target]
+        carapace = ((self.keywords[b, target] & KEYWORD_BIT[Keyword.CARAPACE]) != 0) & (shields > 0)
+        blocked = ~carapace & (shields > 0)
+        struck = ~carapace & ~blocked
+
+        cb, cr = b[carapace], row[carapace]
+        self.atk[cb, cr] = np.maximum(1, self.atk[cb, cr] - 1)
+        self.shields[b[carapace | blocked], target[carapace | blocked]] -= 1
+
+        self.dur[b[struck], target[struck]] -= damage[struck]
+        died = struck & (self.dur[b, target] <= 0)
+        if died.any():
+            self._trigger(ON_DEATH, b[died], target[died], row[died])
+            self.occupied[b[died], target[died]] = False
+            self._deaths.append(np.stack([b[died], target[died]]))
+
+        hit = ~carapace
+        self._trigger(ON_HIT, b[hit], row[hit], target[hit])
+        self._trigger(ON_ATTACK, b, row, target)
+
+    def _effective_atk(self, b: np.ndarray, row: np.ndarray) -> np.ndarray:
+        """ATQ effective (voir Card.get_effective_atk)"""
+        atk = np.where(self.statuses[b, row, OFFENSE_EMOUSSEE] != 0, 1, self.atk[b, row])
+        return np.maximum(1, atk)
+
+    def _take_damage(self, b: np.ndarray, row: np.ndarray, amount: np.ndarray):
+        """Dégâts permanents, absorbés d'abord par les boucliers (voir Card.take_damage)"""
+        shields = self.shields[b, row]
+        absorbed = np.minimum(shields, np.maximum(amount, 0))
+        self.shields[b, row] = shields - absorbed
+        self.dur[b, row] -= amount - absorbed
+
+    def _apply_status(self, b: np.ndarray, row: np.ndarray, status: np.ndarray, value: np.ndarray):
+        """Applique une altération permanente (voir Card.apply_status)"""
+        self.statuses[b, row, status] += value
+
+        fracture = status == FRACTURE
+        fb, fr = b[fracture], row[fracture]
+        self.atk[fb, fr] = np.maximum(1, self.atk[fb, fr] - value[fracture])
+
+        blunted = status == OFFENSE_EMOUSSEE
+        ob, orow = b[blunted], row[blunted]
+        self.atk[ob, orow] = np.minimum(self.atk[ob, orow], 1)
+
+    def _trigger(self, trigger: int, b: np.ndarray, source: np.ndarray, target: np.ndarray):
+        """Applique les effets encodés d'un déclencheur de source vers target"""
+        if len(b) == 0:
+            return
+
+        template = self.template[b, source]
+        for k in range(self.effect_status.shape[-1]):
+            status = self.effect_status[template, trigger, k].astype(np.intp)
+            applies = status >= 0
+            if applies.any():
+                value = self.effect_value[template, trigger, k]
+                self._apply_status(b[applies], target[applies], status[applies], value[applies])
+
+            shield = self.effect_shield[template, trigger, k]
+            grants = shield != 0
+            if grants.any():
+                self.shields[b[grants], target[grants]] += shield[grants]
+
+    def _flush_deaths(self):
+        """Retire les créatures mortes des terrains et met à jour leurs objets Card"""
+        if not self._deaths:
+            return
+
+        b, rows = np.concatenate(self._deaths, axis=1)
+        self._deaths.clear()
+        self._store_cards(b, rows)
+        for i, row in zip(b.tolist(), rows.tolist()):
+            list.__setitem__(self._field(i, row), row % FIELD_SIZE, None)
+            self.cards[i][row] = None
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def presence(self, is_player: bool, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Présence totale d'un camp pour chaque combat"""
+        self._flush_pending()
+        side = slice(0, FIELD_SIZE) if is_player else slice(FIELD_SIZE, SLOTS)
+        if idx is None:
+            idx = np.arange(self.size)
+        return (self.dur[idx, side] * self.occupied[idx, side]).sum(axis=1)
+
+    def outcome(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """VICTORY, DEFEAT ou ONGOING pour chaque combat (voir CombatState.is_combat_over)"""
+        result = np.full(self.size if idx is None else len(idx), ONGOING, dtype=np.int8)
+        result[self.presence(True, idx) == 0] = DEFEAT
+        result[self.presence(False, idx) == 0] = VICTORY
+        return result
+
+
+class BatchResolverView:
+    """Expose play_card d'un seul combat du moteur vectorisé"""
+
+    def __init__(self, engine: BatchCombatEngine, index: int):
+        self.engine = engine
+        self.index = index
+        self.state = engine.states[index]
+
+    def play_card(self, card: Card, position: int) -> bool:
+        return self.engine.play_card(self.index, card, position)
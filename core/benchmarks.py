@@ -0,0 +1,134 @@
+# core/benchmarks.py
+"""Débit du simulateur de combat: résolution en série contre moteur vectorisé,
+et coût des déclencheurs sur des decks chargés en statuts.
+
+Usage: python core/benchmarks.py [combats] [batch_size]
+"""
+
+from typing import Dict, List, Tuple
+import random
+import sys
+import time
+import timeit
+
+from entities import Card, CombatState, StatusEffect
+from catalog import load_catalog
+from balance import CombatSimulator
+from calibration import DeckSampler
+from combat import CombatResolver
+from events import LogLevel
+
+# Capacités des decks chargés en statuts (3 effets à l'attaque, 2 à l'impact)
+STATUS_HEAVY = {
+    'on_attack': ({"effect": StatusEffect.VENIN, "value": 1},
+                  {"effect": StatusEffect.SAIGNEMENT, "value": 1},
+                  {"effect": StatusEffect.BRULURE, "value": 1}),
+    'on_hit': ({"effect": StatusEffect.FRACTURE, "value": 1}, {"type": "shield", "value": 1}),
+}
+
+
+def catalogue_matchups(count: int, deck_size: int = 8, enemies: int = 4,
+                       seed: int = 0) -> List[Tuple[List[Card], List[Card]]]:
+    """Combats tirés uniformément dans le catalogue (decks prêts, hors chronomètre)"""
+    templates = list(load_catalog().templates.values())
+    rng = random.Random(seed)
+    return [
+        ([rng.choice(templates).instantiate() for _ in range(deck_size)],
+         [rng.choice(templates).instantiate() for _ in range(enemies)])
+        for _ in range(count)
+    ]
+
+
+def status_heavy_matchups(count: int, deck_size: int = 8, enemies: int = 4,
+                          seed: int = 0) -> List[Tuple[List[Card], List[Card]]]:
+    """Combats du catalogue dont toutes les cartes portent les capacités STATUS_HEAVY"""
+    heavy = {t.id: t.derive(**STATUS_HEAVY) for t in load_catalog().templates.values()}
+    return [
+        ([heavy[c.id].instantiate() for c in player], [heavy[c.id].instantiate() for c in foes])
+        for player, foes in catalogue_matchups(count, deck_size, enemies, seed)
+    ]
+
+
+def benchmark_triggers(calls: int = 100000, combats: int = 1500, seed: int = 0) -> Dict:
+    """Coût d'un déclencheur on_attack à 3 effets (µs) et débit des combats en série"""
+    source, target = (t.instantiate() for t in (
+        load_catalog().templates[card_id].derive(**STATUS_HEAVY)
+        for card_id in ("forest_azure_spider", "forest_ivy_boar")
+    ))
+    resolver = CombatResolver(CombatState(), rng_seed=seed, log_level=LogLevel.OFF)
+    program = source.program.on_attack
+    trigger = min(timeit.repeat(lambda: resolver._run_program(program, source, target),
+                                number=calls, repeat=3)) / calls
+
+    matchups = status_heavy_matchups(combats, seed=seed)
+    simulator = CombatSimulator(seed=seed)
+    start = time.perf_counter()
+    for player, enemies in matchups:
+        simulator.simulate_combat(player, enemies)
+
+    return {'trigger_us': trigger * 1e6, 'combats': combats / (time.perf_counter() - start)}
+
+
+def benchmark_combats(combats: int = 2000, batch_size: int = 256, seed: int = 0) -> Dict:
+    """Combats par seconde de simulate_combat et simulate_combat_batch sur les mêmes decks.
+
+    'identical' vérifie au passage que les deux modes donnent les mêmes issues.
+    """
+    serial_matchups = catalogue_matchups(combats, seed=seed)
+    batch_matchups = catalogue_matchups(combats, seed=seed)
+
+    simulator = CombatSimulator(seed=seed)
+    start = time.perf_counter()
+    serial = [simulator.simulate_combat(player, enemies) for player, enemies in serial_matchups]
+    serial_time = time.perf_counter() - start
+
+    simulator = CombatSimulator(seed=seed)
+    start = time.perf_counter()
+    batched = []
+    for offset in range(0, combats, batch_size):
+        batched.extend(simulator.simulate_combat_batch(batch_matchups[offset:offset + batch_size]))
+    batch_time = time.perf_counter() - start
+
+    # Part fixe par combat (préparation et réécriture, sans aucun tour)
+    fixed_matchups = catalogue_matchups(combats, seed=seed)
+    simulator = CombatSimulator(seed=seed)
+    start = time.perf_counter()
+    for offset in range(0, combats, batch_size):
+        simulator.simulate_combat_batch(fixed_matchups[offset:offset + batch_size], max_turns=0)
+    fixed_time = time.perf_counter() - start
+
+    return {
+        'serial': combats / serial_time,
+        'batch': combats / batch_time,
+        'speedup': serial_time / batch_time,
+        'fixed_share': fixed_time / batch_time,
+        'identical': [(r.winner, r.turns) for r in serial] == [(r.winner, r.turns) for r in batched]
+    }
+
+
+def benchmark_sweep(combats: int = 2000, batch_size: int = 256, seed: int = 0) -> Dict:
+    """Combats par seconde de run_batch_simulation (génération des decks comprise)"""
+    templates = list(load_catalog().templates.values())
+    players, enemies = DeckSampler(templates, 8), DeckSampler(templates, 4)
+
+    rates = {}
+    for mode, size in (('serial', None), ('batch', batch_size)):
+        start = time.perf_counter()
+        CombatSimulator(seed=seed).run_batch_simulation(combats, players, enemies, batch_size=size)
+        rates[mode] = combats / (time.perf_counter() - start)
+    rates['speedup'] = rates['batch'] / rates['serial']
+    return rates
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    for label, result in (("Combats prêts", benchmark_combats(count, size)),
+                          ("run_batch_simulation", benchmark_sweep(count, size))):
+        print(f"{label}: série {result['serial']:.0f} combats/s, "
+              f"vectorisé {result['batch']:.0f} combats/s (x{result['speedup']:.2f})")
+        if 'fixed_share' in result:
+            print(f"  part fixe par combat: {result['fixed_share']:.0%} du temps vectorisé")
+    triggers = benchmark_triggers()
+    print(f"Decks chargés en statuts: déclencheur on_attack {triggers['trigger_us']:.2f} µs, "
+          f"{triggers['combats']:.0f} combats/s en série")
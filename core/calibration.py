@@ -0,0 +1,266 @@
+# core/calibration.py
+"""Calibration des coefficients de BalanceFormulas sur les taux de victoire simulés"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from hashlib import blake2b
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import random
+
+import numpy as np
+
+from entities import Card, CardTemplate, StatusEffect
+from balance import (CombatSimulator, BalanceFormulas, FormulaCoefficients,
+                     DEFAULT_COEFFICIENTS, card_features)
+
+
+# Taux de victoire par carte d'un ensemble: id -> (victoires, parties)
+WinTable = Dict[str, Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class EvaluationSettings:
+    """Protocole de simulation d'un ensemble de cartes (fait partie de la clé de cache)"""
+    combats: int = 2000
+    deck_size: int = 8
+    act: int = 1
+    seed: int = 0  # Mêmes combats pour tous les candidats: les écarts viennent des cartes
+    batch_size: Optional[int] = 256
+
+
+class DeckSampler:
+    """Générateur de decks joueur tirés uniformément dans un ensemble (picklable)"""
+
+    def __init__(self, templates: Sequence[CardTemplate], deck_size: int):
+        self.templates = list(templates)
+        self.deck_size = deck_size
+
+    def __call__(self, act: int, rng: random.Random) -> List[Card]:
+        return [rng.choice(self.templates).instantiate() for _ in range(self.deck_size)]
+
+
+def rebalance(templates: Sequence[CardTemplate], coefficients: FormulaCoefficients,
+              max_change: int = 3) -> List[CardTemplate]:
+    """Ajuste la DUR de chaque carte pour rapprocher son score du budget de sa rareté.
+
+    C'est l'ensemble que le jeu aurait si la formule candidate servait à
+    l'équilibrer; l'ajustement est borné à max_change points.
+    """
+    weights = coefficients.vector()
+    per_dur = max(coefficients.dur, 0.05)
+    balanced = []
+    for template in templates:
+        gap = BalanceFormulas.calculate_card_budget(template.rarity) - card_features(template) @ weights
+        change = int(np.clip(round(gap / per_dur), -max_change, max_change))
+        dur = max(1, template.base_dur + change)
+        balanced.append(template.derive(base_dur=dur) if dur != template.base_dur else template)
+    return balanced
+
+
+def evaluate_card_set(templates: Sequence[CardTemplate], enemy_deck_generator: Callable,
+                      settings: EvaluationSettings) -> WinTable:
+    """Simule un ensemble de cartes et rend victoires et parties par carte"""
+    simulator = CombatSimulator(seed=settings.seed)
+    simulator.run_batch_simulation(
+        settings.combats, DeckSampler(templates, settings.deck_size), enemy_deck_generator,
+        act=settings.act, batch_size=settings.batch_size
+    )
+    return {
+        card_id: (round(stats.win_rate * stats.usage_count), stats.usage_count)
+        for card_id, stats in simulator.card_stats.items()
+    }
+
+
+class SimulationCache:
+    """Résultats par ensemble de cartes, un fichier JSON par ensemble dans path.
+
+    La clé hache les stats de chaque carte, le protocole et le générateur
+    d'ennemis: deux candidats qui arrondissent au même ensemble ne sont
+    simulés qu'une fois, y compris d'une nuit à l'autre.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._memory: Dict[str, WinTable] = {}
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(templates: Sequence[CardTemplate], enemy_deck_generator: Callable,
+            settings: EvaluationSettings) -> str:
+        cards = sorted(t.signature for t in templates)
+        generator = f"{enemy_deck_generator.__module__}.{enemy_deck_generator.__qualname__}"
+        payload = json.dumps([cards, generator, asdict(settings)], default=str)
+        return blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[WinTable]:
+        table = self._memory.get(key)
+        if table is None and self.path is not None:
+            file = os.path.join(self.path, f"{key}.json")
+            if os.path.exists(file):
+                with open(file, 'r', encoding='utf-8') as f:
+                    table = {card_id: tuple(counts) for card_id, counts in json.load(f).items()}
+                self._memory[key] = table
+        if table is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return table
+
+    def put(self, key: str, table: WinTable):
+        self._memory[key] = table
+        if self.path is not None:
+            file = os.path.join(self.path, f"{key}.json")
+            with open(file + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(table, f)
+            os.replace(file + ".tmp", file)
+
+
+@dataclass
+class CalibrationResult:
+    """Formule calibrée et qualité de l'équilibrage qu'elle produit"""
+    coefficients: FormulaCoefficients
+    fitness: float
+    # Écart du taux de victoire de chaque carte rééquilibrée au taux moyen
+    residuals: Dict[str, float]
+    history: List[float] = field(default_factory=list)  # Meilleure fitness par génération
+    evaluations: int = 0  # Ensembles simulés (hors cache)
+
+    def save(self, path: str):
+        """Écrit la formule (poids nommés) et les résidus en JSON"""
+        weights = dict(zip(FormulaCoefficients.names(), self.coefficients.vector().tolist()))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'coefficients': weights, 'fitness': self.fitness,
+                       'residuals': self.residuals, 'history': self.history}, f, indent=2)
+
+
+class FormulaOptimizer:
+    """Recherche évolutionnaire des coefficients (méthode de l'entropie croisée).
+
+    Chaque génération tire population vecteurs de coefficients autour de la
+    moyenne courante. Un candidat est évalué en rééquilibrant les cartes avec
+    sa formule (rebalance) puis en simulant l'ensemble obtenu: une formule
+    juste donne des cartes au budget également fortes. La fitness (à
+    minimiser) est l'écart-type des taux de victoire par carte, plus l'écart
+    du taux moyen à celui de l'ensemble d'origine (sans quoi gonfler toutes
+    les cartes serait une solution). La moyenne et l'écart-type de la
+    génération suivante sont ceux des elite meilleurs.
+
+    L'ATQ sert d'unité (poids fixé à 1). Les ensembles à simuler d'une
+    génération sont répartis entre workers processus; le générateur
+    d'ennemis doit alors être picklable et accepter rng.
+    """
+
+    def __init__(self, templates: Sequence[CardTemplate], enemy_deck_generator: Callable,
+                 settings: EvaluationSettings = EvaluationSettings(), population: int = 32,
+                 elite: int = 8, sigma: float = 0.3, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None, initial: FormulaCoefficients = DEFAULT_COEFFICIENTS,
+                 seed: Optional[int] = None):
+        if not 0 < elite <= population:
+            raise ValueError("elite doit être entre 1 et population")
+
+        self.templates = list(templates)
+        self.enemy_deck_generator = enemy_deck_generator
+        self.settings = settings
+        self.population = population
+        self.elite = elite
+        self.workers = workers
+        self.cache = SimulationCache(cache_dir)
+        self.rng = np.random.default_rng(seed)
+
+        start = initial.vector()
+        # Les altérations ignorées par la formule d'origine partent de leur valeur indicative
+        statuses = slice(4 + len(initial.keywords), None)
+        if not start[statuses].any():
+            start[statuses] = [BalanceFormulas.status_effect_value(s) for s in StatusEffect]
+        self.mean = start
+        self.sigma = np.full(len(start), sigma)
+        self.sigma[0] = 0.0  # ATQ: unité
+        self.evaluations = 0
+        self._baseline: Optional[float] = None
+
+    def run(self, generations: int) -> CalibrationResult:
+        """Fait évoluer la formule pendant generations générations"""
+        self._baseline = _mean_win_rate(self._evaluate([self.templates])[0])
+        best: Optional[Tuple[float, np.ndarray, WinTable]] = None
+        history = []
+
+        for _ in range(generations):
+            candidates = self.mean + self.sigma * self.rng.standard_normal(
+                (self.population, len(self.mean))
+            )
+            candidates = np.maximum(candidates, 0.0)
+            candidates[:, 0] = 1.0
+            candidates[0] = self.mean  # La moyenne courante est toujours réévaluée
+
+            card_sets = [rebalance(self.templates, FormulaCoefficients.from_vector(v))
+                         for v in candidates]
+            tables = self._evaluate(card_sets)
+            scores = np.array([self.fitness(table) for table in tables])
+
+            order = np.argsort(scores, kind='stable')
+            if best is None or scores[order[0]] < best[0]:
+                best = (float(scores[order[0]]), candidates[order[0]], tables[order[0]])
+            history.append(best[0])
+
+            elites = candidates[order[:self.elite]]
+            self.mean = elites.mean(axis=0)
+            self.sigma = np.maximum(elites.std(axis=0), 0.02)
+            self.sigma[0] = 0.0
+
+        fitness, vector, table = best
+        mean = _mean_win_rate(table)
+        return CalibrationResult(
+            coefficients=FormulaCoefficients.from_vector(vector),
+            fitness=fitness,
+            residuals={card_id: wins / plays - mean for card_id, (wins, plays) in table.items()},
+            history=history,
+            evaluations=self.evaluations
+        )
+
+    def fitness(self, table: WinTable) -> float:
+        """Dispersion des taux de victoire (pondérée par les parties) et dérive du taux moyen"""
+        wins = np.array([w for w, _ in table.values()], dtype=float)
+        plays = np.array([p for _, p in table.values()], dtype=float)
+        rates = wins / plays
+        mean = float(np.average(rates, weights=plays))
+        spread = float(np.sqrt(np.average((rates - mean) ** 2, weights=plays)))
+        baseline = self._baseline if self._baseline is not None else mean
+        return spread + abs(mean - baseline)
+
+    def _evaluate(self, card_sets: List[List[CardTemplate]]) -> List[WinTable]:
+        """Tables de victoires des ensembles, depuis le cache ou simulées (en parallèle)"""
+        keys = [SimulationCache.key(cards, self.enemy_deck_generator, self.settings)
+                for cards in card_sets]
+        tables: Dict[str, Optional[WinTable]] = {}
+        missing = []
+        for key, cards in zip(keys, card_sets):
+            if key not in tables:  # Les doublons d'une génération ne sont simulés qu'une fois
+                tables[key] = self.cache.get(key)
+                if tables[key] is None:
+                    missing.append((key, cards))
+
+        if self.workers and self.workers > 1 and len(missing) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(evaluate_card_set, cards, self.enemy_deck_generator,
+                                       self.settings) for _, cards in missing]
+                computed = [future.result() for future in futures]
+        else:
+            computed = [evaluate_card_set(cards, self.enemy_deck_generator, self.settings)
+                        for _, cards in missing]
+
+        for (key, _), table in zip(missing, computed):
+            self.cache.put(key, table)
+            tables[key] = table
+        self.evaluations += len(missing)
+        return [tables[key] for key in keys]
+
+
+def _mean_win_rate(table: WinTable) -> float:
+    wins = sum(w for w, _ in table.values())
+    plays = sum(p for _, p in table.values())
+    return wins / plays if plays else 0.0
@@ -0,0 +1,194 @@
+# core/catalog.py
+"""Catalogue des cartes - chargement de data/cards.json, cache binaire et index"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
+import hashlib
+import json
+import os
+import pickle
+
+from entities import (
+    CardTemplate, Biome, Rarity, Keyword, StatusEffect, ABILITIES, ability_from_json, keyword_mask
+)
+
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "cards.json"
+
+# À incrémenter à chaque changement de CardTemplate ou du format du cache
+CACHE_VERSION = 3
+
+# Clés reconnues d'une entrée; les autres sont conservées dans CardTemplate.extra
+REQUIRED_FIELDS = {"name": str, "biome": str, "rarity": str,
+                   "cost": int, "atk": int, "dur": int, "spd": int}
+OPTIONAL_FIELDS = {"keywords", "description"} | set(ABILITIES)
+
+# Clé d'index: (biome, rareté, coût, mot-clé), None = n'importe lequel
+IndexKey = Tuple[Optional[Biome], Optional[Rarity], Optional[int], Optional[Keyword]]
+
+
+@dataclass
+class CardCatalog:
+    """Cartes validées du catalogue, leurs modèles et les index secondaires"""
+    records: Dict[str, Dict[str, Any]]  # Entrées brutes de cards.json
+    templates: Dict[str, CardTemplate]
+    index: Dict[IndexKey, Tuple[CardTemplate, ...]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.index:
+            self.index = build_index(self.templates.values())
+
+    def query(self, biome: Optional[Biome] = None, rarity: Optional[Rarity] = None,
+              cost: Optional[int] = None, keyword: Optional[Keyword] = None
+              ) -> Tuple[CardTemplate, ...]:
+        """Modèles correspondant à tous les critères donnés (une seule recherche)"""
+        return self.index.get((biome, rarity, cost, keyword), ())
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+
+def build_index(templates) -> Dict[IndexKey, Tuple[CardTemplate, ...]]:
+    """Index de toutes les combinaisons de critères, dans l'ordre du catalogue"""
+    index: Dict[IndexKey, List[CardTemplate]] = defaultdict(list)
+    for template in templates:
+        for biome in (None, template.biome):
+            for rarity in (None, template.rarity):
+                for cost in (None, template.cost):
+                    for keyword in (None, *template.keywords):
+                        index[biome, rarity, cost, keyword].append(template)
+    return {key: tuple(matches) for key, matches in index.items()}
+
+
+def validate_records(records: Any) -> List[str]:
+    """Liste des erreurs du contenu de cards.json (vide si valide)"""
+    if not isinstance(records, dict):
+        return ["'cards' doit être un objet {id: carte}"]
+
+    errors = []
+    for card_id, data in records.items():
+        if not isinstance(data, dict):
+            errors.append(f"{card_id}: l'entrée doit être un objet")
+            continue
+
+        for name, kind in REQUIRED_FIELDS.items():
+            if not isinstance(data.get(name), kind) or isinstance(data.get(name), bool):
+                errors.append(f"{card_id}: champ '{name}' manquant ou invalide")
+
+        if data.get("biome") not in Biome._value2member_map_:
+            errors.append(f"{card_id}: biome inconnu {data.get('biome')!r}")
+        if data.get("rarity") not in Rarity._value2member_map_:
+            errors.append(f"{card_id}: rareté inconnue {data.get('rarity')!r}")
+        for stat in ("cost", "atk", "spd"):
+            if isinstance(data.get(stat), int) and data[stat] < 0:
+                errors.append(f"{card_id}: '{stat}' négatif")
+        if isinstance(data.get("dur"), int) and data["dur"] < 1:
+            errors.append(f"{card_id}: 'dur' doit être au moins 1")
+
+        for keyword in data.get("keywords", []):
+            if keyword not in Keyword.__members__:
+                errors.append(f"{card_id}: mot-clé inconnu {keyword!r}")
+
+        for ability in ABILITIES:
+            effects = data.get(ability, [])
+            if not isinstance(effects, list) or not all(isinstance(e, dict) for e in effects):
+                errors.append(f"{card_id}: '{ability}' doit être une liste d'objets")
+                continue
+            for effect in effects:
+                status = effect.get("effect")
+                if status is not None and status not in StatusEffect.__members__:
+                    errors.append(f"{card_id}: statut inconnu {status!r} dans '{ability}'")
+
+    return errors
+
+
+def _build_template(card_id: str, data: Dict[str, Any]) -> CardTemplate:
+    """Modèle d'une entrée validée (noms de statuts convertis en StatusEffect)"""
+    abilities = {
+        ability: [ability_from_json(effect) for effect in data.get(ability, [])]
+        for ability in ABILITIES
+    }
+    return CardTemplate(
+        id=card_id,
+        name=data["name"],
+        biome=Biome(data["biome"]),
+        rarity=Rarity(data["rarity"]),
+        cost=data["cost"],
+        base_atk=data["atk"],
+        base_dur=data["dur"],
+        base_spd=data["spd"],
+        keyword_mask=keyword_mask(Keyword[k] for k in data.get("keywords", [])),
+        description=data.get("description", ""),
+        extra={k: v for k, v in data.items()
+               if k not in REQUIRED_FIELDS and k not in OPTIONAL_FIELDS},
+        **abilities
+    )
+
+
+def compile_catalog(raw: bytes, source: str = "cards.json") -> CardCatalog:
+    """Parse et valide le JSON du catalogue"""
+    records = json.loads(raw).get("cards")
+    errors = validate_records(records)
+    if errors:
+        raise ValueError(f"{source} invalide:\n- " + "\n- ".join(errors))
+
+    templates = {card_id: _build_template(card_id, data) for card_id, data in records.items()}
+    for template in templates.values():
+        template.program  # Capacités compilées une fois, conservées dans le cache
+    return CardCatalog(records=records, templates=templates)
+
+
+def cache_path(path: Path) -> Path:
+    """Cache binaire à côté du JSON (data/cards.json -> data/cards.cache)"""
+    return path.with_suffix(".cache")
+
+
+def _read_cache(path: Path, header: Dict[str, Any]) -> Optional[CardCatalog]:
+    """Catalogue en cache s'il correspond au JSON actuel, sinon None"""
+    try:
+        with open(cache_path(path), "rb") as f:
+            if pickle.load(f) != header:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def _write_cache(path: Path, header: Dict[str, Any], catalog: CardCatalog):
+    """Écrit le cache (atomique; ignoré si le dossier est en lecture seule)"""
+    target = cache_path(path)
+    tmp = target.with_suffix(".cache.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except OSError:
+        pass
+
+
+def load_catalog(path: Path = CATALOG_PATH, use_cache: bool = True) -> CardCatalog:
+    """Charge le catalogue, depuis le cache binaire s'il est à jour.
+
+    Le cache est périmé dès que la version du format, la date de
+    modification ou l'empreinte SHA-256 du JSON ne correspondent plus.
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    header = {
+        "version": CACHE_VERSION,
+        "mtime_ns": path.stat().st_mtime_ns,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+    }
+
+    if use_cache:
+        catalog = _read_cache(path, header)
+        if catalog is not None:
+            return catalog
+
+    catalog = compile_catalog(raw, str(path))
+    if use_cache:
+        _write_cache(path, header, catalog)
+    return catalog
@@ -1,16 +1,27 @@
 # core/combat.py
 """Système de combat avec altérations permanentes"""
 
-from typing import List, Optional, Dict, Tuple, Any
+from typing import List, NamedTuple, Optional, Dict, Sequence, Tuple, Any
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum, auto
 import random
-from copy import deepcopy
 
 from entities import (
-    Card, CombatState, StatusEffect, Keyword,
-    Biome, Rarity
+    Card, CombatState, CombatSnapshot, StatusEffect, Keyword,
+    Biome, Rarity, KEYWORD_BIT, STATUS_INDEX
 )
+from events import CombatEventLog, EventType, LogLevel
+from sampling import CardSampler, default_sampler
+from initiative import InitiativeScheduler, InitiativeEntry
+from targeting import TARGET_TABLE, PIERCE, target_index
+from abilities import Program, compile_effect
+from rng import PhiloxRandom, Purpose, as_random, shuffle
+
+
+_BOND = KEYWORD_BIT[Keyword.BOND]
+_PERCEE = KEYWORD_BIT[Keyword.PERCEE]
+_BRULURE = STATUS_INDEX[StatusEffect.BRULURE]
 
 
 class TargetingRule(Enum):
@@ -21,63 +32,112 @@ class TargetingRule(Enum):
     PIERCE = auto()  # Percée - traverse les boucliers
 
 
-class CombatAction:
-    """Représente une action de combat"""
-
-    def __init__(self, action_type: str, **kwargs):
-        self.type = action_type
-        self.params = kwargs
-
-    def execute(self, combat: 'CombatResolver', source: Optional[Card] = None):
-        """Exécute l'action dans le contexte du combat"""
-        method = getattr(combat, f'action_{self.type}', None)
-        if method:
-            method(source, **self.params)
+class ResolverSnapshot(NamedTuple):
+    """Instantané complet d'un CombatResolver (voir CombatResolver.snapshot)"""
+    state: CombatSnapshot
+    rng: Tuple
+    initiative: Tuple
+    events: Tuple
 
 
 class CombatResolver:
     """Moteur de résolution de combat"""
 
-    def __init__(self, state: CombatState, rng_seed: Optional[int] = None):
+    def __init__(self, state: CombatState, rng_seed: Optional[Any] = None,
+                 log_level: LogLevel = LogLevel.FULL, card_sampler: Optional[CardSampler] = None):
         self.state = state
-        self.rng = random.Random(rng_seed)
-        self.action_log: List[str] = []
-        self.animation_queue: List[Dict] = []
+        # Graine entière, ou générateur utilisé tel quel (ex: flux rng.PhiloxRandom)
+        self.rng = as_random(rng_seed)
+        self.events = CombatEventLog(log_level)
+        self.card_sampler = card_sampler
+        self.initiative = InitiativeScheduler(self.rng)
+        self.initiative.attach(state)
+
+        # Instantanés empilés par checkpoint(), dépilés par undo()
+        self._undo_log: List[ResolverSnapshot] = []
+
+        # Gestionnaires des instructions compilées, indexés par Op
+        self._handlers = (self._op_status, self._op_shield,
+                          self._op_shield_back_ally, self._op_buff_allies)
+
+    @property
+    def action_log(self) -> List[str]:
+        """Journal textuel, produit à la demande depuis le flux d'événements"""
+        return self.events.format()
+
+    # ------------------------------------------------------------------
+    # Instantanés pour la recherche (IA)
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> ResolverSnapshot:
+        """Capture le combat, le RNG, l'initiative et la position du flux d'événements"""
+        return ResolverSnapshot(self.state.snapshot(), self.rng.getstate(),
+                                self.initiative.snapshot(), self.events.snapshot())
+
+    def restore(self, snapshot: ResolverSnapshot):
+        """Revient exactement à un instantané: la suite du combat se rejoue à l'identique"""
+        self.initiative.restore(snapshot.initiative)
+        self.state.restore(snapshot.state)
+        self.rng.setstate(snapshot.rng)
+        self.events.restore(snapshot.events)
+
+    def checkpoint(self):
+        """Empile un instantané dans le journal d'annulation"""
+        self._undo_log.append(self.snapshot())
+
+    def undo(self):
+        """Annule tout ce qui a été joué depuis le dernier checkpoint()"""
+        self.restore(self._undo_log.pop())
+
+    @contextmanager
+    def speculate(self):
+        """Bloc spéculatif (ex: essayer un play_card puis un tour): annulé à la sortie"""
+        self.checkpoint()
+        try:
+            yield self
+        finally:
+            self.undo()
 
     def start_combat(self):
         """Initialise le combat - applique les effets de début"""
-        self.log("=== Début du combat ===")
+        self.events.emit(EventType.COMBAT_START)
 
         # Appliquer les effets de début de combat sur toutes les cartes
         for card in self._all_cards():
             if card:
                 # Venin tick au début
-                if StatusEffect.VENIN in card.permanent_statuses:
-                    damage = card.permanent_statuses[StatusEffect.VENIN]
-                    self.log(f"{card.name} subit {damage} dégâts de Venin")
-                    card.take_damage(damage)
+                damage = card.get_status(StatusEffect.VENIN)
+                if damage:
+                    self.events.emit(EventType.VENIN_TICK, card, value=damage)
+                    self.state.damage_card(card, damage)
 
                 # Malédiction réduit la vitesse
-                if StatusEffect.MALEDICTION in card.permanent_statuses:
-                    card.current_spd = max(1, card.current_spd - 1)
-                    self.log(f"{card.name} est ralenti par Malédiction")
+                if card.get_status(StatusEffect.MALEDICTION):
+                    self.state.set_speed(card, max(1, card.current_spd - 1))
+                    self.events.emit(EventType.CURSE_SLOW, card)
 
         # Mélanger le deck et piocher la main
-        self.rng.shuffle(self.state.deck)
+        shuffle(self.rng, self.state.deck)
         self.draw_cards(5)
 
         # Appliquer les modificateurs de terrain
         self._apply_terrain_modifiers()
 
-    def process_turn(self):
-        """Traite un tour complet de combat"""
+    def process_turn(self, tiebreak: Optional[Sequence[float]] = None):
+        """Traite un tour complet de combat.
+
+        tiebreak: clés de départage d'initiative imposées (voir
+        InitiativeScheduler.new_turn), tirées du RNG par défaut.
+        """
         self.state.turn += 1
-        self.log(f"\n--- Tour {self.state.turn} ---")
+        self.events.turn = self.state.turn
+        self.events.emit(EventType.TURN_START, value=self.state.turn)
 
         # Réinitialiser l'énergie
         self.state.energy = 3
 
         # Phase d'initiative - résoudre par vitesse décroissante
+        self.initiative.new_turn(tiebreak)
         units = self._get_units_by_speed()
 
         for unit, is_player, position in units:
@@ -100,111 +160,102 @@ class CombatResolver:
         damage = attacker.get_effective_atk()
 
         # Appliquer Saignement si l'attaquant en a
-        if StatusEffect.SAIGNEMENT in attacker.permanent_statuses:
-            bleed = attacker.permanent_statuses[StatusEffect.SAIGNEMENT]
-            attacker.take_damage(bleed)
-            self.log(f"{attacker.name} saigne et perd {bleed} DUR")
+        bleed = attacker.get_status(StatusEffect.SAIGNEMENT)
+        if bleed:
+            self.state.damage_card(attacker, bleed)
+            self.events.emit(EventType.BLEED, attacker, value=bleed)
 
         # Résoudre l'attaque
         self._resolve_attack(attacker, target, damage)
 
         # Effets "on_attack"
-        for effect_data in attacker.on_attack:
-            self._apply_effect(effect_data, attacker, target)
+        self._run_program(attacker.program.on_attack, attacker, target)
 
     def _find_target(self, attacker: Card, is_player: bool, position: int) -> Tuple[Optional[Card], int]:
-        """Trouve la cible appropriée selon les règles"""
+        """Trouve la cible appropriée selon les règles (voir targeting.TARGET_TABLE)"""
         enemy_field = self.state.enemy_field if is_player else self.state.player_field
-
-        # Gestion du Bond
-        if Keyword.BOND in attacker.keywords:
-            # Cible la créature avec le moins de DUR
-            weakest = None
-            weakest_pos = -1
-            for i, card in enumerate(enemy_field):
-                if card and (not weakest or card.current_dur < weakest.current_dur):
-                    weakest = card
-                    weakest_pos = i
-            return weakest, weakest_pos
-
-        # Gestion de Percée
-        if Keyword.PERCEE in attacker.keywords:
-            # Peut frapper l'arrière si l'avant a des boucliers
+        occupancy = self.state.occupied_mask(not is_player)
+        if not occupancy:
+            return None, -1
+
+        # Gestion du Bond - cible la créature avec le moins de DUR
+        keywords = attacker.keyword_mask
+        if keywords & _BOND:
+            target_pos = self.state.weakest_slot(not is_player)
+            return enemy_field[target_pos], target_pos
+
+        # Gestion de Percée - peut frapper l'arrière si l'avant a des boucliers
+        flags = 0
+        if keywords & _PERCEE:
             front = enemy_field[position % 3]  # Position correspondante en face
             if front and front.shields > 0:
-                # Chercher derrière
-                back_pos = (position % 3) + 3
-                if back_pos < 6 and enemy_field[back_pos]:
-                    return enemy_field[back_pos], back_pos
-
-        # Ciblage standard - la créature en face
-        if position < 3:  # Ligne avant
-            # Cherche en face sur la ligne avant ennemie
-            for i in range(3):
-                target_pos = i
-                if enemy_field[target_pos]:
-                    return enemy_field[target_pos], target_pos
-        else:  # Ligne arrière
-            # Cherche d'abord ligne arrière, puis avant
-            for i in range(3, 6):
-                if enemy_field[i]:
-                    return enemy_field[i], i
-            for i in range(3):
-                if enemy_field[i]:
-                    return enemy_field[i], i
-
-        # Cible par défaut - première créature trouvée
-        for i, card in enumerate(enemy_field):
-            if card:
-                return card, i
+                flags = PIERCE
 
-        return None, -1
+        target_pos = TARGET_TABLE[target_index(position, occupancy, flags)]
+        return enemy_field[target_pos], target_pos
 
     def _resolve_attack(self, attacker: Card, target: Card, damage: int):
         """Résout une attaque avec gestion des boucliers et effets"""
-        self.log(f"{attacker.name} attaque {target.name} pour {damage} dégâts")
+        self.events.emit(EventType.ATTACK, attacker, target, damage)
 
         # Gestion de Garde
-        if Keyword.GARDE in target.keywords:
+        if target.has_keyword(Keyword.GARDE):
             # Intercepte l'attaque destinée à l'arrière
             pass  # Déjà géré dans find_target
 
         # Gestion de Carapace
-        if Keyword.CARAPACE in target.keywords and target.shields > 0:
+        if target.has_keyword(Keyword.CARAPACE) and target.shields > 0:
             # Convertit le coup en réduction d'ATQ temporaire
-            attacker.current_atk = max(1, attacker.current_atk - 1)
-            target.shields -= 1
-            self.log(f"{target.name} active Carapace, {attacker.name} perd 1 ATQ")
+            self.state.set_atk(attacker, max(1, attacker.current_atk - 1))
+            self.state.add_shields(target, -1)
+            self.events.emit(EventType.CARAPACE, attacker, target)
             return
 
         # Application des dégâts
         if target.shields > 0:
-            target.shields -= 1
-            self.log(f"{target.name} bloque avec un bouclier")
+            self.state.add_shields(target, -1)
+            self.events.emit(EventType.SHIELD_BLOCK, attacker, target)
         else:
-            survived = target.take_damage(damage)
-            self.log(f"{target.name} subit {damage} dégâts (DUR: {target.current_dur})")
+            survived = self.state.damage_card(target, damage)
+            self.events.emit(EventType.DAMAGE, attacker, target, damage, target.current_dur)
 
             if not survived:
                 self._on_creature_death(target, attacker)
 
         # Effets "on_hit" de l'attaquant
-        for effect_data in attacker.on_hit:
-            self._apply_effect(effect_data, attacker, target)
+        self._run_program(attacker.program.on_hit, attacker, target)
+
+    def _run_program(self, program: Program, source: Card, target: Optional[Card]):
+        """Exécute les instructions compilées d'un déclencheur"""
+        handlers = self._handlers
+        for op, status, value, code in program:
+            handlers[op](source, target, status, value, code)
+
+    def _op_status(self, source: Card, target: Card, status: StatusEffect, value: int, code: int):
+        self.state.add_status(target, code, value)
+        self.events.emit(EventType.STATUS_APPLY, source, target, value, code)
+
+    def _op_shield(self, source: Card, target: Card, status: None, value: int, code: int):
+        self.state.add_shields(target, value)
+        self.events.emit(EventType.SHIELD_GAIN, source, target, value)
+
+    def _op_shield_back_ally(self, source: Card, target: None, status: None, value: int, code: int):
+        # Donne bouclier au premier allié de la ligne arrière
+        for i in range(3, 6):
+            ally = self.state.player_field[i]
+            if ally:
+                self.state.add_shields(ally, value)
+                break
+
+    def _op_buff_allies(self, source: Card, target: None, status: None, value: int, code: int):
+        # Buff tous les alliés
+        for ally in self.state.player_field:
+            if ally and ally is not source:
+                self.state.set_atk(ally, ally.current_atk + value)
 
     def _apply_effect(self, effect_data: Dict, source: Card, target: Card):
-        """Applique un effet de carte"""
-        effect_type = effect_data.get('effect')
-        value = effect_data.get('value', 1)
-
-        if isinstance(effect_type, StatusEffect):
-            target.apply_status(effect_type, value)
-            self.log(f"{source.name} applique {effect_type.value} {value} à {target.name}")
-
-        # Autres effets spéciaux
-        if effect_data.get('type') == 'shield':
-            target.shields += value
-            self.log(f"{target.name} gagne {value} Bouclier(s)")
+        """Applique une définition d'effet isolée (hors capacités d'un modèle)"""
+        self._run_program(compile_effect(effect_data, 'on_hit'), source, target)
 
     def play_card(self, card: Card, position: int) -> bool:
         """Joue une carte depuis la main"""
@@ -220,105 +271,101 @@ class CombatResolver:
         # Déployer la carte
         self.state.player_field[position] = card
         self.state.energy -= card.cost
-        self.state.hand.remove(card)
+        self._remove_from_hand(card)
 
-        self.log(f"Déploiement: {card.name} en position {position}")
+        self.events.emit(EventType.DEPLOY, card, value=position)
 
         # Effets "on_deploy"
-        for effect_data in card.on_deploy:
-            self._apply_on_deploy_effect(effect_data, card)
+        self._run_program(card.program.on_deploy, card, None)
 
         # Gestion de Tirailleur - bonus contre les nouvelles invocations
         for enemy in self.state.enemy_field:
-            if enemy and Keyword.TIRAILLEUR in enemy.keywords:
+            if enemy and enemy.has_keyword(Keyword.TIRAILLEUR):
                 # +1 ATQ temporaire ce tour contre cette invocation
                 pass
 
         return True
 
+    def _remove_from_hand(self, card: Card):
+        """Retire une carte de la main par identité (deux exemplaires sont égaux)"""
+        for i, held in enumerate(self.state.hand):
+            if held is card:
+                del self.state.hand[i]
+                return
+        raise ValueError(f"{card.name} n'est pas dans la main")
+
     def _apply_on_deploy_effect(self, effect_data: Dict, source: Card):
-        """Applique les effets de déploiement"""
-        effect_type = effect_data.get('type')
-
-        if effect_type == 'shield_ally':
-            # Donne bouclier à un allié
-            target_pos = effect_data.get('target', 'back')
-            if target_pos == 'back':
-                # Cherche un allié sur la ligne arrière
-                for i in range(3, 6):
-                    if self.state.player_field[i]:
-                        self.state.player_field[i].shields += effect_data.get('value', 1)
-                        break
-
-        elif effect_type == 'buff_allies':
-            # Buff tous les alliés
-            for ally in self.state.player_field:
-                if ally and ally != source:
-                    ally.current_atk += effect_data.get('atk', 0)
+        """Applique une définition d'effet de déploiement isolée"""
+        self._run_program(compile_effect(effect_data, 'on_deploy'), source, None)
 
     def _on_creature_death(self, creature: Card, killer: Optional[Card] = None):
         """Gère la mort d'une créature"""
-        self.log(f"{creature.name} est détruit!")
+        self.events.emit(EventType.DEATH, killer, creature)
 
         # Effets "on_death"
-        for effect_data in creature.on_death:
-            if killer:
-                self._apply_effect(effect_data, creature, killer)
+        if killer:
+            self._run_program(creature.program.on_death, creature, killer)
 
-        # Retirer du terrain
+        # Retirer du terrain (par identité: deux exemplaires sont égaux)
         for i, card in enumerate(self.state.player_field):
-            if card == creature:
+            if card is creature:
                 self.state.player_field[i] = None
                 return
 
         for i, card in enumerate(self.state.enemy_field):
-            if card == creature:
+            if card is creature:
                 self.state.enemy_field[i] = None
                 return
 
     def end_combat(self):
         """Termine le combat et applique les effets de fin"""
-        self.log("\n=== Fin du combat ===")
+        self.events.emit(EventType.COMBAT_END)
 
         # Appliquer Brûlure sur toutes les créatures
         for card in self._all_cards():
-            if card and StatusEffect.BRULURE in card.permanent_statuses:
-                damage = card.permanent_statuses[StatusEffect.BRULURE]
-                self.log(f"{card.name} brûle pour {damage} dégâts")
-                card.take_damage(damage)
+            damage = card.get_status(StatusEffect.BRULURE) if card else 0
+            if damage:
+                self.events.emit(EventType.BURN, card, value=damage)
+                self.state.damage_card(card, damage)
 
         # Calculer les récompenses
         victory = self.state.is_combat_over()
         if victory:
-            self.log("VICTOIRE!")
+            self.events.emit(EventType.VICTORY)
             return self._calculate_rewards()
         else:
-            self.log("DÉFAITE...")
+            self.events.emit(EventType.DEFEAT)
             return {}
 
     def _calculate_rewards(self) -> Dict:
         """Calcule les récompenses de victoire"""
+        # Sur un flux Philox, les récompenses ont leur propre flux: elles ne
+        # dépendent pas du nombre de tirages consommés par le combat
+        rng = self.rng.substream(Purpose.REWARD) if isinstance(self.rng, PhiloxRandom) else self.rng
         rewards = {
-            'fragments': self.rng.randint(10, 30),
+            'fragments': rng.randint(10, 30),
             'cards': [],
             'eggs': 0,
             'genes': 0
         }
 
         # Chance de drop de carte
-        if self.rng.random() < 0.3:
-            rewards['cards'].append(self._generate_reward_card())
+        if rng.random() < 0.3:
+            card_id = self._generate_reward_card(rng)
+            if card_id:
+                rewards['cards'].append(card_id)
 
         # Chance d'oeuf
-        if self.rng.random() < 0.1:
+        if rng.random() < 0.1:
             rewards['eggs'] = 1
 
         return rewards
 
-    def _generate_reward_card(self) -> str:
-        """Génère une carte comme récompense"""
-        # Logique pour générer une carte appropriée au biome/acte
-        return "forest_spine_frog"  # Placeholder
+    def _generate_reward_card(self, rng: random.Random) -> Optional[str]:
+        """Tire une carte de récompense selon l'acte et le biome du combat"""
+        sampler = self.card_sampler or default_sampler()
+        template = sampler.draw(rng, "reward", self.state.act, self.state.biome)
+        return template.id if template else None
 
     def draw_cards(self, count: int):
         """Pioche des cartes du deck vers la main"""
@@ -326,34 +373,23 @@ class CombatResolver:
             if self.state.deck and len(self.state.hand) < 10:
                 card = self.state.deck.pop(0)
                 self.state.hand.append(card)
-                self.log(f"Pioche: {card.name}")
+                self.events.emit(EventType.DRAW, card)
             elif self.state.discard:
                 # Remélanger la défausse
                 self.state.deck = self.state.discard[:]
                 self.state.discard = []
-                self.rng.shuffle(self.state.deck)
+                shuffle(self.rng, self.state.deck)
                 if self.state.deck:
                     card = self.state.deck.pop(0)
                     self.state.hand.append(card)
 
-    def _get_units_by_speed(self) -> List[Tuple[Card, bool, int]]:
-        """Retourne toutes les unités triées par vitesse décroissante"""
-        units = []
-
-        # Ajouter les unités du joueur
-        for i, card in enumerate(self.state.player_field):
-            if card:
-                units.append((card, True, i))
-
-        # Ajouter les unités ennemies
-        for i, card in enumerate(self.state.enemy_field):
-            if card:
-                units.append((card, False, i))
-
-        # Trier par vitesse décroissante (en cas d'égalité, ordre aléatoire)
-        units.sort(key=lambda x: (x[0].current_spd, self.rng.random()), reverse=True)
+    def _get_units_by_speed(self) -> List[InitiativeEntry]:
+        """Retourne toutes les unités triées par vitesse décroissante.
 
-        return units
+        Les égalités sont départagées par des clés tirées au début de
+        chaque tour (voir InitiativeScheduler).
+        """
+        return self.initiative.order()
 
     def _all_cards(self) -> List[Card]:
         """Retourne toutes les cartes sur le terrain"""
@@ -370,26 +406,14 @@ class CombatResolver:
         if terrain == 'LAVE':
             # Les créatures non-volantes en ligne avant subissent Brûlure
             for i in range(3):
-                if self.state.player_field[i] and Keyword.VOL not in self.state.player_field[i].keywords:
-                    self.state.player_field[i].apply_status(StatusEffect.BRULURE, 1)
-                if self.state.enemy_field[i] and Keyword.VOL not in self.state.enemy_field[i].keywords:
-                    self.state.enemy_field[i].apply_status(StatusEffect.BRULURE, 1)
+                if self.state.player_field[i] and not self.state.player_field[i].has_keyword(Keyword.VOL):
+                    self.state.add_status(self.state.player_field[i], _BRULURE, 1)
+                if self.state.enemy_field[i] and not self.state.enemy_field[i].has_keyword(Keyword.VOL):
+                    self.state.add_status(self.state.enemy_field[i], _BRULURE, 1)
 
         elif terrain == 'BROUILLARD':
             # -1 Vitesse pour les créatures à distance
             for i in range(3, 6):
-                if self.state.player_field[i]:
-                    self.state.player_field[i].current_spd = max(1, self.state.player_field[i].current_spd - 1)
-                if self.state.enemy_field[i]:
-                    self.state.enemy_field[i].current_spd = max(1, self.state.enemy_field[i].current_spd - 1)
-
-    def log(self, message: str):
-        """Ajoute un message au journal de combat"""
-        self.action_log.append(message)
-
-    def add_animation(self, anim_type: str, **params):
-        """Ajoute une animation à la queue"""
-        self.animation_queue.append({
-            'type': anim_type,
-            'params': params
-        })
\ No newline at end of file
+                for card in (self.state.player_field[i], self.state.enemy_field[i]):
+                    if card:
+                        self.state.set_speed(card, max(1, card.current_spd - 1))
@@ -0,0 +1,196 @@
+# core/endgame.py
+"""Solveur exact des fins de combat - plus de carte à poser, seuls les départages restent"""
+
+from dataclasses import dataclass
+from itertools import permutations, product
+from math import factorial
+from typing import Dict, List, Optional, Tuple
+
+from entities import CombatState, FIELD_SIZE
+from combat import CombatResolver
+from events import LogLevel
+from initiative import SQUARES
+from rng import advance
+
+
+# (victoire, défaite, timeout, tours joués), probabilités et espérance
+Value = Tuple[float, float, float, float]
+
+
+@dataclass
+class EndgameOutcome:
+    """Probabilités exactes d'une fin de combat"""
+    win: float
+    loss: float
+    timeout: float
+    expected_turns: float
+    states: int  # Positions (hash, tours restants) résolues
+
+
+class TooManyOrders(Exception):
+    """Un tour a plus de max_orders ordres d'initiative possibles"""
+
+
+def is_endgame(state: CombatState) -> bool:
+    """Vrai quand le joueur n'a plus rien à poser (main vide).
+
+    Les tours ne piochent pas, seul start_combat tire la main: la suite du
+    combat ne dépend plus que du terrain et des départages d'initiative.
+    """
+    return not state.hand
+
+
+class EndgameSolver:
+    """Résolution exacte d'un combat dont la main est vide.
+
+    Les départages sont retirés à chaque tour (voir InitiativeScheduler):
+    l'ordre des unités de chaque seau de vitesse est une permutation
+    uniforme, indépendante des autres seaux et des tours précédents. Le
+    combat est alors une chaîne de Markov sur les positions (hash de
+    Zobrist sans le tour): solve() branche à chaque tour sur tous les
+    ordres, joués avec le vrai résolveur, et mémorise la valeur de chaque
+    (position, tours restants).
+
+    fast_forward() joue la suite réelle et saute les boucles dont chaque
+    tour donne la même position quel que soit l'ordre: c'est le raccourci
+    de simulate_combat.
+    """
+
+    def __init__(self, max_orders: int = 5040):
+        self.max_orders = max_orders
+
+    def solve(self, resolver: CombatResolver, turns_left: int) -> Optional[EndgameOutcome]:
+        """Probabilités de victoire, défaite et timeout en turns_left tours au plus.
+
+        Retourne None si un tour a plus de max_orders ordres à énumérer. Le
+        combat est rendu dans son état d'origine.
+        """
+        if not is_endgame(resolver.state):
+            raise ValueError("Le joueur a encore des cartes en main")
+
+        memo: Dict[Tuple[int, int], Value] = {}
+        root = resolver.snapshot()
+        level = resolver.events.level
+        resolver.events.level = LogLevel.OFF
+        try:
+            win, loss, timeout, turns = self._value(resolver, turns_left, memo)
+        except TooManyOrders:
+            return None
+        finally:
+            resolver.restore(root)
+            resolver.events.level = level
+        return EndgameOutcome(win, loss, timeout, turns, len(memo))
+
+    def fast_forward(self, resolver: CombatResolver, turns_left: int) -> int:
+        """Joue la fin du combat (au plus turns_left tours) et retourne les tours joués.
+
+        Une position qui revient au bout d'une boucle où aucun départage ne
+        change la suite se répète indéfiniment: les périodes entières
+        restantes sont sautées (state.turn avance et le RNG consomme les
+        départages qu'elles auraient tirés), puis le reste est joué. Les
+        tours sautés n'émettent pas d'événements.
+        """
+        state = resolver.state
+        seen: Dict[int, int] = {}
+        drawn = [0]  # Départages tirés avant chaque tour joué
+        random_loops = set()
+        played = 0
+        while played < turns_left:
+            key = state.zobrist_hash(include_turn=False)
+            if key in seen and key not in random_loops:
+                period = played - seen[key]
+                if self._is_fixed_loop(resolver, period):
+                    periods = (turns_left - played) // period
+                    state.turn += periods * period
+                    advance(resolver.rng, periods * (drawn[played] - drawn[seen[key]]))
+                    played += periods * period
+                    seen.clear()  # Il reste moins d'une période
+                    continue
+                random_loops.add(key)
+            seen[key] = played
+
+            drawn.append(drawn[-1] + len(resolver.initiative))
+            resolver.process_turn()
+            played += 1
+            if state.is_combat_over() is not None:
+                break
+        return played
+
+    # ------------------------------------------------------------------
+    # Énumération
+    # ------------------------------------------------------------------
+
+    def _tiebreaks(self, resolver: CombatResolver) -> List[List[float]]:
+        """Clés de départage par case, une liste par ordre possible du tour"""
+        buckets: Dict[int, List[int]] = {}
+        for card, is_player, slot, _, _ in resolver.initiative.snapshot():
+            square = slot if is_player else FIELD_SIZE + slot
+            buckets.setdefault(card.current_spd, []).append(square)
+        ties = [squares for squares in buckets.values() if len(squares) > 1]
+
+        count = 1
+        for squares in ties:
+            count *= factorial(len(squares))
+        if count > self.max_orders:
+            raise TooManyOrders(count)
+
+        orders = []
+        for choice in product(*(permutations(squares) for squares in ties)):
+            keys = [0.0] * SQUARES
+            for squares in choice:
+                for rank, square in enumerate(squares):
+                    keys[square] = float(len(squares) - rank)  # Plus grande clé d'abord
+            orders.append(keys)
+        return orders
+
+    def _value(self, resolver: CombatResolver, turns_left: int,
+               memo: Dict[Tuple[int, int], Value]) -> Value:
+        """Valeur de la position courante, moyenne sur les ordres de chaque tour"""
+        over = resolver.state.is_combat_over()
+        if over is not None:
+            return (1.0, 0.0, 0.0, 0.0) if over else (0.0, 1.0, 0.0, 0.0)
+        if turns_left == 0:
+            return 0.0, 0.0, 1.0, 0.0
+
+        key = (resolver.state.zobrist_hash(include_turn=False), turns_left)
+        if key in memo:
+            return memo[key]
+
+        orders = self._tiebreaks(resolver)
+        position = resolver.snapshot()
+        total = [0.0, 0.0, 0.0, 0.0]
+        for keys in orders:
+            resolver.process_turn(keys)
+            for i, part in enumerate(self._value(resolver, turns_left - 1, memo)):
+                total[i] += part
+            total[3] += 1  # Le tour joué
+            resolver.restore(position)
+
+        memo[key] = value = tuple(part / len(orders) for part in total)
+        return value
+
+    def _is_fixed_loop(self, resolver: CombatResolver, period: int) -> bool:
+        """Vrai si, depuis la position courante, chaque tour de la boucle donne la même
+        position pour tous les ordres et que la position revient après period tours"""
+        root = resolver.snapshot()
+        start = resolver.state.zobrist_hash(include_turn=False)
+        level = resolver.events.level
+        resolver.events.level = LogLevel.OFF
+        try:
+            for _ in range(period):
+                position = resolver.snapshot()
+                successors = set()
+                for keys in self._tiebreaks(resolver):
+                    resolver.restore(position)
+                    resolver.process_turn(keys)
+                    if resolver.state.is_combat_over() is not None:
+                        return False
+                    successors.add(resolver.state.zobrist_hash(include_turn=False))
+                    if len(successors) > 1:
+                        return False
+            return resolver.state.zobrist_hash(include_turn=False) == start
+        except TooManyOrders:
+            return False
+        finally:
+            resolver.restore(root)
+            resolver.events.level = level
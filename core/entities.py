@@ -1,12 +1,19 @@
 # core/entities.py
 """Entités du jeu - Cartes, Créatures, États permanents"""
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Any
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import ClassVar, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Any
+from collections.abc import Mapping, MutableMapping, MutableSet
+from operator import attrgetter
 from enum import Enum, auto
+from array import array
+from pathlib import Path
+from hashlib import blake2b
 import json
 import random
-from copy import deepcopy
+
+from zobrist import Feature, feature_key, template_key, card_hash
 
 
 class Rarity(Enum):
@@ -47,9 +54,110 @@ class StatusEffect(Enum):
     OFFENSE_EMOUSSEE = "offense_emoussee"
 
 
-@dataclass
-class Card:
-    """Représente une carte de créature avec état permanent"""
+STATUS_INDEX: Dict[StatusEffect, int] = {status: i for i, status in enumerate(StatusEffect)}
+KEYWORD_BIT: Dict[Keyword, int] = {keyword: 1 << i for i, keyword in enumerate(Keyword)}
+
+# Compteurs de statuts partagés par toutes les cartes sans statut. Un tuple de
+# statuts est en lecture seule (partagé, ou figé par un instantané de combat):
+# la carte le copie dans son propre tableau à la première écriture.
+NO_STATUSES: Tuple[int, ...] = (0,) * len(STATUS_INDEX)
+
+_VENIN = STATUS_INDEX[StatusEffect.VENIN]
+_BRULURE = STATUS_INDEX[StatusEffect.BRULURE]
+_FRACTURE = STATUS_INDEX[StatusEffect.FRACTURE]
+_MALEDICTION = STATUS_INDEX[StatusEffect.MALEDICTION]
+_EROSION = STATUS_INDEX[StatusEffect.EROSION]
+_OFFENSE_EMOUSSEE = STATUS_INDEX[StatusEffect.OFFENSE_EMOUSSEE]
+
+ABILITIES = ('on_deploy', 'on_attack', 'on_hit', 'on_death')
+
+
+
+class FrozenMapping(Mapping):
+    """Dictionnaire en lecture seule, hachable (repr identique à celle d'un dict)"""
+    __slots__ = ('_items',)
+
+    def __init__(self, items: Mapping = ()):
+        self._items = dict(items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        return hash(tuple(sorted(self._items.items())))
+
+    def __repr__(self) -> str:
+        return repr(self._items)
+
+
+def freeze(value: Any) -> Any:
+    """Copie figée d'une donnée JSON: dicts en FrozenMapping, listes en tuples"""
+    if isinstance(value, FrozenMapping):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenMapping({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Copie modifiable d'une donnée figée par freeze"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+_interned_abilities: Dict[str, FrozenMapping] = {}
+
+
+def intern_ability(effect: Mapping) -> FrozenMapping:
+    """Retourne l'unique instance partagée (figée) d'une définition de capacité.
+
+    La définition est copiée: modifier le dict d'origine (ex: entrée brute
+    du catalogue) ne change aucun modèle.
+    """
+    key = repr(sorted(effect.items()))
+    interned = _interned_abilities.get(key)
+    if interned is None:
+        interned = _interned_abilities[key] = freeze(effect)
+    return interned
+
+
+def ability_from_json(effect: Mapping) -> Mapping:
+    """Définition de capacité lue en JSON (nom de statut converti en StatusEffect)"""
+    if "effect" in effect:
+        return {**effect, "effect": StatusEffect[effect["effect"]]}
+    return effect
+
+
+def ability_to_json(effect: Mapping) -> Dict:
+    """Définition de capacité sérialisable en JSON (statut écrit par son nom)"""
+    data = thaw(effect)
+    if "effect" in data:
+        data["effect"] = data["effect"].name
+    return data
+
+
+def keyword_mask(keywords: Iterable[Keyword]) -> int:
+    """Masque de bits d'un ensemble de mots-clés"""
+    mask = 0
+    for keyword in keywords:
+        mask |= KEYWORD_BIT[keyword]
+    return mask
+
+
+@dataclass(frozen=True)
+class CardTemplate:
+    """Données statiques d'une carte, partagées par toutes ses instances"""
     id: str
     name: str
     biome: Biome
@@ -58,28 +166,265 @@ class Card:
     base_atk: int
     base_dur: int
     base_spd: int
-    keywords: Set[Keyword] = field(default_factory=set)
+    keyword_mask: int = 0
+    on_deploy: Tuple[Mapping, ...] = ()
+    on_attack: Tuple[Mapping, ...] = ()
+    on_hit: Tuple[Mapping, ...] = ()
+    on_death: Tuple[Mapping, ...] = ()
+    description: str = ""
+    extra: Mapping[str, Any] = FrozenMapping()  # Clés du catalogue non gérées par le moteur
 
-    # État permanent durant la run
-    current_dur: int = 0
-    current_atk: int = 0
-    current_spd: int = 0
-    shields: int = 0
-    permanent_statuses: Dict[StatusEffect, int] = field(default_factory=dict)
+    def __post_init__(self):
+        # Capacités figées en tuples de définitions internées
+        for ability in ABILITIES:
+            effects = getattr(self, ability)
+            object.__setattr__(self, ability, tuple(intern_ability(effect) for effect in effects))
+        object.__setattr__(self, 'extra', freeze(self.extra))
+
+    @property
+    def keywords(self) -> FrozenSet[Keyword]:
+        return frozenset(k for k, bit in KEYWORD_BIT.items() if self.keyword_mask & bit)
+
+    @cached_property
+    def program(self) -> 'CompiledAbilities':
+        """Capacités compilées en instructions, une fois par modèle (voir abilities)"""
+        from abilities import compile_template
+        return compile_template(self)
+
+    @cached_property
+    def zobrist_key(self) -> int:
+        """Identifiant 64 bits du modèle pour le hachage des combats (voir zobrist)"""
+        return template_key(self)
+
+    @property
+    def signature(self) -> Tuple:
+        """Contenu qui influe sur les combats (sérialisable en JSON, pour les clés de cache)"""
+        return (self.id, self.cost, self.base_atk, self.base_dur, self.base_spd, self.keyword_mask,
+                repr((self.on_deploy, self.on_attack, self.on_hit, self.on_death)))
+
+    @cached_property
+    def content_key(self) -> str:
+        """Empreinte de signature: change dès qu'une carte du même id est modifiée"""
+        return blake2b(json.dumps(self.signature).encode('utf-8'), digest_size=8).hexdigest()
+
+    def derive(self, **changes) -> 'CardTemplate':
+        """Modèle dérivé (les instances existantes gardent l'original)"""
+        return replace(self, **changes)
+
+    def instantiate(self) -> 'Card':
+        """Nouvelle instance de la carte, dans son état de base"""
+        card = Card.__new__(Card)
+        card.template = self
+        card.keyword_mask = self.keyword_mask
+        card.current_dur = self.base_dur
+        card.current_atk = self.base_atk
+        card.current_spd = self.base_spd
+        card.shields = 0
+        card.status_values = NO_STATUSES
+        return card
 
-    # Capacités
-    on_deploy: List[Dict] = field(default_factory=list)
-    on_attack: List[Dict] = field(default_factory=list)
-    on_hit: List[Dict] = field(default_factory=list)
-    on_death: List[Dict] = field(default_factory=list)
+    def to_dict(self) -> Dict:
+        """Sérialisation complète (cartes hors catalogue, ex: fusions)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'biome': self.biome.value,
+            'rarity': self.rarity.value,
+            'cost': self.cost,
+            'base_stats': {'atk': self.base_atk, 'dur': self.base_dur, 'spd': self.base_spd},
+            'keywords': [k.name for k in Keyword if self.keyword_mask & KEYWORD_BIT[k]],
+            **{ability: [ability_to_json(effect) for effect in getattr(self, ability)]
+               for ability in ABILITIES},
+            'description': self.description,
+            'extra': thaw(self.extra)
+        }
 
-    def __post_init__(self):
-        if self.current_dur == 0:
-            self.current_dur = self.base_dur
-        if self.current_atk == 0:
-            self.current_atk = self.base_atk
-        if self.current_spd == 0:
-            self.current_spd = self.base_spd
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CardTemplate':
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            biome=Biome(data['biome']),
+            rarity=Rarity(data['rarity']),
+            cost=data['cost'],
+            base_atk=data['base_stats']['atk'],
+            base_dur=data['base_stats']['dur'],
+            base_spd=data['base_stats']['spd'],
+            keyword_mask=keyword_mask(Keyword[k] for k in data.get('keywords', [])),
+            **{ability: [ability_from_json(effect) for effect in data.get(ability, ())]
+               for ability in ABILITIES},
+            description=data.get('description', ""),
+            extra=data.get('extra', {})
+        )
+
+
+# Modèles du catalogue, par identifiant (voir CardDatabase)
+_templates: Dict[str, CardTemplate] = {}
+
+
+def register_template(template: CardTemplate) -> CardTemplate:
+    """Enregistre un modèle du catalogue; les sauvegardes s'y réfèrent par son id"""
+    _templates[template.id] = template
+    return template
+
+
+def get_template(card_id: str) -> Optional[CardTemplate]:
+    return _templates.get(card_id)
+
+
+class KeywordSet(MutableSet):
+    """Vue ensembliste sur le masque de mots-clés d'une carte"""
+    __slots__ = ('_card',)
+
+    def __init__(self, card: 'Card'):
+        self._card = card
+
+    def __contains__(self, keyword: object) -> bool:
+        return bool(self._card.keyword_mask & KEYWORD_BIT.get(keyword, 0))
+
+    def __iter__(self) -> Iterator[Keyword]:
+        mask = self._card.keyword_mask
+        return (keyword for keyword, bit in KEYWORD_BIT.items() if mask & bit)
+
+    def __len__(self) -> int:
+        return bin(self._card.keyword_mask).count('1')
+
+    def add(self, keyword: Keyword):
+        self._card.keyword_mask |= KEYWORD_BIT[keyword]
+
+    def discard(self, keyword: Keyword):
+        self._card.keyword_mask &= ~KEYWORD_BIT.get(keyword, 0)
+
+    def __repr__(self) -> str:
+        return f"{{{', '.join(str(keyword) for keyword in self)}}}"
+
+
+class StatusCounters(MutableMapping):
+    """Vue dictionnaire sur les compteurs de statuts d'une carte (statut actif si non nul)"""
+    __slots__ = ('_card',)
+
+    def __init__(self, card: 'Card'):
+        self._card = card
+
+    def __getitem__(self, effect: StatusEffect) -> int:
+        value = self._card.status_values[STATUS_INDEX[effect]]
+        if not value:
+            raise KeyError(effect)
+        return value
+
+    def __setitem__(self, effect: StatusEffect, value: int):
+        self._card.writable_statuses()[STATUS_INDEX[effect]] = value
+
+    def __delitem__(self, effect: StatusEffect):
+        self[effect]
+        self._card.writable_statuses()[STATUS_INDEX[effect]] = 0
+
+    def __contains__(self, effect: object) -> bool:
+        index = STATUS_INDEX.get(effect)
+        return index is not None and self._card.status_values[index] != 0
+
+    def __iter__(self) -> Iterator[StatusEffect]:
+        values = self._card.status_values
+        return (effect for effect, i in STATUS_INDEX.items() if values[i])
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._card.status_values if value)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+def _static(name: str) -> property:
+    """Donnée lue dans le modèle; l'écrire détache la carte sur un modèle dérivé"""
+    def fset(self, value):
+        self.template = self.template.derive(**{name: value})
+
+    return property(attrgetter(f'template.{name}'), fset)
+
+
+class Card:
+    """Représente une carte de créature avec état permanent.
+
+    Les données statiques (stats de base, capacités, description) vivent dans
+    un CardTemplate partagé; la carte ne porte que son état de run: stats
+    courantes, boucliers, mots-clés en masque de bits et statuts dans un
+    tableau d'entiers indexé par StatusEffect. keywords et permanent_statuses
+    restent accessibles comme set et dict.
+    """
+    __slots__ = (
+        'template', 'keyword_mask', 'current_dur', 'current_atk', 'current_spd',
+        'shields', 'status_values'
+    )
+
+    id = _static('id')
+    name = _static('name')
+    biome = _static('biome')
+    rarity = _static('rarity')
+    cost = _static('cost')
+    base_atk = _static('base_atk')
+    base_dur = _static('base_dur')
+    base_spd = _static('base_spd')
+    description = _static('description')
+
+    # Capacités
+    on_deploy = _static('on_deploy')
+    on_attack = _static('on_attack')
+    on_hit = _static('on_hit')
+    on_death = _static('on_death')
+    program = property(attrgetter('template.program'))
+
+    def __init__(self, id: str, name: str, biome: Biome, rarity: Rarity, cost: int,
+                 base_atk: int, base_dur: int, base_spd: int,
+                 keywords: Iterable[Keyword] = (),
+                 current_dur: int = 0, current_atk: int = 0, current_spd: int = 0,
+                 shields: int = 0, permanent_statuses: Optional[Dict[StatusEffect, int]] = None,
+                 on_deploy: Iterable[Dict] = (), on_attack: Iterable[Dict] = (),
+                 on_hit: Iterable[Dict] = (), on_death: Iterable[Dict] = (),
+                 description: str = ""):
+        self.template = CardTemplate(
+            id, name, biome, rarity, cost, base_atk, base_dur, base_spd,
+            keyword_mask(keywords), on_deploy, on_attack, on_hit, on_death, description
+        )
+        self.keyword_mask = self.template.keyword_mask
+
+        # État permanent durant la run
+        self.current_dur = current_dur or base_dur
+        self.current_atk = current_atk or base_atk
+        self.current_spd = current_spd or base_spd
+        self.shields = shields
+        self.permanent_statuses = permanent_statuses or {}
+
+    @property
+    def keywords(self) -> KeywordSet:
+        return KeywordSet(self)
+
+    @keywords.setter
+    def keywords(self, keywords: Iterable[Keyword]):
+        self.keyword_mask = keyword_mask(keywords)
+
+    @property
+    def permanent_statuses(self) -> StatusCounters:
+        return StatusCounters(self)
+
+    @permanent_statuses.setter
+    def permanent_statuses(self, statuses: Dict[StatusEffect, int]):
+        self.status_values = NO_STATUSES
+        for effect, value in statuses.items():
+            self.writable_statuses()[STATUS_INDEX[effect]] = value
+
+    def writable_statuses(self) -> array:
+        """Tableau de statuts propre à la carte (alloué à la première écriture)"""
+        if type(self.status_values) is tuple:
+            self.status_values = array('i', self.status_values)
+        return self.status_values
+
+    def has_keyword(self, keyword: Keyword) -> bool:
+        """Teste un mot-clé sans passer par la vue ensembliste"""
+        return bool(self.keyword_mask & KEYWORD_BIT[keyword])
+
+    def get_status(self, effect: StatusEffect) -> int:
+        """Compteur d'un statut (0 si absent)"""
+        return self.status_values[STATUS_INDEX[effect]]
 
     def take_damage(self, amount: int) -> bool:
         """Applique des dégâts permanents. Retourne True si la carte survit."""
@@ -92,58 +437,91 @@ class Card:
 
     def apply_status(self, effect: StatusEffect, value: int):
         """Applique une altération permanente"""
-        if effect not in self.permanent_statuses:
-            self.permanent_statuses[effect] = 0
-        self.permanent_statuses[effect] += value
+        self.add_status(STATUS_INDEX[effect], value)
+
+    def add_status(self, index: int, value: int):
+        """apply_status par indice de statut (instructions compilées)"""
+        self.writable_statuses()[index] += value
 
         # Effets immédiats de certains statuts
-        if effect == StatusEffect.FRACTURE:
+        if index == _FRACTURE:
             self.current_atk = max(1, self.current_atk - value)
-        elif effect == StatusEffect.OFFENSE_EMOUSSEE:
+        elif index == _OFFENSE_EMOUSSEE:
             self.current_atk = min(self.current_atk, 1)
 
     def process_start_combat(self):
         """Effets au début du combat"""
-        if StatusEffect.VENIN in self.permanent_statuses:
-            self.take_damage(self.permanent_statuses[StatusEffect.VENIN])
-        if StatusEffect.MALEDICTION in self.permanent_statuses:
+        statuses = self.status_values
+        if statuses[_VENIN]:
+            self.take_damage(statuses[_VENIN])
+        if statuses[_MALEDICTION]:
             self.current_spd = max(1, self.current_spd - 1)
 
     def process_end_combat(self):
         """Effets à la fin du combat"""
-        if StatusEffect.BRULURE in self.permanent_statuses:
-            self.take_damage(self.permanent_statuses[StatusEffect.BRULURE])
+        if self.status_values[_BRULURE]:
+            self.take_damage(self.status_values[_BRULURE])
 
     def process_node_transition(self):
         """Effets entre les nœuds"""
-        if StatusEffect.EROSION in self.permanent_statuses:
+        if self.status_values[_EROSION]:
             self.take_damage(1)
 
     def get_effective_atk(self) -> int:
         """Retourne l'ATQ effective avec tous les modificateurs"""
         atk = self.current_atk
-        if StatusEffect.OFFENSE_EMOUSSEE in self.permanent_statuses:
+        if self.status_values[_OFFENSE_EMOUSSEE]:
             atk = 1
         return max(1, atk)
 
     def to_dict(self) -> Dict:
-        """Sérialisation pour sauvegarde"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'biome': self.biome.value,
-            'rarity': self.rarity.value,
-            'cost': self.cost,
-            'base_stats': {'atk': self.base_atk, 'dur': self.base_dur, 'spd': self.base_spd},
-            'current_stats': {'atk': self.current_atk, 'dur': self.current_dur, 'spd': self.current_spd},
-            'shields': self.shields,
-            'keywords': [k.name for k in self.keywords],
-            'statuses': {s.value: v for s, v in self.permanent_statuses.items()}
-        }
+        """Sérialisation pour sauvegarde: id du modèle et écart à celui-ci"""
+        template = self.template
+        data: Dict[str, Any] = {'template': template.id}
+        if get_template(template.id) is not template:
+            data['definition'] = template.to_dict()
+
+        if self.current_atk != template.base_atk:
+            data['atk'] = self.current_atk
+        if self.current_dur != template.base_dur:
+            data['dur'] = self.current_dur
+        if self.current_spd != template.base_spd:
+            data['spd'] = self.current_spd
+        if self.shields:
+            data['shields'] = self.shields
+        if self.keyword_mask != template.keyword_mask:
+            data['keywords'] = [k.name for k in self.keywords]
+        if self.status_values is not NO_STATUSES and any(self.status_values):
+            data['statuses'] = {s.value: v for s, v in self.permanent_statuses.items()}
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Card':
-        """Désérialisation depuis sauvegarde"""
+        """Désérialisation depuis sauvegarde (accepte l'ancien format complet)"""
+        if 'template' not in data:
+            return cls._from_legacy_dict(data)
+
+        if 'definition' in data:
+            template = CardTemplate.from_dict(data['definition'])
+        else:
+            template = get_template(data['template'])
+            if template is None:
+                raise ValueError(f"Carte inconnue: {data['template']}")
+
+        card = template.instantiate()
+        card.current_atk = data.get('atk', template.base_atk)
+        card.current_dur = data.get('dur', template.base_dur)
+        card.current_spd = data.get('spd', template.base_spd)
+        card.shields = data.get('shields', 0)
+        if 'keywords' in data:
+            card.keywords = [Keyword[k] for k in data['keywords']]
+        if 'statuses' in data:
+            card.permanent_statuses = {StatusEffect(s): v for s, v in data['statuses'].items()}
+        return card
+
+    @classmethod
+    def _from_legacy_dict(cls, data: Dict) -> 'Card':
+        """Format de sauvegarde 1.0 (toutes les données de la carte)"""
         card = cls(
             id=data['id'],
             name=data['name'],
@@ -152,7 +530,9 @@ class Card:
             cost=data['cost'],
             base_atk=data['base_stats']['atk'],
             base_dur=data['base_stats']['dur'],
-            base_spd=data['base_stats']['spd']
+            base_spd=data['base_stats']['spd'],
+            keywords=[Keyword[k] for k in data.get('keywords', [])],
+            **{ability: data.get(ability, ()) for ability in ABILITIES}
         )
 
         card.current_atk = data['current_stats']['atk']
@@ -160,24 +540,100 @@ class Card:
         card.current_spd = data['current_stats']['spd']
         card.shields = data.get('shields', 0)
 
-        for k in data.get('keywords', []):
-            card.keywords.add(Keyword[k])
-
         for status, value in data.get('statuses', {}).items():
             card.permanent_statuses[StatusEffect(status)] = value
 
         return card
 
     def clone(self) -> 'Card':
-        """Crée une copie profonde de la carte"""
-        return deepcopy(self)
+        """Crée une copie indépendante de la carte (modèle partagé)"""
+        card = Card.__new__(Card)
+        card.template = self.template
+        card.keyword_mask = self.keyword_mask
+        card.current_dur = self.current_dur
+        card.current_atk = self.current_atk
+        card.current_spd = self.current_spd
+        card.shields = self.shields
+        values = self.status_values
+        card.status_values = values if type(values) is tuple else array('i', values)
+        return card
+
+    def _key(self) -> Tuple:
+        return (self.template, self.keyword_mask, self.current_dur, self.current_atk,
+                self.current_spd, self.shields, tuple(self.status_values))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Card(id={self.id!r}, name={self.name!r}, atk={self.current_atk}, "
+                f"dur={self.current_dur}, spd={self.current_spd}, shields={self.shields}, "
+                f"keywords={self.keywords!r}, statuses={self.permanent_statuses!r})")
+
+
+FIELD_SIZE = 6
+
+# État de run d'une carte, dans l'ordre de Card.__slots__
+_card_values = attrgetter(*Card.__slots__)
+
+
+class CombatSnapshot(NamedTuple):
+    """Instantané à plat de tout l'état mutable d'un combat"""
+    turn: int
+    energy: int
+    player_field: Tuple[Optional[Card], ...]
+    enemy_field: Tuple[Optional[Card], ...]
+    hand: Tuple[Card, ...]
+    deck: Tuple[Card, ...]
+    discard: Tuple[Card, ...]
+    terrain_modifiers: Dict[str, Any]
+    cards: Tuple[Card, ...]  # Toutes les cartes du combat
+    card_values: Tuple[Tuple, ...]  # Leur état (voir Card.__slots__)
+    aggregates: Tuple  # Agrégats des terrains, restaurés sans recalcul
+
+
+class BoardSide(list):
+    """Terrain d'un camp: chaque pose ou retrait est signalé à l'état du combat"""
+    __slots__ = ('_state', '_is_player')
+
+    def __init__(self, cards: Iterable[Optional[Card]] = (), state: Optional['CombatState'] = None,
+                 is_player: bool = False):
+        super().__init__(cards)
+        self._state = state
+        self._is_player = is_player
+
+    def __setitem__(self, index, card):
+        if self._state is None or isinstance(index, slice):
+            super().__setitem__(index, card)
+            if self._state is not None:
+                self._state.recompute_aggregates()
+            return
+
+        if index < 0:
+            index += len(self)
+        old = self[index]
+        super().__setitem__(index, card)
+        if old is not card:
+            self._state._on_slot_change(self._is_player, index, old, card)
 
 
 @dataclass
 class CombatState:
-    """État d'un combat en cours"""
-    player_field: List[Optional[Card]] = field(default_factory=lambda: [None] * 6)
-    enemy_field: List[Optional[Card]] = field(default_factory=lambda: [None] * 6)
+    """État d'un combat en cours.
+
+    Présence, emplacements occupés, unités vivantes, carte la plus faible
+    de chaque camp et hash de Zobrist du terrain sont tenus à jour à chaque
+    pose/retrait sur le terrain et à chaque modification passée par
+    damage_card(), add_status(), add_shields(), set_atk() ou set_speed();
+    les requêtes sont en O(1). Modifier directement une carte posée impose
+    recompute_aggregates().
+    """
+    player_field: List[Optional[Card]] = field(default_factory=lambda: [None] * FIELD_SIZE)
+    enemy_field: List[Optional[Card]] = field(default_factory=lambda: [None] * FIELD_SIZE)
     turn: int = 1
     energy: int = 3
     hand: List[Card] = field(default_factory=list)
@@ -186,10 +642,267 @@ class CombatState:
 
     terrain_modifiers: Dict[str, Any] = field(default_factory=dict)
 
-    def get_presence(self, is_player: bool) -> int:
-        """Calcule la présence totale d'un camp"""
+    # Contexte du combat (tirage des récompenses)
+    act: int = 1
+    biome: Optional[Biome] = None
+
+    # Vérifie chaque requête contre un recalcul complet (débogage)
+    debug_aggregates: ClassVar[bool] = False
+
+    def __post_init__(self):
+        self._listeners: List[Any] = []
+        self.recompute_aggregates()
+
+    def __setattr__(self, name: str, value: Any):
+        if name == 'player_field' or name == 'enemy_field':
+            value = BoardSide(value, self, name == 'player_field')
+            object.__setattr__(self, name, value)
+            if '_presence' in self.__dict__:
+                self.recompute_aggregates()
+            return
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # L'index des cartes est basé sur id(): recalculé après copie.
+        # Les abonnés appartiennent au combat d'origine et ne sont pas copiés.
+        return {k: v for k, v in self.__dict__.items() if k not in ('_sides', '_listeners')}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._listeners = []
+        self.recompute_aggregates()
+
+    def add_slot_listener(self, listener: Any):
+        """Abonne un objet aux changements du terrain.
+
+        listener.slot_changed(is_player, slot, old, new) est appelé à chaque
+        pose/retrait, listener.board_reset(state) après un recalcul complet.
+        """
+        self._listeners.append(listener)
+
+    def remove_slot_listener(self, listener: Any):
+        """Désabonne un objet ajouté par add_slot_listener"""
+        self._listeners.remove(listener)
+
+    def recompute_aggregates(self):
+        """Recalcule tous les agrégats depuis le terrain"""
+        self._presence = [0, 0]  # Indexé par is_player
+        self._occupied = [0, 0]
+        self._living = [0, 0]
+        self._weakest: List[Optional[int]] = [-1, -1]  # -1 = camp vide, None = à recalculer
+        self._sides: Dict[int, Tuple[bool, int]] = {}  # id(carte) -> (camp, emplacement)
+        self._zobrist = 0  # XOR des contributions des cartes posées
+        for is_player, field in ((False, self.enemy_field), (True, self.player_field)):
+            for i, card in enumerate(field):
+                if card:
+                    self._track(is_player, i, None, card)
+        for listener in self._listeners:
+            listener.board_reset(self)
+
+    def _on_slot_change(self, is_player: bool, slot: int, old: Optional[Card],
+                        new: Optional[Card]):
+        self._track(is_player, slot, old, new)
+        for listener in self._listeners:
+            listener.slot_changed(is_player, slot, old, new)
+
+    def _track(self, is_player: bool, slot: int, old: Optional[Card], new: Optional[Card]):
+        if old:
+            self._presence[is_player] -= old.current_dur
+            self._occupied[is_player] &= ~(1 << slot)
+            self._living[is_player] -= old.current_dur > 0
+            self._sides.pop(id(old), None)
+            self._zobrist ^= card_hash(old, is_player * FIELD_SIZE + slot)
+            if self._weakest[is_player] == slot:
+                self._weakest[is_player] = None
+        if new:
+            self._presence[is_player] += new.current_dur
+            self._occupied[is_player] |= 1 << slot
+            self._living[is_player] += new.current_dur > 0
+            self._sides[id(new)] = (is_player, slot)
+            self._zobrist ^= card_hash(new, is_player * FIELD_SIZE + slot)
+            self._offer_weakest(is_player, slot, new)
+
+    def _offer_weakest(self, is_player: bool, slot: int, card: Card):
+        # La DUR ne fait que baisser: la carte devient la plus faible si elle
+        # passe sous l'actuelle (à égalité, le plus petit emplacement gagne)
+        weakest = self._weakest[is_player]
+        if weakest is None:
+            return
+        if weakest < 0:
+            self._weakest[is_player] = slot
+            return
+        current = (self.player_field if is_player else self.enemy_field)[weakest]
+        if card.current_dur < current.current_dur or (
+                card.current_dur == current.current_dur and slot < weakest):
+            self._weakest[is_player] = slot
+
+    def _scan_weakest(self, is_player: bool) -> int:
         field = self.player_field if is_player else self.enemy_field
-        return sum(c.current_dur for c in field if c)
+        weakest = -1
+        for i, card in enumerate(field):
+            if card and (weakest < 0 or card.current_dur < field[weakest].current_dur):
+                weakest = i
+        return weakest
+
+    def damage_card(self, card: Card, amount: int) -> bool:
+        """Inflige des dégâts à une carte et met à jour les agrégats de son camp"""
+        tracked = self._sides.get(id(card))
+        before, shields = card.current_dur, card.shields
+        survived = card.take_damage(amount)
+        if tracked is not None:
+            side, slot = tracked
+            self._presence[side] += card.current_dur - before
+            self._living[side] -= before > 0 and not survived
+            self._offer_weakest(side, slot, card)
+            square = side * FIELD_SIZE + slot
+            self._zobrist ^= (feature_key(square, Feature.DUR, before)
+                              ^ feature_key(square, Feature.DUR, card.current_dur))
+            if card.shields != shields:
+                self._zobrist ^= (feature_key(square, Feature.SHIELDS, shields)
+                                  ^ feature_key(square, Feature.SHIELDS, card.shields))
+        return survived
+
+    def add_status(self, card: Card, index: int, value: int):
+        """Altération par indice de statut (voir Card.add_status), hash à jour"""
+        before, atk = card.status_values[index], card.current_atk
+        card.add_status(index, value)
+        self._rekey(card, Feature.STATUS + index, before, card.status_values[index])
+        self._rekey(card, Feature.ATK, atk, card.current_atk)
+
+    def add_shields(self, card: Card, value: int):
+        """Ajoute (ou retire, si négatif) des boucliers à une carte"""
+        card.shields += value
+        self._rekey(card, Feature.SHIELDS, card.shields - value, card.shields)
+
+    def set_atk(self, card: Card, atk: int):
+        """Change l'ATQ courante d'une carte"""
+        before, card.current_atk = card.current_atk, atk
+        self._rekey(card, Feature.ATK, before, atk)
+
+    def set_speed(self, card: Card, spd: int):
+        """Change la vitesse d'une carte (l'initiative la relit à son prochain ordre)"""
+        before, card.current_spd = card.current_spd, spd
+        self._rekey(card, Feature.SPD, before, spd)
+
+    def _rekey(self, card: Card, feature: int, before: int, after: int):
+        # Remplace la clé d'une caractéristique d'une carte posée dans le hash
+        tracked = self._sides.get(id(card))
+        if tracked is not None and before != after:
+            square = tracked[0] * FIELD_SIZE + tracked[1]
+            self._zobrist ^= feature_key(square, feature, before) ^ feature_key(square, feature, after)
+
+    def zobrist_hash(self, include_turn: bool = True) -> int:
+        """Hash de Zobrist du terrain, du tour et de l'énergie (main et pioche exclues)"""
+        if self.debug_aggregates:
+            self.check_aggregates()
+        h = self._zobrist ^ feature_key(-1, Feature.ENERGY, self.energy)
+        return h ^ feature_key(-1, Feature.TURN, self.turn) if include_turn else h
+
+    def check_aggregates(self):
+        """Compare les agrégats incrémentaux à un recalcul complet"""
+        for is_player, field in ((False, self.enemy_field), (True, self.player_field)):
+            cards = [(i, c) for i, c in enumerate(field) if c]
+            expected = (
+                sum(c.current_dur for _, c in cards),
+                sum(1 << i for i, _ in cards),
+                sum(1 for _, c in cards if c.current_dur > 0),
+            )
+            expected += (self._scan_weakest(is_player),)
+            weakest = self._weakest[is_player]
+            actual = (self._presence[is_player], self._occupied[is_player],
+                      self._living[is_player], expected[3] if weakest is None else weakest)
+            if actual != expected:
+                side = "joueur" if is_player else "ennemi"
+                raise AssertionError(
+                    f"Agrégats {side} désynchronisés: {actual} au lieu de {expected} "
+                    f"(présence, occupés, vivants, plus faible)"
+                )
+
+        expected = 0
+        for is_player, field in ((False, self.enemy_field), (True, self.player_field)):
+            for i, card in enumerate(field):
+                if card:
+                    expected ^= card_hash(card, is_player * FIELD_SIZE + i)
+        if self._zobrist != expected:
+            raise AssertionError(f"Hash de Zobrist désynchronisé: {self._zobrist:#x} au lieu de {expected:#x}")
+
+    def snapshot(self) -> CombatSnapshot:
+        """Capture l'état mutable du combat (terrains, main, pioche, défausse, cartes).
+
+        Les statuts des cartes sont figés en tuples partagés avec l'instantané:
+        une carte ne les recopie qu'à sa prochaine altération.
+        """
+        cards = {id(card): card
+                 for group in (self.player_field, self.enemy_field, self.hand, self.deck, self.discard)
+                 for card in group if card}
+        for card in cards.values():
+            if type(card.status_values) is not tuple:
+                card.status_values = tuple(card.status_values)
+
+        return CombatSnapshot(
+            self.turn, self.energy,
+            tuple(self.player_field), tuple(self.enemy_field),
+            tuple(self.hand), tuple(self.deck), tuple(self.discard),
+            dict(self.terrain_modifiers),
+            tuple(cards.values()), tuple(map(_card_values, cards.values())),
+            (tuple(self._presence), tuple(self._occupied), tuple(self._living),
+             tuple(self._weakest), dict(self._sides), self._zobrist),
+        )
+
+    def restore(self, snapshot: CombatSnapshot):
+        """Remet le combat dans l'état d'un instantané (réutilisable plusieurs fois)"""
+        for card, values in zip(snapshot.cards, snapshot.card_values):
+            (card.template, card.keyword_mask, card.current_dur, card.current_atk,
+             card.current_spd, card.shields, card.status_values) = values
+
+        self.turn = snapshot.turn
+        self.energy = snapshot.energy
+        self.hand[:] = snapshot.hand
+        self.deck[:] = snapshot.deck
+        self.discard[:] = snapshot.discard
+        self.terrain_modifiers = dict(snapshot.terrain_modifiers)
+
+        # Terrains réécrits d'un bloc avec leurs agrégats, puis abonnés resynchronisés
+        list.__setitem__(self.player_field, slice(None), snapshot.player_field)
+        list.__setitem__(self.enemy_field, slice(None), snapshot.enemy_field)
+        presence, occupied, living, weakest, sides, self._zobrist = snapshot.aggregates
+        self._presence = list(presence)
+        self._occupied = list(occupied)
+        self._living = list(living)
+        self._weakest = list(weakest)
+        self._sides = dict(sides)
+        for listener in self._listeners:
+            listener.board_reset(self)
+
+    def get_presence(self, is_player: bool) -> int:
+        """Présence totale d'un camp"""
+        if self.debug_aggregates:
+            self.check_aggregates()
+        return self._presence[is_player]
+
+    def occupied_mask(self, is_player: bool) -> int:
+        """Masque des emplacements occupés d'un camp (bit i = emplacement i)"""
+        if self.debug_aggregates:
+            self.check_aggregates()
+        return self._occupied[is_player]
+
+    def living_count(self, is_player: bool) -> int:
+        """Nombre d'unités d'un camp avec une DUR positive"""
+        if self.debug_aggregates:
+            self.check_aggregates()
+        return self._living[is_player]
+
+    def weakest_slot(self, is_player: bool) -> int:
+        """Emplacement de la carte avec le moins de DUR d'un camp (-1 si vide).
+
+        À égalité, le premier emplacement: c'est la cible d'une attaque Bond.
+        """
+        if self.debug_aggregates:
+            self.check_aggregates()
+        weakest = self._weakest[is_player]
+        if weakest is None:
+            weakest = self._weakest[is_player] = self._scan_weakest(is_player)
+        return weakest
 
     def is_combat_over(self) -> Optional[bool]:
         """Vérifie si le combat est terminé. Retourne True si victoire, False si défaite."""
@@ -245,79 +958,43 @@ class RunState:
 class CardDatabase:
     """Base de données des cartes du jeu"""
 
-    def __init__(self):
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
         self.cards: Dict[str, Dict] = {}
+        self.templates: Dict[str, CardTemplate] = {}
+        self._sampler = None
         self.load_cards()
 
     def load_cards(self):
-        """Charge toutes les cartes depuis le JSON"""
-        # Les données des 100 cartes seront dans cards.json
-        # Pour l'instant, créons quelques exemples
-
-        self.cards = {
-            "forest_spine_frog": {
-                "name": "Grenouille Épineuse",
-                "biome": Biome.FORET,
-                "rarity": Rarity.COMMON,
-                "cost": 1,
-                "atk": 1,
-                "dur": 3,
-                "spd": 2,
-                "keywords": [Keyword.TIRAILLEUR],
-                "on_attack": [],
-                "description": "Punition d'invocations"
-            },
-            "forest_azure_spider": {
-                "name": "Mygale d'Azur",
-                "biome": Biome.FORET,
-                "rarity": Rarity.COMMON,
-                "cost": 1,
-                "atk": 1,
-                "dur": 4,
-                "spd": 1,
-                "keywords": [],
-                "on_attack": [{"effect": StatusEffect.VENIN, "value": 1}],
-                "description": "Attrition lente"
-            },
-            "dunes_solar_fennec": {
-                "name": "Fennec Solaire",
-                "biome": Biome.DUNES,
-                "rarity": Rarity.COMMON,
-                "cost": 1,
-                "atk": 2,
-                "dur": 2,
-                "spd": 3,
-                "keywords": [],
-                "on_attack": [],
-                "description": "Initiative haute"
-            },
-            # Plus de cartes seront ajoutées depuis cards.json
-        }
+        """Charge toutes les cartes depuis le JSON (ou son cache compilé)"""
+        from catalog import load_catalog, CATALOG_PATH
+
+        self.catalog = load_catalog(self.path or CATALOG_PATH)
+        self.cards = self.catalog.records
+        self.templates = self.catalog.templates
+        for template in self.templates.values():
+            register_template(template)
+
+    def query(self, biome: Optional[Biome] = None, rarity: Optional[Rarity] = None,
+              cost: Optional[int] = None, keyword: Optional[Keyword] = None
+              ) -> Tuple[CardTemplate, ...]:
+        """Modèles correspondant aux critères (ex: rares du volcan), via l'index"""
+        return self.catalog.query(biome, rarity, cost, keyword)
+
+    @property
+    def sampler(self):
+        """Service de tirage pondéré sur ce catalogue (voir sampling.CardSampler)"""
+        if self._sampler is None:
+            from sampling import CardSampler
+            self._sampler = CardSampler(self.catalog)
+        return self._sampler
 
     def create_card(self, card_id: str) -> Card:
         """Crée une instance de carte depuis l'ID"""
-        if card_id not in self.cards:
+        if card_id not in self.templates:
             raise ValueError(f"Carte inconnue: {card_id}")
 
-        data = self.cards[card_id]
-        card = Card(
-            id=card_id,
-            name=data["name"],
-            biome=data["biome"],
-            rarity=data["rarity"],
-            cost=data["cost"],
-            base_atk=data["atk"],
-            base_dur=data["dur"],
-            base_spd=data["spd"],
-            keywords=set(data.get("keywords", []))
-        )
-
-        card.on_attack = data.get("on_attack", [])
-        card.on_deploy = data.get("on_deploy", [])
-        card.on_hit = data.get("on_hit", [])
-        card.on_death = data.get("on_death", [])
-
-        return card
+        return self.templates[card_id].instantiate()
 
     def get_starter_deck(self) -> List[Card]:
         """Retourne le deck de départ pour une nouvelle run"""
@@ -0,0 +1,204 @@
+# core/events.py
+"""Flux d'événements de combat typés (remplace le journal textuel)"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from enum import IntEnum
+
+import numpy as np
+
+from entities import Card, StatusEffect, STATUS_INDEX
+
+
+STATUSES = tuple(StatusEffect)
+STATUS_CODES: Dict[StatusEffect, int] = STATUS_INDEX
+
+NO_CARD = -1
+
+
+class EventType(IntEnum):
+    """Opcodes des événements de combat"""
+    COMBAT_START = 0
+    TURN_START = 1
+    DRAW = 2
+    DEPLOY = 3
+    ATTACK = 4
+    DAMAGE = 5
+    SHIELD_BLOCK = 6
+    CARAPACE = 7
+    SHIELD_GAIN = 8
+    STATUS_APPLY = 9
+    VENIN_TICK = 10
+    CURSE_SLOW = 11
+    BLEED = 12
+    BURN = 13
+    DEATH = 14
+    COMBAT_END = 15
+    VICTORY = 16
+    DEFEAT = 17
+
+
+class LogLevel(IntEnum):
+    """Niveau de journalisation d'un combat"""
+    OFF = 0  # Rien n'est enregistré
+    COUNTERS = 1  # Nombre d'événements, somme des valeurs par opcode et dégâts par carte
+    FULL = 2  # Tous les événements, dans le tampon circulaire
+
+
+class CombatEvent(NamedTuple):
+    """Un événement: opcode et opérandes entiers"""
+    op: int
+    turn: int
+    source: int  # Référence de carte (voir CombatEventLog.cards) ou NO_CARD
+    target: int
+    value: int
+    extra: int  # Code de statut, DUR restante, etc. selon l'opcode
+
+
+# Gabarits de texte, utilisés uniquement par le formateur
+EVENT_FORMATS: Dict[EventType, str] = {
+    EventType.COMBAT_START: "=== Début du combat ===",
+    EventType.TURN_START: "\n--- Tour {value} ---",
+    EventType.DRAW: "Pioche: {source}",
+    EventType.DEPLOY: "Déploiement: {source} en position {value}",
+    EventType.ATTACK: "{source} attaque {target} pour {value} dégâts",
+    EventType.DAMAGE: "{target} subit {value} dégâts (DUR: {extra})",
+    EventType.SHIELD_BLOCK: "{target} bloque avec un bouclier",
+    EventType.CARAPACE: "{target} active Carapace, {source} perd 1 ATQ",
+    EventType.SHIELD_GAIN: "{target} gagne {value} Bouclier(s)",
+    EventType.STATUS_APPLY: "{source} applique {status} {value} à {target}",
+    EventType.VENIN_TICK: "{source} subit {value} dégâts de Venin",
+    EventType.CURSE_SLOW: "{source} est ralenti par Malédiction",
+    EventType.BLEED: "{source} saigne et perd {value} DUR",
+    EventType.BURN: "{source} brûle pour {value} dégâts",
+    EventType.DEATH: "{target} est détruit!",
+    EventType.COMBAT_END: "\n=== Fin du combat ===",
+    EventType.VICTORY: "VICTOIRE!",
+    EventType.DEFEAT: "DÉFAITE...",
+}
+
+
+class CombatEventLog:
+    """Canal d'événements d'un combat.
+
+    En mode FULL, les événements sont des tuples d'entiers écrits dans un
+    tampon circulaire préalloué; les cartes sont référencées par un indice
+    dans self.cards. Le texte n'est produit qu'à la demande par format().
+    """
+
+    def __init__(self, level: LogLevel = LogLevel.FULL, capacity: int = 4096):
+        self.level = level
+        self.capacity = capacity
+        self.turn = 0
+
+        # Tampon circulaire et nombre total d'événements émis
+        self._ring: List[Optional[Tuple[int, ...]]] = [None] * capacity
+        self.total = 0
+
+        # Compteurs par opcode
+        self.counts = [0] * len(EventType)
+        self.value_totals = [0] * len(EventType)
+
+        # Dégâts infligés (événements DAMAGE) par référence de carte source
+        self.damage_dealt: Dict[int, int] = {}
+
+        # Registre des cartes référencées par les événements
+        self.cards: List[Card] = []
+        self._refs: Dict[int, int] = {}
+
+    def snapshot(self) -> Tuple[int, int, Tuple[int, ...], Tuple[int, ...], Dict[int, int]]:
+        """Position du flux et compteurs (voir CombatResolver.snapshot)"""
+        return (self.turn, self.total, tuple(self.counts), tuple(self.value_totals),
+                dict(self.damage_dealt))
+
+    def restore(self, snapshot: Tuple[int, int, Tuple[int, ...], Tuple[int, ...], Dict[int, int]]):
+        """Oublie les événements émis depuis l'instantané"""
+        self.turn, self.total, counts, value_totals, damage_dealt = snapshot
+        self.counts[:] = counts
+        self.value_totals[:] = value_totals
+        self.damage_dealt = dict(damage_dealt)
+
+    def emit(self, op: EventType, source: Optional[Card] = None, target: Optional[Card] = None,
+             value: int = 0, extra: int = 0):
+        """Enregistre un événement selon le niveau de journalisation"""
+        level = self.level
+        if not level:
+            return
+
+        self.counts[op] += 1
+        self.value_totals[op] += value
+        if op == EventType.DAMAGE and source is not None:
+            ref = self._ref(source)
+            self.damage_dealt[ref] = self.damage_dealt.get(ref, 0) + value
+
+        if level == LogLevel.FULL:
+            self._ring[self.total % self.capacity] = (
+                op, self.turn, self._ref(source), self._ref(target), value, extra
+            )
+            self.total += 1
+
+    def _ref(self, card: Optional[Card]) -> int:
+        """Référence entière d'une carte (enregistrée au premier usage)"""
+        if card is None:
+            return NO_CARD
+        ref = self._refs.get(id(card))
+        if ref is None:
+            ref = len(self.cards)
+            self._refs[id(card)] = ref
+            self.cards.append(card)
+        return ref
+
+    def __len__(self) -> int:
+        """Nombre d'événements encore disponibles dans le tampon"""
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """Nombre d'événements écrasés par le tampon circulaire"""
+        return self.total - len(self)
+
+    def events_since(self, sequence: int = 0) -> Iterator[Tuple[int, CombatEvent]]:
+        """Itère sur (numéro, événement) à partir d'un numéro de séquence.
+
+        Permet à plusieurs consommateurs (UI, animations) de lire le même flux
+        chacun à son rythme; les événements déjà écrasés sont sautés.
+        """
+        for seq in range(max(sequence, self.dropped), self.total):
+            yield seq, CombatEvent._make(self._ring[seq % self.capacity])
+
+    def __iter__(self) -> Iterator[CombatEvent]:
+        for _, event in self.events_since(0):
+            yield event
+
+    def to_array(self) -> np.ndarray:
+        """Événements disponibles sous forme de tableau (n, 6) d'entiers"""
+        rows = [self._ring[seq % self.capacity] for seq in range(self.dropped, self.total)]
+        return np.array(rows, dtype=np.int32).reshape(len(rows), len(CombatEvent._fields))
+
+    def count(self, op: EventType) -> int:
+        """Nombre d'événements d'un type (niveaux COUNTERS et FULL)"""
+        return self.counts[op]
+
+    def dealt_by(self, card: Card) -> int:
+        """Dégâts infligés par une carte (niveaux COUNTERS et FULL)"""
+        ref = self._refs.get(id(card))
+        return self.damage_dealt.get(ref, 0) if ref is not None else 0
+
+    def format_event(self, event: CombatEvent) -> str:
+        """Texte lisible d'un événement"""
+        return EVENT_FORMATS[EventType(event.op)].format(
+            source=self._name(event.source),
+            target=self._name(event.target),
+            value=event.value,
+            extra=event.extra,
+            status=STATUSES[event.extra].value if event.op == EventType.STATUS_APPLY else ""
+        )
+
+    def _name(self, ref: int) -> str:
+        return self.cards[ref].name if ref != NO_CARD else ""
+
+    def format(self, last: Optional[int] = None) -> List[str]:
+        """Journal textuel des événements disponibles (ou des derniers)"""
+        events = list(self)
+        if last is not None:
+            events = events[-last:] if last else []
+        return [self.format_event(event) for event in events]
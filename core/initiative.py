@@ -0,0 +1,204 @@
+# core/initiative.py
+"""Ordre d'initiative persistant - seaux par vitesse et départage tiré à chaque tour"""
+
+from bisect import bisect_right
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+
+from entities import Card, CombatState, FIELD_SIZE
+from rng import draw_block
+
+# Cases du terrain: joueur 0-5 puis ennemi 0-5
+SQUARES = 2 * FIELD_SIZE
+
+_by_key = attrgetter('key')
+
+
+# (carte, camp joueur, emplacement), dans l'ordre d'attaque
+InitiativeEntry = Tuple[Card, bool, int]
+
+
+class _Unit:
+    """Unité suivie par l'ordonnanceur"""
+    __slots__ = ('card', 'is_player', 'slot', 'key', 'spd')
+
+    def __init__(self, card: Card, is_player: bool, slot: int, key: float):
+        self.card = card
+        self.is_player = is_player
+        self.slot = slot
+        self.key = key
+        self.spd = card.current_spd
+
+    @property
+    def square(self) -> int:
+        return self.slot if self.is_player else FIELD_SIZE + self.slot
+
+
+class InitiativeScheduler:
+    """Ordre d'attaque par vitesse décroissante, tenu à jour incrémentalement.
+
+    À chaque tour, new_turn() tire du RNG du combat une clé de départage
+    par unité (joueur 0-5 puis ennemi 0-5): à vitesse égale, la plus grande
+    clé agit d'abord, dans un ordre différent à chaque tour. Seuls les
+    seaux de plus d'une unité sont retriés, en place. Les seaux ne bougent
+    sinon qu'aux poses, retraits et changements de vitesse; l'ordre d'un
+    tour est une liste en cache, reconstruite seulement après un changement.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self._units: Dict[int, _Unit] = {}  # id(carte) -> unité
+        self._buckets: Dict[int, Tuple[List[float], List[_Unit]]] = {}  # vitesse -> (-clés, unités)
+        self._squares: List[Optional[_Unit]] = [None] * SQUARES  # Unités par case
+        self._order: List[InitiativeEntry] = []
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Abonnement à CombatState
+    # ------------------------------------------------------------------
+
+    def attach(self, state: CombatState):
+        """Suit les poses et retraits du terrain de state"""
+        state.add_slot_listener(self)
+        self.board_reset(state)
+
+    def slot_changed(self, is_player: bool, slot: int, old: Optional[Card], new: Optional[Card]):
+        if old:
+            self.remove(old)
+        if new:
+            self.add(new, is_player, slot)
+
+    def board_reset(self, state: CombatState):
+        """Resynchronise avec le terrain (les unités déjà suivies gardent leur clé)"""
+        present = {}
+        for is_player, field in ((True, state.player_field), (False, state.enemy_field)):
+            for slot, card in enumerate(field):
+                if card:
+                    present[id(card)] = (card, is_player, slot)
+
+        for uid in [uid for uid in self._units if uid not in present]:
+            self.remove(self._units[uid].card)
+        for uid, (card, is_player, slot) in present.items():
+            unit = self._units.get(uid)
+            if unit is None:
+                self.add(card, is_player, slot)
+            elif (unit.is_player, unit.slot) != (is_player, slot):
+                if self._squares[unit.square] is unit:
+                    self._squares[unit.square] = None
+                unit.is_player, unit.slot = is_player, slot
+                self._squares[unit.square] = unit
+                self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Mises à jour
+    # ------------------------------------------------------------------
+
+    def add(self, card: Card, is_player: bool, slot: int):
+        """Nouvelle unité sur le terrain (après les unités de même vitesse jusqu'au tour suivant)"""
+        if id(card) in self._units:
+            self.remove(card)
+        unit = _Unit(card, is_player, slot, 0.0)
+        self._units[id(card)] = unit
+        self._squares[unit.square] = unit
+        self._insert(unit)
+
+    def remove(self, card: Card):
+        """Unité retirée du terrain"""
+        unit = self._units.pop(id(card), None)
+        if unit is not None:
+            if self._squares[unit.square] is unit:
+                self._squares[unit.square] = None
+            self._discard(unit)
+
+    def set_speed(self, card: Card, spd: int):
+        """Change la vitesse d'une carte et la déplace de seau"""
+        card.current_spd = spd
+        unit = self._units.get(id(card))
+        if unit is not None and unit.spd != spd:
+            self._discard(unit)
+            unit.spd = spd
+            self._insert(unit)
+
+    def new_turn(self, keys: Optional[Sequence[float]] = None):
+        """Retire les départages du tour (consomme une valeur du RNG par unité).
+
+        keys: clés imposées, indexées par case (voir SQUARES), sans tirage.
+        """
+        self._sync_speeds()
+        if keys is None:
+            drawn = draw_block(self.rng, len(self._units)).tolist()
+            for unit, key in zip(filter(None, self._squares), drawn):
+                unit.key = key
+        else:
+            for unit in self._units.values():
+                unit.key = keys[unit.square]
+
+        for negkeys, units in self._buckets.values():
+            if len(units) > 1:
+                units.sort(key=_by_key, reverse=True)
+                for i, unit in enumerate(units):
+                    negkeys[i] = -unit.key
+                self._dirty = True
+
+    def _insert(self, unit: _Unit):
+        keys, units = self._buckets.setdefault(unit.spd, ([], []))
+        i = bisect_right(keys, -unit.key)
+        keys.insert(i, -unit.key)
+        units.insert(i, unit)
+        self._dirty = True
+
+    def _discard(self, unit: _Unit):
+        keys, units = self._buckets[unit.spd]
+        i = units.index(unit)
+        del keys[i]
+        del units[i]
+        if not units:
+            del self._buckets[unit.spd]
+        self._dirty = True
+
+    def snapshot(self) -> Tuple[Tuple[Card, bool, int, float, int], ...]:
+        """Unités suivies avec leur clé de départage (voir CombatResolver.snapshot)"""
+        return tuple((u.card, u.is_player, u.slot, u.key, u.spd) for u in self._units.values())
+
+    def restore(self, snapshot: Tuple[Tuple[Card, bool, int, float, int], ...]):
+        """Reconstruit les seaux depuis un instantané, sans consommer le RNG"""
+        self._units = {}
+        self._buckets = {}
+        self._squares = [None] * SQUARES
+        for card, is_player, slot, key, spd in snapshot:
+            unit = _Unit(card, is_player, slot, key)
+            unit.spd = spd
+            self._units[id(card)] = unit
+            self._squares[unit.square] = unit
+            self._insert(unit)
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def order(self) -> List[InitiativeEntry]:
+        """Unités dans l'ordre d'attaque.
+
+        La liste retournée n'est jamais modifiée en place: on peut la
+        parcourir pendant que des unités meurent. Une vitesse modifiée
+        directement sur une carte (sans set_speed) est détectée ici.
+        """
+        self._sync_speeds()
+        if self._dirty:
+            self._order = [
+                (unit.card, unit.is_player, unit.slot)
+                for spd in sorted(self._buckets, reverse=True)
+                for unit in self._buckets[spd][1]
+            ]
+            self._dirty = False
+        return self._order
+
+    def _sync_speeds(self):
+        for unit in self._units.values():
+            if unit.card.current_spd != unit.spd:
+                self.set_speed(unit.card, unit.card.current_spd)
+
+    def __len__(self) -> int:
+        return len(self._units)
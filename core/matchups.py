@@ -0,0 +1,250 @@
+# core/matchups.py
+"""Matrice des affrontements: archétypes de decks contre pools d'ennemis des cartes d'acte"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from hashlib import blake2b
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import pickle
+import random
+
+import numpy as np
+import pandas as pd
+
+from entities import Biome, CardDatabase, CardTemplate
+from progression import MapGenerator
+from balance import CombatSimulator
+from accumulators import wilson_interval
+from calibration import SimulationCache
+from run_simulation import ACT_BIOMES
+from rng import RngStreams, Purpose
+
+
+@dataclass(frozen=True)
+class Archetype:
+    """Deck joueur type: cartes jouées telles quelles à chaque combat"""
+    name: str
+    cards: Tuple[CardTemplate, ...]
+
+
+@dataclass(frozen=True)
+class EnemyPool:
+    """Rencontres d'un (biome, acte): un combat en tire une uniformément"""
+    name: str
+    biome: Biome
+    act: int
+    encounters: Tuple[Tuple[CardTemplate, ...], ...]
+
+
+def enemy_pools(card_db: CardDatabase, acts: Sequence[int] = (1, 2, 3),
+                biomes: Sequence[Biome] = ACT_BIOMES, encounters: int = 8,
+                elite: bool = False, seed: int = 0) -> List[EnemyPool]:
+    """Pools d'ennemis de MapGenerator._generate_enemy_pool, par biome et par acte.
+
+    Les identifiants sont résolus comme dans RunSimulator._enemies: carte du
+    catalogue, ou tirage dans le biome à défaut. La résolution est faite une
+    fois ici, si bien qu'un pool a un contenu fixe (et donc une clé de cache).
+    """
+    pools = []
+    for act in acts:
+        for biome in biomes:
+            rng = random.Random(f"{seed}:{biome.value}:{act}:{elite}")
+            generator = MapGenerator(seed=rng.getrandbits(32))
+            resolved = []
+            for _ in range(encounters):
+                enemies = []
+                for card_id in generator._generate_enemy_pool(biome, act, elite):
+                    template = card_db.templates.get(card_id)
+                    if template is None:
+                        template = card_db.sampler.draw(rng, "reward", act, biome)
+                    if template is not None:
+                        enemies.append(template)
+                if enemies:
+                    resolved.append(tuple(enemies))
+            if resolved:
+                kind = "elite" if elite else "common"
+                pools.append(EnemyPool(f"{biome.value}_{kind}_{act}", biome, act, tuple(resolved)))
+    return pools
+
+
+def biome_archetypes(card_db: CardDatabase, biomes: Sequence[Biome] = ACT_BIOMES,
+                     deck_size: int = 8, act: int = 1, seed: int = 0) -> List[Archetype]:
+    """Un archétype par biome: deck tiré dans le biome (et les neutres) comme une récompense"""
+    archetypes = []
+    for biome in biomes:
+        rng = random.Random(f"{seed}:{biome.value}")
+        cards = card_db.sampler.draw_many(rng, deck_size, "reward", act, biome, unique=False)
+        if cards:
+            archetypes.append(Archetype(biome.value, tuple(cards)))
+    return archetypes
+
+
+@dataclass
+class MatchupMatrix:
+    """Victoires et combats de chaque archétype (lignes) contre chaque pool (colonnes)"""
+    archetypes: List[str]
+    pools: List[str]
+    wins: np.ndarray
+    combats: np.ndarray
+    simulated: int = 0  # Cellules simulées par ce calcul
+    reused: int = 0  # Cellules reprises du cache (contenu inchangé)
+
+    @property
+    def win_rates(self) -> np.ndarray:
+        return self.wins / np.maximum(self.combats, 1)
+
+    def interval(self, archetype: str, pool: str) -> Tuple[float, float]:
+        """Intervalle de Wilson du taux de victoire d'une cellule"""
+        i, j = self.archetypes.index(archetype), self.pools.index(pool)
+        return wilson_interval(int(self.wins[i, j]), int(self.combats[i, j]))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Taux de victoire en DataFrame (index: archétypes, colonnes: pools)"""
+        return pd.DataFrame(self.win_rates, index=self.archetypes, columns=self.pools)
+
+
+# ----------------------------------------------------------------------
+# Cellules (exécutées dans les processus)
+# ----------------------------------------------------------------------
+
+# Modèles partagés, chargés une fois par processus depuis la mémoire partagée
+_TEMPLATES: List[CardTemplate] = []
+
+
+def _attach_templates(name: str, size: int):
+    """Initialisation d'un processus: lit la table des modèles publiée par le parent"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        _TEMPLATES[:] = pickle.loads(bytes(block.buf[:size]))
+    finally:
+        block.close()
+
+
+def _play_cell(deck: Tuple[int, ...], encounters: Tuple[Tuple[int, ...], ...], combats: int,
+               seed: int, max_turns: int, batch_size: int,
+               templates: Optional[List[CardTemplate]] = None) -> int:
+    """Victoires du deck (indices de modèles) sur combats rencontres tirées dans le pool"""
+    templates = _TEMPLATES if templates is None else templates
+    simulator = CombatSimulator(seed=seed)
+    streams = RngStreams(seed)
+    wins = 0
+    for start in range(0, combats, batch_size):
+        indices = range(start, min(start + batch_size, combats))
+        matchups = []
+        for index in indices:
+            # Combat index: rencontre sur son flux DECK, résolution sur son flux COMBAT
+            pick = streams.stream(index, Purpose.DECK).randrange(len(encounters))
+            matchups.append(([templates[i].instantiate() for i in deck],
+                             [templates[i].instantiate() for i in encounters[pick]]))
+        seeds = [streams.stream(index) for index in indices]
+        results = simulator.simulate_combat_batch(matchups, max_turns, seeds=seeds)
+        wins += sum(result.winner == "player" for result in results)
+    return wins
+
+
+class MatchupRunner:
+    """Calcule la matrice archétypes x pools, cellule par cellule.
+
+    Une cellule est identifiée par le hachage du contenu de ses cartes (deck
+    et rencontres) et du protocole: après une modification de quelques
+    cartes, seules les cellules qui les contiennent sont resimulées, les
+    autres sont reprises du cache (en mémoire, et sur disque avec cache_dir).
+    Les graines d'une cellule dérivent de sa clé: son résultat ne dépend ni
+    de l'ordre de calcul ni du nombre de processus.
+
+    Avec workers > 1, les cellules manquantes sont réparties entre processus.
+    Les modèles de cartes sont publiés une fois dans un bloc de mémoire
+    partagée que chaque processus lit à son démarrage; une cellule n'envoie
+    que des indices de modèles.
+    """
+
+    def __init__(self, combats: int = 200, max_turns: int = 20, batch_size: int = 64,
+                 workers: Optional[int] = None, cache_dir: Optional[str] = None, seed: int = 0):
+        if combats < 1:
+            raise ValueError("combats doit être positif")
+
+        self.combats = combats
+        self.max_turns = max_turns
+        self.batch_size = batch_size
+        self.workers = workers
+        self.seed = seed
+        self.cache = SimulationCache(cache_dir)
+
+    def cell_key(self, archetype: Archetype, pool: EnemyPool) -> str:
+        """Clé de cache d'une cellule: contenu des cartes et protocole"""
+        payload = json.dumps([
+            [t.signature for t in archetype.cards],
+            [[t.signature for t in encounter] for encounter in pool.encounters],
+            [self.combats, self.max_turns, self.seed],
+        ])
+        return blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def run(self, archetypes: Sequence[Archetype], pools: Sequence[EnemyPool]) -> MatchupMatrix:
+        """Matrice des taux de victoire, en ne simulant que les cellules inconnues"""
+        matrix = MatchupMatrix(
+            [a.name for a in archetypes], [p.name for p in pools],
+            np.zeros((len(archetypes), len(pools)), dtype=np.int64),
+            np.zeros((len(archetypes), len(pools)), dtype=np.int64),
+        )
+
+        missing: Dict[str, List[Tuple[int, int]]] = {}
+        for i, archetype in enumerate(archetypes):
+            for j, pool in enumerate(pools):
+                key = self.cell_key(archetype, pool)
+                table = self.cache.get(key) if key not in missing else None
+                if table is None:
+                    missing.setdefault(key, []).append((i, j))
+                else:
+                    matrix.wins[i, j], matrix.combats[i, j] = table['player']
+                    matrix.reused += 1
+
+        if missing:
+            computed = self._simulate(archetypes, pools, missing)
+            for key, wins in computed.items():
+                self.cache.put(key, {'player': (wins, self.combats)})
+                for i, j in missing[key]:
+                    matrix.wins[i, j], matrix.combats[i, j] = wins, self.combats
+            matrix.simulated = len(missing)
+        return matrix
+
+    def _simulate(self, archetypes: Sequence[Archetype], pools: Sequence[EnemyPool],
+                  missing: Dict[str, List[Tuple[int, int]]]) -> Dict[str, int]:
+        # Modèles distincts des cellules à simuler; les cellules les référencent par indice
+        templates: List[CardTemplate] = []
+        codes: Dict[str, int] = {}
+
+        def encode(cards: Sequence[CardTemplate]) -> Tuple[int, ...]:
+            indices = []
+            for template in cards:
+                key = template.content_key
+                if key not in codes:
+                    codes[key] = len(templates)
+                    templates.append(template)
+                indices.append(codes[key])
+            return tuple(indices)
+
+        tasks = []
+        for key, cells in missing.items():
+            i, j = cells[0]
+            deck = encode(archetypes[i].cards)
+            encounters = tuple(encode(encounter) for encounter in pools[j].encounters)
+            seed = int(key[:8], 16)
+            tasks.append((key, (deck, encounters, self.combats, seed, self.max_turns,
+                                self.batch_size)))
+
+        if not (self.workers and self.workers > 1 and len(tasks) > 1):
+            return {key: _play_cell(*args, templates=templates) for key, args in tasks}
+
+        data = pickle.dumps(templates)
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            block.buf[:len(data)] = data
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_templates,
+                                     initargs=(block.name, len(data))) as pool:
+                futures = {key: pool.submit(_play_cell, *args) for key, args in tasks}
+                return {key: future.result() for key, future in futures.items()}
+        finally:
+            block.close()
+            block.unlink()
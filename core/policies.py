@@ -0,0 +1,276 @@
+# core/policies.py
+"""Politiques de jeu du joueur pour le simulateur - gloutonne et recherche MCTS"""
+
+from operator import itemgetter
+from typing import Hashable, List, Optional, Tuple
+import math
+import random
+import time
+
+import numpy as np
+
+from entities import Card, CombatState, FIELD_SIZE
+from combat import CombatResolver
+from events import LogLevel
+from zobrist import TranspositionTable
+from rng import PhiloxRandom
+
+
+# Décision d'un tour: (indice dans la main, emplacement), None = finir le tour
+Action = Optional[Tuple[int, int]]
+
+
+class PlayPolicy:
+    """Décide des cartes que le joueur pose à chaque tour.
+
+    play_turn() ne joue que par resolver.play_card(). Une politique
+    batchable n'a besoin de rien d'autre et peut donc piloter le moteur
+    vectorisé: play_batch() joue alors le tour de chaque combat au travers
+    de BatchResolverView, ou de tous à la fois si la politique le redéfinit.
+    """
+    batchable = False
+
+    def begin_combat(self, resolver: CombatResolver, state: CombatState,
+                     rng_seed: Optional[int] = None):
+        """Appelé une fois par combat, après start_combat()"""
+
+    def play_turn(self, resolver: CombatResolver, state: CombatState):
+        raise NotImplementedError
+
+    def play_batch(self, engine, idx: np.ndarray):
+        """Joue le tour des combats idx d'un BatchCombatEngine"""
+        for b in idx.tolist():
+            self.play_turn(engine.resolver_view(b), engine.states[b])
+
+
+class GreedyPolicy(PlayPolicy):
+    """Pose la carte la plus chère abordable dans le premier emplacement libre"""
+    batchable = True
+
+    def play_turn(self, resolver: CombatResolver, state: CombatState):
+        # Jouer des cartes tant qu'on a de l'énergie
+        while state.energy > 0 and state.hand:
+            playable = [c for c in state.hand if c.cost <= state.energy]
+            if not playable:
+                break
+
+            # Jouer la carte la plus chère qu'on peut se permettre
+            card = max(playable, key=lambda c: c.cost)
+
+            # Trouver une position libre
+            for pos in range(FIELD_SIZE):
+                if state.player_field[pos] is None:
+                    if resolver.play_card(card, pos):
+                        break
+            else:
+                break  # Pas de position libre
+
+    def play_batch(self, engine, idx: np.ndarray):
+        """Même règle que play_turn, appliquée à tous les combats par tableaux"""
+        if type(self).play_turn is not GreedyPolicy.play_turn:
+            # Sous-classe qui change la règle: combat par combat
+            return super().play_batch(engine, idx)
+
+        while len(idx):
+            costs = engine.hand_cost[idx]
+            energy = engine.energy[idx]
+            playable = (costs >= 0) & (costs <= energy[:, None])
+            free = ~engine.occupied[idx, :FIELD_SIZE]
+            go = (energy > 0) & playable.any(axis=1) & free.any(axis=1)
+            if not go.all():
+                idx, playable, free, costs = idx[go], playable[go], free[go], costs[go]
+                if not len(idx):
+                    break
+
+            # La plus chère abordable (la première de la main à égalité),
+            # dans le premier emplacement libre
+            card = np.where(playable, costs, -1).argmax(axis=1)
+            engine.deploy(idx, card, free.argmax(axis=1))
+
+
+def _signature(card: Card) -> Tuple:
+    """État d'une carte comparable et hachable (modèle par identité)"""
+    return (id(card.template), card.keyword_mask, card.current_dur, card.current_atk,
+            card.current_spd, card.shields, tuple(card.status_values))
+
+
+class MCTSPolicy(PlayPolicy):
+    """Recherche arborescente Monte Carlo (UCT) sur les choix main × emplacement.
+
+    Avant chaque pose, la politique explore les suites de poses du tour
+    depuis un instantané du résolveur (snapshot/restore). Une feuille est
+    évaluée en finissant le tour puis en jouant rollout_turns tours avec la
+    politique de déroulement: 1 pour une victoire, 0 pour une défaite, la
+    part de présence du joueur sinon, multiplié par discount par tour joué
+    (une victoire rapide vaut mieux qu'une victoire lente).
+
+    Le budget par décision est un nombre d'itérations, une durée en
+    secondes, ou les deux (le premier atteint). Les statistiques sont rangées
+    dans une TranspositionTable indexée par le hash de Zobrist de l'état et
+    la main, conservée d'un tour à l'autre du même combat; à l'éviction, les
+    nœuds les plus visités sont gardés. Les déroulements tirent leurs
+    départages dans le RNG de la politique: la recherche ne voit pas les
+    tirages du vrai combat.
+    """
+
+    def __init__(self, iterations: Optional[int] = 200, time_budget: Optional[float] = None,
+                 rollout_turns: int = 5, exploration: float = 1.4, discount: float = 0.95,
+                 seed: Optional[int] = None, rollout_policy: Optional[PlayPolicy] = None,
+                 table_size: int = 1 << 17):
+        if iterations is None and time_budget is None:
+            raise ValueError("Il faut un budget: iterations et/ou time_budget")
+
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.discount = discount
+        self.seed = seed
+        self.rollout_policy = rollout_policy or GreedyPolicy()
+        self.rng = random.Random(seed)
+
+        # Clé d'état -> nœud [visites, {action: [visites, somme des valeurs]}]
+        self.table = TranspositionTable(table_size, weight=itemgetter(0))
+        self._state: Optional[CombatState] = None
+
+    def begin_combat(self, resolver: CombatResolver, state: CombatState,
+                     rng_seed: Optional[int] = None):
+        """Vide la table; avec une graine de combat, la recherche est reproductible"""
+        self.table.clear()
+        self._state = state
+        if rng_seed is not None:
+            if isinstance(rng_seed, PhiloxRandom):
+                rng_seed = tuple(rng_seed.address)  # Stable d'un processus à l'autre
+            self.rng = random.Random(f"{self.seed}:{rng_seed}")
+
+    def play_turn(self, resolver: CombatResolver, state: CombatState):
+        if state is not self._state:
+            self.begin_combat(resolver, state)
+
+        while True:
+            action = self.choose(resolver, state)
+            if action is None:
+                return
+            index, position = action
+            if not resolver.play_card(state.hand[index], position):
+                return
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def choose(self, resolver: CombatResolver, state: CombatState) -> Action:
+        """Meilleure décision depuis l'état courant (la plus visitée)"""
+        actions = self._actions(state)
+        if len(actions) == 1:
+            return None
+
+        root_node = self._node(state)
+        root = resolver.snapshot()
+        level = resolver.events.level
+        resolver.events.level = LogLevel.OFF
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        try:
+            done = 0
+            while self.iterations is None or done < self.iterations:
+                if deadline is not None and time.perf_counter() >= deadline and done:
+                    break
+                resolver.rng.seed(self.rng.getrandbits(64))
+                self._iterate(resolver, state, root_node)
+                resolver.restore(root)
+                done += 1
+        finally:
+            resolver.restore(root)
+            resolver.events.level = level
+
+        edges = root_node[1]
+        return max(actions, key=lambda a: edges[a][0] if a in edges else 0)
+
+    def _iterate(self, resolver: CombatResolver, state: CombatState, node: list):
+        """Une itération: sélection UCT, expansion d'une action, déroulement, rétropropagation"""
+        path = []
+        while True:
+            actions = self._actions(state)
+            untried = [a for a in actions if a not in node[1]]
+            action = self.rng.choice(untried) if untried else self._select(node, actions)
+            path.append((node, action))
+
+            if action is None:
+                value = self._rollout(resolver, state, finish_turn=False)
+                break
+            resolver.play_card(state.hand[action[0]], action[1])
+            if untried:
+                value = self._rollout(resolver, state, finish_turn=True)
+                break
+            node = self._node(state)
+
+        for node, action in path:
+            node[0] += 1
+            edge = node[1].setdefault(action, [0, 0.0])
+            edge[0] += 1
+            edge[1] += value
+
+    def _node(self, state: CombatState) -> list:
+        """Nœud de l'état dans la table (créé s'il est absent ou a été évincé)"""
+        key = self._key(state)
+        node = self.table.get(key)
+        if node is None:
+            node = [0, {}]
+            self.table.store(key, node)
+        return node
+
+    def _select(self, node: list, actions: List[Action]) -> Action:
+        """Action maximisant la borne UCT"""
+        log_visits = math.log(node[0] or 1)
+        edges = node[1]
+        return max(actions, key=lambda a: edges[a][1] / edges[a][0]
+                   + self.exploration * math.sqrt(log_visits / edges[a][0]))
+
+    def _rollout(self, resolver: CombatResolver, state: CombatState, finish_turn: bool) -> float:
+        """Finit le tour puis joue quelques tours avec la politique de déroulement"""
+        if finish_turn:
+            self.rollout_policy.play_turn(resolver, state)
+        resolver.process_turn()
+
+        turns = 1
+        while turns < self.rollout_turns and state.is_combat_over() is None:
+            self.rollout_policy.play_turn(resolver, state)
+            resolver.process_turn()
+            turns += 1
+
+        return self.evaluate(state) * self.discount ** turns
+
+    @staticmethod
+    def evaluate(state: CombatState) -> float:
+        """Valeur d'un état pour le joueur, entre 0 et 1"""
+        over = state.is_combat_over()
+        if over is not None:
+            return 1.0 if over else 0.0
+        player, enemy = state.get_presence(True), state.get_presence(False)
+        return player / (player + enemy) if player + enemy > 0 else 0.5
+
+    # ------------------------------------------------------------------
+    # Actions et clés d'état
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _actions(state: CombatState) -> List[Action]:
+        """Fin du tour, puis chaque carte abordable (doublons exclus) × emplacement libre"""
+        actions: List[Action] = [None]
+        free = [pos for pos in range(FIELD_SIZE) if state.player_field[pos] is None]
+        if not free:
+            return actions
+
+        seen = []
+        for index, card in enumerate(state.hand):
+            if card.cost <= state.energy:
+                signature = _signature(card)
+                if signature not in seen:
+                    seen.append(signature)
+                    actions.extend((index, pos) for pos in free)
+        return actions
+
+    @staticmethod
+    def _key(state: CombatState) -> Hashable:
+        """Clé de transposition: hash du combat, plus la main ordonnée (les actions y sont des indices)"""
+        return state.zobrist_hash(), tuple(map(_signature, state.hand))
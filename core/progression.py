@@ -2,13 +2,13 @@
 """Système de progression, nœuds et meta-progression"""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any, Callable
+from typing import Collection, Dict, List, Optional, Set, Tuple, Any, Callable
 from enum import Enum, auto
 import random
 import json
 from pathlib import Path
 
-from entities import Card, RunState, Biome, Rarity, StatusEffect, CardDatabase
+from entities import Card, CardTemplate, RunState, Biome, Rarity, StatusEffect, CardDatabase
 
 
 class NodeType(Enum):
@@ -254,8 +254,9 @@ class MapGenerator:
 class EventSystem:
     """Système d'événements narratifs"""
 
-    def __init__(self, card_db: CardDatabase):
+    def __init__(self, card_db: CardDatabase, rng: Optional[random.Random] = None):
         self.card_db = card_db
+        self.rng = rng or random.Random()
         self.events = self._load_events()
 
     def _load_events(self) -> Dict[str, Dict]:
@@ -371,24 +372,19 @@ class EventSystem:
 
         return results
 
-    def _generate_random_card(self, act: int) -> Card:
+    def _generate_random_card(self, act: int, exclude: Collection[str] = ()) -> Card:
         """Génère une carte aléatoire appropriée à l'acte"""
-        rarities = [Rarity.COMMON, Rarity.COMMON, Rarity.UNCOMMON]
-        if act >= 2:
-            rarities.append(Rarity.RARE)
-        if act >= 3:
-            rarities.append(Rarity.EPIC)
-
-        rarity = random.choice(rarities)
-        # Filtrer les cartes par rareté
-        # Retourner une carte aléatoire
-        return self.card_db.create_card("forest_spine_frog")  # Placeholder
+        template = self.card_db.sampler.draw(self.rng, "event", act, exclude=exclude)
+        if template is None:
+            raise ValueError("Aucune carte disponible pour cet événement")
+        return template.instantiate()
 
 
 class MerchantSystem:
     """Système de marchand"""
 
-    def __init__(self):
+    def __init__(self, card_db: Optional[CardDatabase] = None):
+        self.card_db = card_db or CardDatabase()
         self.base_prices = {
             Rarity.COMMON: 15,
             Rarity.UNCOMMON: 25,
@@ -403,20 +399,19 @@ class MerchantSystem:
             "remove_card": 50
         }
 
-    def generate_shop(self, act: int, biome: Biome, rng: random.Random) -> Dict:
-        """Génère l'inventaire d'un marchand"""
+    def generate_shop(self, act: int, biome: Biome, rng: random.Random,
+                      exclude: Collection[str] = ()) -> Dict:
+        """Génère l'inventaire d'un marchand (sans les cartes exclues, ex: verrouillées)"""
         shop = {
             "cards": [],
             "consumables": [],
             "services": []
         }
 
-        # Cartes à vendre (4-6)
+        # Cartes à vendre (4-6), toutes différentes
         card_count = rng.randint(4, 6)
-        for i in range(card_count):
-            # Logique de génération selon l'acte
-            card_data = self._generate_shop_card(act, biome, rng)
-            shop["cards"].append(card_data)
+        templates = self.card_db.sampler.draw_many(rng, card_count, "shop", act, biome, exclude)
+        shop["cards"] = [self._shop_card(template, act) for template in templates]
 
         # Consommables
         shop["consumables"].append({
@@ -440,36 +435,16 @@ class MerchantSystem:
 
         return shop
 
-    def _generate_shop_card(self, act: int, biome: Biome, rng: random.Random) -> Dict:
-        """Génère une carte pour le marchand"""
-        # Déterminer la rareté selon l'acte
-        if act == 1:
-            rarity_weights = {Rarity.COMMON: 60, Rarity.UNCOMMON: 35, Rarity.RARE: 5}
-        elif act == 2:
-            rarity_weights = {Rarity.COMMON: 30, Rarity.UNCOMMON: 50, Rarity.RARE: 18, Rarity.EPIC: 2}
-        else:
-            rarity_weights = {Rarity.UNCOMMON: 30, Rarity.RARE: 50, Rarity.EPIC: 18, Rarity.LEGENDARY: 2}
-
-        # Sélection pondérée
-        total = sum(rarity_weights.values())
-        roll = rng.random() * total
-        current = 0
-
-        selected_rarity = Rarity.COMMON
-        for rarity, weight in rarity_weights.items():
-            current += weight
-            if roll < current:
-                selected_rarity = rarity
-                break
-
-        price = self.base_prices[selected_rarity]
+    def _shop_card(self, template: CardTemplate, act: int) -> Dict:
+        """Entrée du marchand pour une carte tirée"""
+        price = self.base_prices[template.rarity]
 
         # Ajuster le prix selon l'acte
         price = int(price * (1 + 0.1 * (act - 1)))
 
         return {
-            "card_id": f"{biome.value}_sample",  # À remplacer par vraie génération
-            "rarity": selected_rarity,
+            "card_id": template.id,
+            "rarity": template.rarity,
             "price": price
         }
 
@@ -552,6 +527,20 @@ class AlchemySystem:
 class MetaProgression:
     """Système de méta-progression entre les runs"""
 
+    # Cartes débloquées par paliers de trophées
+    TROPHY_UNLOCKS = {
+        100: ["variant_brood_myrmid", "variant_fire_caracal"],
+        250: ["variant_armored_pike", "variant_ash_rhea"],
+        500: ["exotic_antlion", "exotic_polar_fox"],
+        1000: ["exotic_frost_sphinx", "variant_living_sculpture"],
+        2000: ["exotic_dust_cerberus", "exotic_ancient_alder"]
+    }
+
+    # Cartes débloquées par les achievements
+    ACHIEVEMENT_UNLOCKS = {
+        "first_victory": ["variant_mist_scythe", "variant_styx_mastiff"]
+    }
+
     def __init__(self, save_path: Path = Path("saves")):
         self.save_path = save_path
         self.save_path.mkdir(exist_ok=True)
@@ -634,15 +623,7 @@ class MetaProgression:
         # Débloquer selon les paliers de trophées
         total_trophies = self.profile["trophies"]
 
-        trophy_unlocks = {
-            100: ["variant_brood_myrmid", "variant_fire_caracal"],
-            250: ["variant_armored_pike", "variant_ash_rhea"],
-            500: ["exotic_antlion", "exotic_polar_fox"],
-            1000: ["exotic_frost_sphinx", "variant_living_sculpture"],
-            2000: ["exotic_dust_cerberus", "exotic_ancient_alder"]
-        }
-
-        for threshold, cards in trophy_unlocks.items():
+        for threshold, cards in self.TROPHY_UNLOCKS.items():
             if total_trophies >= threshold:
                 for card_id in cards:
                     if card_id not in self.profile["unlocked_cards"]:
@@ -653,10 +634,16 @@ class MetaProgression:
         if victory and run_state.current_act >= 3:
             if "first_victory" not in self.profile["achievements"]:
                 self.profile["achievements"].append("first_victory")
-                unlocks.extend(["variant_mist_scythe", "variant_styx_mastiff"])
+                unlocks.extend(self.ACHIEVEMENT_UNLOCKS["first_victory"])
 
         return unlocks
 
+    def locked_cards(self) -> Set[str]:
+        """Cartes déblocables pas encore débloquées (à exclure des tirages)"""
+        unlockable = {card_id for cards in self.TROPHY_UNLOCKS.values() for card_id in cards}
+        unlockable.update(card_id for cards in self.ACHIEVEMENT_UNLOCKS.values() for card_id in cards)
+        return unlockable - set(self.profile["unlocked_cards"])
+
     def get_available_starter_cards(self) -> List[str]:
         """Retourne les cartes disponibles pour le pool de départ"""
         base_cards = [
@@ -0,0 +1,506 @@
+# core/result_store.py
+"""Stockage colonnaire des résultats de simulation, en ajout seul et hors mémoire"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from entities import Card
+from accumulators import CardAccumulator, RunningStat
+from rng import PhiloxRandom
+
+
+# Colonnes d'un combat, dans l'ordre des champs de SimulationResult (winner en booléen)
+COMBAT_COLUMNS: Tuple[str, ...] = (
+    'player_won', 'turns', 'player_damage_dealt', 'enemy_damage_dealt',
+    'player_cards_lost', 'enemy_cards_lost', 'player_final_presence', 'enemy_final_presence',
+)
+
+# Colonnes d'une carte du deck joueur dans un combat (triées par carte dans un bloc)
+CARD_COLUMNS: Tuple[str, ...] = (
+    'row', 'card', 'won', 'survived', 'damage_dealt', 'damage_taken',
+)
+
+# Participants d'un combat dans l'ordre des decks, avec l'empreinte de leur modèle
+LINEUP_COLUMNS: Tuple[str, ...] = (
+    'lineup_row', 'lineup_card', 'lineup_enemy', 'lineup_key',
+)
+
+MANIFEST = "index.json"
+
+# Colonne stream: index du flux Philox du combat (seed: graine du lot), ou
+INTEGER_SEED = -1  # seed est la graine entière d'un random.Random
+NO_SEED = -2  # Combat ajouté sans sa graine (non rejouable)
+
+Chunk = Dict[str, np.ndarray]
+
+Seed = Union[int, PhiloxRandom, None]
+
+
+class Lineup(NamedTuple):
+    """De quoi rejouer un combat: identifiants des decks et générateur"""
+    player: Tuple[str, ...]
+    enemies: Tuple[str, ...]
+    seed: int
+    stream: int
+
+    @property
+    def replayable(self) -> bool:
+        return self.stream != NO_SEED
+
+    def rng(self) -> Seed:
+        """Générateur du combat, à son début"""
+        if self.stream == INTEGER_SEED:
+            return self.seed
+        return PhiloxRandom(self.seed, self.stream) if self.replayable else None
+
+
+def card_damage_dealt(player_deck: Sequence[Card], result) -> List[int]:
+    """Dégâts infligés par chaque carte du deck joueur dans un combat (un SimulationResult).
+
+    Réels (flux d'événements) si le combat a été journalisé, sinon estimés
+    par ATQ de base x tours.
+    """
+    if result.card_damage is not None:
+        return list(result.card_damage)
+    return [card.base_atk * result.turns for card in player_deck]
+
+
+def _result_rows(row: int, result, player_deck: Sequence[Card], enemy_deck: Sequence[Card],
+                 seed: Seed) -> Tuple[Tuple, List[Tuple], List[Tuple]]:
+    """Lignes tamponnées d'un combat: combat (avec la graine), cartes joueur, participants"""
+    if isinstance(seed, PhiloxRandom):
+        seed, stream = seed.address.seed, seed.address.index
+    elif seed is None:
+        seed, stream = 0, NO_SEED
+    else:
+        seed, stream = abs(seed), INTEGER_SEED  # random.Random ignore le signe
+
+    won = result.winner == "player"
+    combat = (
+        won, result.turns, result.player_damage_dealt, result.enemy_damage_dealt,
+        result.player_cards_lost, result.enemy_cards_lost,
+        result.player_final_presence, result.enemy_final_presence, seed, stream,
+    )
+    # Mêmes mesures que CombatSimulator._record_card_performance
+    cards = [
+        (row, card.id, won, card.current_dur > 0, dealt, card.base_dur - card.current_dur)
+        for card, dealt in zip(player_deck, card_damage_dealt(player_deck, result))
+    ]
+    lineup = [(row, card.id, False, card.template.content_key) for card in player_deck]
+    lineup += [(row, card.id, True, card.template.content_key) for card in enemy_deck]
+    return combat, cards, lineup
+
+
+def _chunk_from_rows(combats: List[Tuple], cards: List[Tuple], lineup: List[Tuple]) -> Chunk:
+    """Construit un bloc à partir des lignes tamponnées.
+
+    Chaque bloc a son propre vocabulaire de cartes (trié): les codes de la
+    colonne card y renvoient, ce qui rend les blocs autonomes et fusionnables
+    sans renumérotation. Les lignes de cartes sont triées par code, si bien
+    que les lignes d'une carte forment une tranche trouvée par searchsorted.
+    Les participants, triés par combat, gardent l'ordre des decks pour
+    pouvoir rejouer.
+    """
+    combat_array = np.array([c[:-2] for c in combats], dtype=np.int32).reshape(
+        -1, len(COMBAT_COLUMNS))
+    chunk = {name: combat_array[:, i].copy() for i, name in enumerate(COMBAT_COLUMNS)}
+    chunk['player_won'] = chunk['player_won'].astype(bool)
+    chunk['seed'] = np.array([c[-2] for c in combats], dtype=np.uint64)
+    chunk['stream'] = np.array([c[-1] for c in combats], dtype=np.int64)
+
+    ids = [row[1] for row in cards]
+    vocabulary, codes = np.unique(np.array(ids, dtype=str), return_inverse=True)
+    numbers = np.array([row[2:] for row in cards], dtype=np.int32).reshape(-1, 4)
+    order = np.argsort(codes, kind='stable')
+
+    chunk['cards'] = vocabulary
+    chunk['row'] = np.array([row[0] for row in cards], dtype=np.int32)[order]
+    chunk['card'] = codes.astype(np.int32)[order]
+    chunk['won'] = numbers[order, 0].astype(bool)
+    chunk['survived'] = numbers[order, 1].astype(bool)
+    chunk['damage_dealt'] = numbers[order, 2]
+    chunk['damage_taken'] = numbers[order, 3]
+
+    templates, template_codes = np.unique(np.array([e[1] for e in lineup], dtype=str),
+                                          return_inverse=True)
+    chunk['templates'] = templates
+    chunk['lineup_row'] = np.array([e[0] for e in lineup], dtype=np.int32)
+    chunk['lineup_card'] = template_codes.astype(np.int32)
+    chunk['lineup_enemy'] = np.array([e[2] for e in lineup], dtype=bool)
+    chunk['lineup_key'] = np.array([e[3] for e in lineup], dtype=str)
+    return chunk
+
+
+def _recode(vocabulary_a: np.ndarray, codes_a: np.ndarray, vocabulary_b: np.ndarray,
+            codes_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatène deux colonnes codées dans des vocabulaires différents"""
+    vocabulary, inverse = np.unique(np.concatenate([vocabulary_a, vocabulary_b]),
+                                    return_inverse=True)
+    codes = np.concatenate([inverse[:len(vocabulary_a)][codes_a],
+                            inverse[len(vocabulary_a):][codes_b]])
+    return vocabulary, codes.astype(np.int32)
+
+
+def _splice(chunk: Chunk, new: Chunk, rows: np.ndarray) -> Chunk:
+    """Bloc dont les combats rows (triés) sont remplacés par ceux de new (mêmes lignes)"""
+    spliced = {}
+    for name in COMBAT_COLUMNS + ('seed', 'stream'):
+        spliced[name] = chunk[name].copy()
+        spliced[name][rows] = new[name]
+
+    # Cartes joueur: lignes gardées puis nouvelles, retriées par code
+    keep = ~np.isin(chunk['row'], rows)
+    spliced['cards'], codes = _recode(chunk['cards'], chunk['card'][keep],
+                                      new['cards'], new['card'])
+    order = np.argsort(codes, kind='stable')
+    spliced['card'] = codes[order]
+    for name in CARD_COLUMNS:
+        if name != 'card':
+            spliced[name] = np.concatenate([chunk[name][keep], new[name]])[order]
+
+    # Participants: retriés par combat, l'ordre des decks est préservé
+    keep = ~np.isin(chunk['lineup_row'], rows)
+    spliced['templates'], codes = _recode(chunk['templates'], chunk['lineup_card'][keep],
+                                          new['templates'], new['lineup_card'])
+    order = np.argsort(np.concatenate([chunk['lineup_row'][keep], new['lineup_row']]),
+                       kind='stable')
+    spliced['lineup_card'] = codes[order]
+    for name in LINEUP_COLUMNS:
+        if name != 'lineup_card':
+            spliced[name] = np.concatenate([chunk[name][keep], new[name]])[order]
+    return spliced
+
+
+def _template_keys(chunk: Chunk) -> Dict[str, List[str]]:
+    """Empreintes des modèles de chaque carte d'un bloc (pour l'index)"""
+    keys, key_codes = np.unique(chunk['lineup_key'], return_inverse=True)
+    width = max(len(keys), 1)
+    # Paires (carte, empreinte) distinctes, triées par carte puis empreinte
+    pairs = np.unique(chunk['lineup_card'].astype(np.int64) * width + key_codes)
+    found: Dict[str, List[str]] = {}
+    for code, key in zip((pairs // width).tolist(), (pairs % width).tolist()):
+        found.setdefault(str(chunk['templates'][code]), []).append(str(keys[key]))
+    return found
+
+
+class ResultStore:
+    """Résultats de combats en colonnes NumPy, découpés en blocs.
+
+    Les résultats sont tamponnés puis écrits par blocs de chunk_size combats,
+    un fichier .npz par bloc dans path (ou gardés en mémoire si path est None).
+    index.json liste les blocs et, pour chaque bloc, les cartes qu'il contient:
+    c'est l'index par carte qui évite d'ouvrir les blocs sans la carte voulue.
+
+    Les agrégats (summary, card_performance) sont des réductions bloc par
+    bloc: la mémoire utilisée dépend de chunk_size et du nombre de cartes,
+    pas du nombre de combats. Un magasin rouvert avec open() se réanalyse
+    sans resimuler et accepte de nouveaux ajouts.
+
+    Chaque combat garde sa graine et ses participants, avec l'empreinte
+    (content_key) de leur modèle; l'index liste les empreintes de chaque
+    bloc. Après une modification de cartes, stale_combats trouve par l'index
+    les combats à rejouer et replace les réécrit (voir
+    CombatSimulator.resimulate).
+    """
+
+    def __init__(self, path: Optional[str] = None, chunk_size: int = 1 << 16,
+                 compress: bool = False):
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être positif")
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self._combats: List[Tuple] = []
+        self._cards: List[Tuple] = []
+        self._lineup: List[Tuple] = []
+        self._memory: List[Chunk] = []
+        # Par bloc: fichier, premier combat, nombre de combats, cartes présentes
+        self._manifest: List[Dict] = []
+        self._rows = 0
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            manifest = os.path.join(path, MANIFEST)
+            if os.path.exists(manifest):
+                with open(manifest, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f)['chunks']
+                self._rows = sum(entry['rows'] for entry in self._manifest)
+
+    @classmethod
+    def open(cls, path: str) -> 'ResultStore':
+        """Rouvre un magasin existant (pour le réanalyser ou le compléter)"""
+        if not os.path.exists(os.path.join(path, MANIFEST)):
+            raise FileNotFoundError(f"Pas de magasin de résultats dans {path}")
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self._rows + len(self._combats)
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def append(self, result, player_deck: Sequence[Card], enemy_deck: Sequence[Card] = (),
+               seed: Seed = None) -> None:
+        """Ajoute un combat (un SimulationResult) et l'état final des decks.
+
+        Avec les ennemis et le générateur du combat (graine entière ou flux
+        PhiloxRandom, dont seule l'adresse est gardée), il pourra être rejoué.
+        """
+        combat, cards, lineup = _result_rows(len(self._combats), result, player_deck,
+                                             enemy_deck, seed)
+        self._combats.append(combat)
+        self._cards.extend(cards)
+        self._lineup.extend(lineup)
+
+        if len(self._combats) >= self.chunk_size:
+            self.flush()
+
+    def append_chunk(self, chunk: Chunk) -> None:
+        """Ajoute un bloc déjà construit (par exemple renvoyé par un processus)"""
+        self.flush()
+        if len(chunk['turns']):
+            self._write(chunk)
+
+    def flush(self) -> None:
+        """Écrit le tampon courant comme un nouveau bloc"""
+        if not self._combats:
+            return
+        chunk = _chunk_from_rows(self._combats, self._cards, self._lineup)
+        self._combats, self._cards, self._lineup = [], [], []
+        self._write(chunk)
+
+    def take_chunks(self) -> List[Chunk]:
+        """Vide un magasin en mémoire et rend ses blocs"""
+        if self.path is not None:
+            raise ValueError("take_chunks est réservé aux magasins en mémoire")
+        self.flush()
+        chunks, self._memory, self._manifest, self._rows = self._memory, [], [], 0
+        return chunks
+
+    def _write(self, chunk: Chunk) -> None:
+        rows = len(chunk['turns'])
+        entry = {'start': self._rows, 'rows': rows}
+        if self.path is not None:
+            entry['file'] = f"chunk_{len(self._manifest):06d}.npz"
+        self._manifest.append(entry)
+        self._rows += rows
+        self._store(len(self._manifest) - 1, chunk)
+
+    def _store(self, index: int, chunk: Chunk) -> None:
+        """Écrit (ou réécrit) le bloc index et son entrée d'index"""
+        entry = self._manifest[index]
+        entry['cards'] = chunk['cards'].tolist()
+        entry['templates'] = _template_keys(chunk)
+
+        if self.path is None:
+            if index == len(self._memory):
+                self._memory.append(chunk)
+            else:
+                self._memory[index] = chunk
+            return
+
+        # Fichier complet avant remplacement, puis index
+        file = os.path.join(self.path, entry['file'])
+        save = np.savez_compressed if self.compress else np.savez
+        with open(file + ".tmp", 'wb') as f:
+            save(f, **chunk)
+        os.replace(file + ".tmp", file)
+        self._save_manifest()
+
+    def _save_manifest(self) -> None:
+        # Écriture atomique: un arrêt en cours d'écriture laisse l'ancien index
+        manifest = os.path.join(self.path, MANIFEST)
+        with open(manifest + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({'columns': list(COMBAT_COLUMNS + CARD_COLUMNS),
+                       'chunks': self._manifest}, f)
+        os.replace(manifest + ".tmp", manifest)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    @property
+    def cards(self) -> List[str]:
+        """Identifiants des cartes présentes dans les blocs écrits"""
+        return sorted({card for entry in self._manifest for card in entry['cards']})
+
+    def chunks(self, card_id: Optional[str] = None) -> Iterator[Tuple[int, Chunk]]:
+        """Parcourt les blocs écrits (un seul chargé à la fois) avec leur premier combat.
+
+        Avec card_id, seuls les blocs qui contiennent la carte sont ouverts.
+        """
+        for i, entry in enumerate(self._manifest):
+            if card_id is not None and card_id not in entry['cards']:
+                continue
+            if self.path is None:
+                yield entry['start'], self._memory[i]
+            else:
+                with np.load(os.path.join(self.path, entry['file'])) as data:
+                    yield entry['start'], {name: data[name] for name in data.files}
+
+    def rows(self, start: int = 0) -> Iterator[Tuple]:
+        """Lignes des combats à partir de start, dans l'ordre des champs de SimulationResult"""
+        self.flush()
+        for first, chunk in self.chunks():
+            if first + len(chunk['turns']) <= start:
+                continue
+            columns = [chunk[name].tolist() for name in COMBAT_COLUMNS]
+            for i in range(max(0, start - first), len(columns[0])):
+                yield ("player" if columns[0][i] else "enemy",) + tuple(c[i] for c in columns[1:])
+
+    def card_rows(self, card_id: str) -> Iterator[Tuple[int, Chunk]]:
+        """Lignes d'une carte, bloc par bloc: (premier combat du bloc, colonnes de la carte)"""
+        self.flush()
+        for first, chunk in self.chunks(card_id):
+            code = int(np.searchsorted(chunk['cards'], card_id))
+            lo, hi = np.searchsorted(chunk['card'], [code, code + 1])
+            yield first, {name: chunk[name][lo:hi] for name in CARD_COLUMNS}
+
+    def chunk(self, index: int) -> Chunk:
+        """Colonnes du bloc index"""
+        if self.path is None:
+            return self._memory[index]
+        with np.load(os.path.join(self.path, self._manifest[index]['file'])) as data:
+            return {name: data[name] for name in data.files}
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def stale_combats(self, content_keys: Mapping[str, str]) -> Dict[int, Dict[int, Lineup]]:
+        """Combats joués avec une version périmée d'une carte.
+
+        content_keys donne l'empreinte actuelle des cartes suivies (id ->
+        content_key); les autres cartes sont ignorées. Rend, par bloc, les
+        participants des combats dont une carte avait une autre empreinte
+        (indexés par ligne dans le bloc). Seuls les blocs que l'index désigne
+        sont ouverts.
+        """
+        self.flush()
+        stale = {}
+        for index, entry in enumerate(self._manifest):
+            changed = {
+                card_id for card_id, keys in entry.get('templates', {}).items()
+                if card_id in content_keys and keys != [content_keys[card_id]]
+            }
+            if not changed:
+                continue
+
+            chunk = self.chunk(index)
+            templates = chunk['templates'].tolist()
+            tracked = np.array([card_id in changed for card_id in templates])
+            current = np.array([content_keys.get(card_id, '') for card_id in templates])
+            codes = chunk['lineup_card']
+            outdated = tracked[codes] & (chunk['lineup_key'] != current[codes])
+
+            # Participants triés par combat: ceux d'une ligne forment une tranche
+            lineup_rows = chunk['lineup_row']
+            lineups = {}
+            for row in np.unique(lineup_rows[outdated]).tolist():
+                lo, hi = np.searchsorted(lineup_rows, [row, row + 1])
+                ids = [templates[code] for code in codes[lo:hi].tolist()]
+                enemy = chunk['lineup_enemy'][lo:hi].tolist()
+                lineups[row] = Lineup(
+                    tuple(card_id for card_id, e in zip(ids, enemy) if not e),
+                    tuple(card_id for card_id, e in zip(ids, enemy) if e),
+                    int(chunk['seed'][row]), int(chunk['stream'][row])
+                )
+            stale[index] = lineups
+        return stale
+
+    def replace(self, index: int, combats: Mapping[int, Tuple]) -> Dict[str, CardAccumulator]:
+        """Remplace des combats du bloc index, sur place (mêmes lignes).
+
+        combats associe une ligne du bloc à (résultat, deck joueur, deck
+        ennemi, graine), comme append. Rend les agrégats par carte des
+        lignes remplacées, à retirer des agrégats en cache.
+        """
+        self.flush()
+        chunk = self.chunk(index)
+        rows = np.array(sorted(combats), dtype=np.int32)
+
+        removed: Dict[str, CardAccumulator] = {}
+        mask = np.isin(chunk['row'], rows)
+        names = chunk['cards'].tolist()
+        for code, won, survived, dealt, taken in zip(
+                *(chunk[name][mask].tolist() for name in CARD_COLUMNS[1:])):
+            removed.setdefault(names[code], CardAccumulator()).add(won, survived, dealt, taken)
+
+        buffered, cards, lineup = [], [], []
+        for row in rows.tolist():
+            combat, new_cards, new_lineup = _result_rows(row, *combats[row])
+            buffered.append(combat)
+            cards.extend(new_cards)
+            lineup.extend(new_lineup)
+        self._store(index, _splice(chunk, _chunk_from_rows(buffered, cards, lineup), rows))
+        return removed
+
+    def summary(self, start: int = 0) -> Dict[str, float]:
+        """Moyennes globales des combats à partir de start"""
+        self.flush()
+        count = 0
+        totals = dict.fromkeys(('wins', 'turns', 'player_damage', 'enemy_damage'), 0)
+        for first, chunk in self.chunks():
+            skip = max(0, start - first)
+            if skip >= len(chunk['turns']):
+                continue
+            count += len(chunk['turns']) - skip
+            totals['wins'] += int(np.count_nonzero(chunk['player_won'][skip:]))
+            totals['turns'] += int(chunk['turns'][skip:].sum(dtype=np.int64))
+            totals['player_damage'] += int(chunk['player_damage_dealt'][skip:].sum(dtype=np.int64))
+            totals['enemy_damage'] += int(chunk['enemy_damage_dealt'][skip:].sum(dtype=np.int64))
+
+        count = max(count, 1)
+        return {
+            'overall_win_rate': totals['wins'] / count,
+            'avg_turns': totals['turns'] / count,
+            'avg_player_damage': totals['player_damage'] / count,
+            'avg_enemy_damage': totals['enemy_damage'] / count,
+        }
+
+    def card_performance(self, start: int = 0) -> Dict[str, CardAccumulator]:
+        """Agrégats par carte des combats à partir de start, réduits bloc par bloc"""
+        self.flush()
+        performance: Dict[str, CardAccumulator] = {}
+        for first, chunk in self.chunks():
+            if first + len(chunk['turns']) <= start:
+                continue
+            mask = chunk['row'] >= start - first
+            codes = chunk['card'][mask]
+            size = len(chunk['cards'])
+
+            def count(selected: np.ndarray) -> np.ndarray:
+                return np.bincount(codes[selected], minlength=size)
+
+            def moments(name: str) -> Tuple[np.ndarray, np.ndarray]:
+                values = chunk[name][mask].astype(np.int64)
+                return (np.bincount(codes, values, size).astype(np.int64),
+                        np.bincount(codes, values * values, size).astype(np.int64))
+
+            played = np.bincount(codes, minlength=size)
+            wins = count(chunk['won'][mask])
+            survived = count(chunk['survived'][mask])
+            dealt, dealt_sq = moments('damage_dealt')
+            taken, taken_sq = moments('damage_taken')
+
+            for code in np.flatnonzero(played).tolist():
+                n = int(played[code])
+                performance.setdefault(str(chunk['cards'][code]), CardAccumulator()).merge(
+                    CardAccumulator(
+                        int(wins[code]), int(survived[code]),
+                        RunningStat(n, int(dealt[code]), int(dealt_sq[code])),
+                        RunningStat(n, int(taken[code]), int(taken_sq[code])),
+                    )
+                )
+        return performance
@@ -0,0 +1,209 @@
+# core/rng.py
+"""Flux aléatoires à compteur (Philox), adressés par (graine maîtresse, index, usage)"""
+
+from enum import IntEnum
+from typing import List, NamedTuple, Union
+import random
+
+import numpy as np
+
+
+MASK64 = (1 << 64) - 1
+
+# Mots de 64 bits générés d'un coup par un flux (multiple de 4: une sortie Philox)
+BLOCK = 64
+
+# Mot de 64 bits -> flottant de [0, 1[ (53 bits de poids fort, comme random.random)
+_TO_UNIT = 2.0 ** -53
+
+
+class Purpose(IntEnum):
+    """Usage d'un flux: les flux d'un même combat sont indépendants entre eux"""
+    COMBAT = 0  # Résolution: mélanges, départages d'initiative
+    DECK = 1  # Génération des decks du combat
+    REWARD = 2  # Récompenses de victoire
+
+
+class StreamAddress(NamedTuple):
+    """Adresse d'un flux: clé Philox (graine, usage) et mot haut du compteur (index)"""
+    seed: int
+    index: int
+    purpose: int
+
+
+# Générateur partagé: un flux ne garde que son adresse et sa position, chaque
+# bloc est recalculé en positionnant le compteur (pas d'état caché à copier)
+_PHILOX = np.random.Philox(key=[0, 0])
+_COUNTER = np.zeros(4, dtype=np.uint64)
+_KEY = np.zeros(2, dtype=np.uint64)
+_STATE = {
+    'bit_generator': 'Philox',
+    'state': {'counter': _COUNTER, 'key': _KEY},
+    'buffer': np.zeros(4, dtype=np.uint64),
+    'buffer_pos': 4,
+    'has_uint32': 0,
+    'uinteger': 0,
+}
+
+
+def _generate(address: StreamAddress, number: int) -> np.ndarray:
+    """Bloc number d'un flux: BLOCK mots de 64 bits"""
+    # Tableaux de l'état réutilisés: seul le compteur et la clé changent
+    _COUNTER[0] = number * (BLOCK // 4)
+    _COUNTER[3] = address.index
+    _KEY[0] = address.seed
+    _KEY[1] = address.purpose
+    _PHILOX.state = _STATE
+    return _PHILOX.random_raw(BLOCK)
+
+
+class PhiloxRandom(random.Random):
+    """random.Random sur un flux Philox.
+
+    Le flux (seed, index, purpose) ne dépend que de son adresse: le combat
+    index d'un lot se rejoue seul, sans tirer les graines des précédents, et
+    deux index ne se chevauchent jamais (contrairement à des graines tirées
+    au hasard). random() et getrandbits() consomment des mots de 64 bits
+    générés par blocs; shuffle, randint, choice... en dérivent comme pour
+    random.Random. block(n) rend d'un coup les n prochains random(), en
+    tableau NumPy, pour les moteurs vectorisés.
+    """
+
+    # Attributs en slots: accès plus rapides que par le __dict__ de random.Random
+    __slots__ = ('address', '_number', '_raw', '_words', '_pos')
+
+    def __new__(cls, *args, **kwargs):
+        # random.Random n'accepte qu'un argument de construction
+        return super().__new__(cls)
+
+    def __init__(self, seed: int = 0, index: int = 0, purpose: int = Purpose.COMBAT):
+        self.address = StreamAddress(seed & MASK64, index & MASK64, int(purpose))
+        super().__init__()
+
+    def seed(self, a=None, version: int = 2):
+        """Revient au début du flux (avec a entier: nouvelle graine maîtresse)"""
+        if isinstance(a, int):
+            self.address = self.address._replace(seed=a & MASK64)
+        self.gauss_next = None
+        self._load(0)
+
+    def _load(self, number: int):
+        self._number = number
+        self._raw = _generate(self.address, number)
+        self._words = self._raw.tolist()
+        self._pos = 0
+
+    def _next_word(self) -> int:
+        pos = self._pos
+        if pos == BLOCK:
+            self._load(self._number + 1)
+            pos = 0
+        self._pos = pos + 1
+        return self._words[pos]
+
+    def random(self) -> float:
+        return (self._next_word() >> 11) * _TO_UNIT
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("Le nombre de bits doit être positif")
+        words = -(-k // 64)
+        value = 0
+        for _ in range(words):
+            value = (value << 64) | self._next_word()
+        return value >> (words * 64 - k)
+
+    def block(self, n: int) -> np.ndarray:
+        """Les n prochains random(), d'un coup"""
+        parts = []
+        while n > 0:
+            if self._pos == BLOCK:
+                self._load(self._number + 1)
+            take = min(n, BLOCK - self._pos)
+            parts.append(self._raw[self._pos:self._pos + take])
+            self._pos += take
+            n -= take
+        raw = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint64)
+        return (raw >> np.uint64(11)) * _TO_UNIT
+
+    def skip(self, n: int):
+        """Avance le flux de n random() sans les calculer (seuls les blocs atteints sont générés)"""
+        number, pos = divmod(self._number * BLOCK + self._pos + n, BLOCK)
+        if number != self._number:
+            self._load(number)
+        self._pos = pos
+
+    def substream(self, purpose: int) -> 'PhiloxRandom':
+        """Flux du même combat pour un autre usage, depuis son début"""
+        return PhiloxRandom(self.address.seed, self.address.index, purpose)
+
+    def getstate(self):
+        return self.address, self._number, self._pos
+
+    def setstate(self, state):
+        address, number, pos = state
+        if address != self.address or number != self._number:
+            self.address = address
+            self._load(number)
+        self._pos = pos
+
+
+class RngStreams:
+    """Service de flux d'une graine maîtresse, adressés par (index, usage)"""
+
+    def __init__(self, seed: int):
+        self.seed = seed & MASK64
+
+    def stream(self, index: int, purpose: int = Purpose.COMBAT) -> PhiloxRandom:
+        return PhiloxRandom(self.seed, index, purpose)
+
+    def streams(self, start: int, count: int, purpose: int = Purpose.COMBAT) -> List[PhiloxRandom]:
+        """Flux des index start..start+count"""
+        return [PhiloxRandom(self.seed, index, purpose) for index in range(start, start + count)]
+
+
+def advance(rng: random.Random, n: int):
+    """Consomme n tirages random() (en O(1) pour un flux Philox)"""
+    if isinstance(rng, PhiloxRandom):
+        rng.skip(n)
+    else:
+        for _ in range(n):
+            rng.random()
+
+
+def as_random(seed: Union[int, random.Random, None]) -> random.Random:
+    """Générateur d'un combat: un flux (ou un random.Random) tel quel, sinon random.Random(seed)"""
+    return seed if isinstance(seed, random.Random) else random.Random(seed)
+
+
+def draw_block(rng: random.Random, n: int) -> np.ndarray:
+    """n tirages random() d'un coup (par blocs pour un flux Philox)"""
+    if isinstance(rng, PhiloxRandom):
+        return rng.block(n)
+    return np.array([rng.random() for _ in range(n)])
+
+
+def shuffle(rng: random.Random, items: list):
+    """Mélange en place: tri par clés tirées d'un bloc (une valeur par élément, rien pour 0 ou 1)"""
+    if len(items) > 1:
+        keys = draw_block(rng, len(items)).tolist()
+        items[:] = [items[i] for i in sorted(range(len(items)), key=keys.__getitem__)]
+
+
+def shuffle_many(rngs: List[random.Random], lists: List[list]):
+    """shuffle(rngs[i], lists[i]) pour chaque i, triés en un seul lexsort"""
+    lengths = [len(items) if len(items) > 1 else 0 for items in lists]
+    total = sum(lengths)
+    if not total:
+        return
+    keys = np.concatenate([draw_block(rng, n) for rng, n in zip(rngs, lengths) if n])
+    segment = np.repeat(np.arange(len(lists)), lengths)
+    order = np.lexsort((keys, segment)).tolist()
+
+    flat = [card for items, n in zip(lists, lengths) if n for card in items]
+    start = 0
+    for items, n in zip(lists, lengths):
+        if n:
+            items[:] = [flat[i] for i in order[start:start + n]]
+            start += n
+
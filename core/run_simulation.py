@@ -0,0 +1,378 @@
+# core/run_simulation.py
+"""Simulation de runs complètes - actes, nœuds et attrition permanente d'un combat à l'autre"""
+
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import random
+
+from entities import Biome, Card, CardDatabase, Rarity, RunState
+from progression import (
+    ActMap, AlchemySystem, EventSystem, MapGenerator, MapNode, MerchantSystem, NodeType
+)
+from balance import CombatSimulator
+from policies import PlayPolicy
+from rng import PhiloxRandom
+
+
+# Biomes tirés pour les actes (le neutre n'a pas de carte d'acte)
+ACT_BIOMES = (Biome.FORET, Biome.DUNES, Biome.FALAISES, Biome.FLEUVE, Biome.VOLCAN, Biome.RUINES)
+
+# Profondeur d'un acte de MapGenerator.generate_act: départ, 3 niveaux, boss
+LEVELS_PER_ACT = 5
+
+COMBAT_NODES = (NodeType.COMBAT, NodeType.ELITE, NodeType.BOSS)
+
+
+class PathPolicy:
+    """Choisit le prochain nœud d'une run parmi les chemins disponibles"""
+
+    def choose(self, act_map: ActMap, options: List[int], run: RunState, rng: random.Random) -> int:
+        raise NotImplementedError
+
+
+class RandomPath(PathPolicy):
+    """Chemin uniforme"""
+
+    def choose(self, act_map: ActMap, options: List[int], run: RunState, rng: random.Random) -> int:
+        return rng.choice(options)
+
+
+class PreferredPath(PathPolicy):
+    """Prend le type de nœud le mieux classé (égalités au hasard, types absents en dernier)"""
+
+    def __init__(self, priorities: Sequence[NodeType]):
+        self.rank = {node_type: i for i, node_type in enumerate(priorities)}
+
+    def choose(self, act_map: ActMap, options: List[int], run: RunState, rng: random.Random) -> int:
+        def rank(node_id: int) -> int:
+            return self.rank.get(act_map.nodes[node_id].node_type, len(self.rank))
+
+        best = min(rank(node_id) for node_id in options)
+        return rng.choice([node_id for node_id in options if rank(node_id) == best])
+
+
+# Évite les élites et cherche les nœuds sans combat
+CAUTIOUS_PATH = PreferredPath([NodeType.REST, NodeType.SANCTUARY, NodeType.MERCHANT, NodeType.EVENT,
+                               NodeType.ALCHEMY, NodeType.TREASURE, NodeType.COMBAT, NodeType.ELITE])
+# Cherche les élites (récompenses) puis les combats
+AGGRESSIVE_PATH = PreferredPath([NodeType.ELITE, NodeType.COMBAT, NodeType.ALCHEMY,
+                                 NodeType.MERCHANT, NodeType.EVENT])
+
+
+@dataclass
+class RunResult:
+    """Bilan d'une run"""
+    victory: bool
+    acts_cleared: int
+    levels_survived: int  # Nœuds traversés, tous actes confondus
+    combats_won: int
+    cards_lost: int
+    final_deck_size: int
+    fragments: int
+    death_node: Optional[str] = None  # Type du nœud fatal
+
+
+@dataclass
+class RunReport:
+    """Agrégats d'un lot de runs"""
+    runs: int
+    victory_rate: float
+    survival: Dict[int, List[float]]  # Acte -> part des runs en vie après chaque niveau
+    avg_deck_size: Dict[int, float]  # Acte -> taille moyenne du deck des survivants en fin d'acte
+    deaths_by_node: Dict[str, int]
+    results: List[RunResult] = field(default_factory=list)
+
+    def survival_curve(self) -> List[float]:
+        """Survie après chaque nœud, actes bout à bout"""
+        return [rate for act in sorted(self.survival) for rate in self.survival[act]]
+
+
+class _Run:
+    """Run en cours: état persistant, RNG propre et compteurs"""
+    __slots__ = ('state', 'rng', 'act_map', 'biome', 'alive', 'combats_won', 'cards_lost',
+                 'levels', 'death_node')
+
+    def __init__(self, deck: List[Card], seed: int):
+        self.state = RunState(current_deck=deck)
+        self.rng = random.Random(seed)
+        self.act_map: Optional[ActMap] = None
+        self.biome: Optional[Biome] = None
+        self.alive = True
+        self.combats_won = 0
+        self.cards_lost = 0
+        self.levels = 0
+        self.death_node: Optional[str] = None
+
+    def bury(self) -> int:
+        """Retire du deck les cartes à 0 DUR (mort permanente), retourne leur nombre"""
+        deck = self.state.current_deck
+        survivors = [card for card in deck if card.current_dur > 0]
+        lost = len(deck) - len(survivors)
+        if lost:
+            self.state.current_deck = survivors
+            self.cards_lost += lost
+        return lost
+
+    def die(self, node: MapNode):
+        self.alive = False
+        self.death_node = node.node_type.value
+
+
+class RunSimulator:
+    """Joue des runs complètes sans interface, en parallèle.
+
+    Les runs avancent en lockstep, niveau par niveau (tous les actes de
+    MapGenerator ont la même profondeur): les nœuds sans combat sont
+    traités run par run, puis tous les combats du niveau sont résolus
+    ensemble par CombatSimulator.simulate_combat_batch (moteur vectorisé si
+    la politique de jeu le permet). Le RunState de chaque run est conservé
+    de nœud en nœud: dégâts, statuts, cartes mortes, ressources.
+
+    Une run meurt sur un combat perdu ou un deck vide. Chaque run tire tout
+    (carte, chemin, graines de combat) dans son propre RNG: le résultat ne
+    dépend ni de batch_size ni du nombre de processus.
+    """
+
+    def __init__(self, card_db: Optional[CardDatabase] = None, seed: Optional[int] = None,
+                 path_policy: Optional[PathPolicy] = None, play_policy: Optional[PlayPolicy] = None,
+                 acts: int = 3, max_turns: int = 20, batch_size: int = 256,
+                 deck_factory: Optional[Callable[[CardDatabase, random.Random], List[Card]]] = None):
+        self.card_db = card_db or CardDatabase()
+        self.rng = random.Random(seed)
+        self.path_policy = path_policy or RandomPath()
+        self.play_policy = play_policy
+        self.acts = acts
+        self.max_turns = max_turns
+        self.batch_size = batch_size
+        self.deck_factory = deck_factory
+
+        self.combat = CombatSimulator(policy=play_policy)
+        self.merchant = MerchantSystem(self.card_db)
+        self.alchemy = AlchemySystem(self.card_db)
+
+    def simulate(self, count: int, workers: Optional[int] = None) -> RunReport:
+        """Joue count runs et agrège les courbes de survie par acte.
+
+        Avec workers, les runs sont découpées en tranches jouées dans un pool
+        de processus (deck_factory et les politiques doivent être picklables).
+        """
+        seeds = [self.rng.getrandbits(64) for _ in range(count)]
+
+        if workers and workers > 1:
+            shard_size = max(1, -(-count // (workers * 4)))
+            config = (self.card_db.path, self.path_policy, self.play_policy, self.acts,
+                      self.max_turns, self.batch_size, self.deck_factory)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shards = [pool.submit(_simulate_run_shard, config, seeds[start:start + shard_size])
+                          for start in range(0, count, shard_size)]
+                parts = [shard.result() for shard in shards]
+        else:
+            parts = [self.simulate_runs(seeds)]
+
+        results = [result for part_results, _, _ in parts for result in part_results]
+        alive = [[sum(part[1][act][level] for part in parts) for level in range(LEVELS_PER_ACT)]
+                 for act in range(self.acts)]
+        deck_sizes = [sum(part[2][act] for part in parts) for act in range(self.acts)]
+
+        deaths: Dict[str, int] = {}
+        for result in results:
+            if result.death_node:
+                deaths[result.death_node] = deaths.get(result.death_node, 0) + 1
+
+        return RunReport(
+            runs=count,
+            victory_rate=sum(r.victory for r in results) / count if count else 0.0,
+            survival={act + 1: [n / count for n in alive[act]] for act in range(self.acts)} if count else {},
+            avg_deck_size={act + 1: deck_sizes[act] / alive[act][-1]
+                           for act in range(self.acts) if alive[act][-1]},
+            deaths_by_node=deaths,
+            results=results,
+        )
+
+    def simulate_runs(self, seeds: List[int]) -> Tuple[List[RunResult], List[List[int]], List[int]]:
+        """Joue une run par graine: (résultats, survivants par acte et niveau, cartes des survivants par acte)"""
+        runs = []
+        for seed in seeds:
+            rng = random.Random(seed)
+            deck = (self.deck_factory(self.card_db, rng) if self.deck_factory
+                    else self.card_db.get_starter_deck())
+            runs.append(_Run(deck, rng.getrandbits(64)))
+
+        alive_counts = [[0] * LEVELS_PER_ACT for _ in range(self.acts)]
+        deck_totals = [0] * self.acts
+        for act in range(1, self.acts + 1):
+            for run in runs:
+                if run.alive:
+                    self._start_act(run, act)
+
+            for level in range(LEVELS_PER_ACT):
+                self._play_level(runs, act, level)
+                alive_counts[act - 1][level] = sum(run.alive for run in runs)
+
+            deck_totals[act - 1] = sum(len(run.state.current_deck) for run in runs if run.alive)
+
+        results = [
+            RunResult(
+                victory=run.alive,
+                acts_cleared=run.levels // LEVELS_PER_ACT,
+                levels_survived=run.levels,
+                combats_won=run.combats_won,
+                cards_lost=run.cards_lost,
+                final_deck_size=len(run.state.current_deck),
+                fragments=run.state.fragments,
+                death_node=run.death_node,
+            )
+            for run in runs
+        ]
+        return results, alive_counts, deck_totals
+
+    # ------------------------------------------------------------------
+    # Progression
+    # ------------------------------------------------------------------
+
+    def _start_act(self, run: _Run, act: int):
+        run.biome = run.rng.choice(ACT_BIOMES)
+        run.act_map = MapGenerator(seed=run.rng.getrandbits(32)).generate_act(act, run.biome)
+        run.state.current_act = act
+        run.state.current_node = 0
+
+    def _play_level(self, runs: List[_Run], act: int, level: int):
+        """Un niveau pour toutes les runs en vie: nœuds, combats groupés, transition"""
+        fights: List[Tuple[_Run, MapNode, List[Card]]] = []
+        for run in runs:
+            if not run.alive:
+                continue
+            node = self._advance(run, level)
+            enemies = self._visit(run, node, act)
+            if enemies:
+                fights.append((run, node, enemies))
+
+        for start in range(0, len(fights), self.batch_size):
+            chunk = fights[start:start + self.batch_size]
+            matchups = [(list(run.state.current_deck), enemies) for run, _, enemies in chunk]
+            # Un flux Philox par combat, clé 64 bits tirée du RNG de la run
+            seeds = [PhiloxRandom(run.rng.getrandbits(64)) for run, _, _ in chunk]
+            results = self.combat.simulate_combat_batch(matchups, self.max_turns, seeds)
+            for (run, node, _), result in zip(chunk, results):
+                run.bury()
+                if result.winner != "player":
+                    run.die(node)
+                else:
+                    run.combats_won += 1
+                    self._combat_rewards(run, node, act)
+
+        for run in runs:
+            if run.alive:
+                self._node_transition(run, act)
+
+    def _advance(self, run: _Run, level: int) -> MapNode:
+        """Choisit et marque le nœud du niveau"""
+        act_map = run.act_map
+        if level:
+            options = act_map.get_available_paths()
+            act_map.current_node = self.path_policy.choose(act_map, options, run.state, run.rng)
+        node = act_map.nodes[act_map.current_node]
+        node.visited = True
+        act_map.reveal_connected_nodes()
+        run.state.current_node = node.id
+        run.state.visited_nodes.append(node.node_type.value)
+        return node
+
+    def _node_transition(self, run: _Run, act: int):
+        """Érosion entre deux nœuds, puis fin de run si le deck est vide"""
+        for card in run.state.current_deck:
+            card.process_node_transition()
+        run.bury()
+        run.levels += 1
+        if not run.state.current_deck:
+            run.die(run.act_map.nodes[run.act_map.current_node])
+
+    # ------------------------------------------------------------------
+    # Nœuds
+    # ------------------------------------------------------------------
+
+    def _visit(self, run: _Run, node: MapNode, act: int) -> List[Card]:
+        """Applique un nœud sans combat; retourne les ennemis s'il faut combattre"""
+        if node.node_type in COMBAT_NODES:
+            # Le nœud de départ n'a pas de pool: deux ennemis du biome
+            pool = node.enemy_pool or ["", ""]
+            return self._enemies(run, pool, act + (node.node_type != NodeType.COMBAT))
+        if node.node_type == NodeType.EVENT:
+            return self._event(run, act)
+        if node.node_type == NodeType.MERCHANT:
+            self._shop(run, act)
+        elif node.node_type == NodeType.ALCHEMY:
+            self._fuse(run)
+        elif node.node_type == NodeType.TREASURE:
+            run.state.fragments += run.rng.randint(20, 40)
+        # Repos et sanctuaire: pas de soin, l'attrition est permanente
+        return []
+
+    def _enemies(self, run: _Run, pool: List[str], act: int) -> List[Card]:
+        """Ennemis d'un nœud: cartes du catalogue, ou tirées dans le biome à défaut"""
+        enemies = []
+        for card_id in pool:
+            if card_id in self.card_db.templates:
+                enemies.append(self.card_db.create_card(card_id))
+            else:
+                template = self.card_db.sampler.draw(run.rng, "reward", act, run.biome)
+                if template is not None:
+                    enemies.append(template.instantiate())
+        return enemies
+
+    def _event(self, run: _Run, act: int) -> List[Card]:
+        """Événement au hasard, choix au hasard (un combat forcé devient une élite)"""
+        events = EventSystem(self.card_db, run.rng)
+        event_id = run.rng.choice(list(events.events))
+        choice = run.rng.randrange(len(events.events[event_id]["choices"]))
+        effect = events.events[event_id]["choices"][choice]["effect"]
+        outcome = events.process_event(event_id, choice, run.state)
+        if outcome.get("force_combat") or effect == "surprise_elite":
+            return self._enemies(run, [""], act + 1)
+        return []
+
+    def _shop(self, run: _Run, act: int):
+        """Achète au hasard une carte abordable"""
+        deck_ids = {card.id for card in run.state.current_deck}
+        shop = self.merchant.generate_shop(act, run.biome, run.rng, exclude=deck_ids)
+        affordable = [entry for entry in shop["cards"] if entry["price"] <= run.state.fragments]
+        if affordable:
+            entry = run.rng.choice(affordable)
+            run.state.fragments -= entry["price"]
+            run.state.current_deck.append(self.card_db.create_card(entry["card_id"]))
+
+    def _fuse(self, run: _Run):
+        """Fusionne les deux cartes les plus abîmées si les gènes le permettent"""
+        deck = run.state.current_deck
+        candidates = sorted((card for card in deck if card.rarity != Rarity.LEGENDARY),
+                            key=lambda card: card.current_dur)
+        if len(candidates) < 2 or not self.alchemy.can_fuse(candidates[0], candidates[1], run.state.genes):
+            return
+        first, second = candidates[0], candidates[1]
+        fused = self.alchemy.fuse_cards(first, second, run.rng)
+        run.state.genes -= 1
+        run.state.current_deck = [card for card in deck if card is not first and card is not second]
+        run.state.current_deck.append(fused)
+
+    def _combat_rewards(self, run: _Run, node: MapNode, act: int):
+        """Récompenses d'une victoire (mêmes chances que CombatResolver._calculate_rewards)"""
+        rewards = {'fragments': run.rng.randint(10, 30), 'eggs': 0,
+                   'genes': int(node.node_type != NodeType.COMBAT)}
+        if run.rng.random() < 0.3:
+            template = self.card_db.sampler.draw(run.rng, "reward", act, run.biome)
+            if template is not None:
+                run.state.current_deck.append(template.instantiate())
+        if run.rng.random() < 0.1:
+            rewards['eggs'] = 1
+        run.state.process_node_rewards(rewards)
+
+
+def _simulate_run_shard(config: Tuple, seeds: List[int]):
+    """Tâche d'un processus: une tranche de runs"""
+    path, path_policy, play_policy, acts, max_turns, batch_size, deck_factory = config
+    simulator = RunSimulator(CardDatabase(Path(path) if path else None), path_policy=path_policy,
+                             play_policy=play_policy, acts=acts, max_turns=max_turns,
+                             batch_size=batch_size, deck_factory=deck_factory)
+    return simulator.simulate_runs(seeds)
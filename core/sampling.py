@@ -0,0 +1,170 @@
+# core/sampling.py
+"""Tirage pondéré de cartes pour les récompenses, le marchand et les événements"""
+
+from itertools import accumulate
+from bisect import bisect_right
+from typing import Collection, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+import random
+
+from entities import Biome, Rarity, CardTemplate
+from catalog import CardCatalog, load_catalog
+
+
+T = TypeVar('T')
+
+# Poids de rareté par usage et par acte (au-delà du dernier acte, on garde le dernier)
+RARITY_WEIGHTS: Dict[str, Dict[int, Dict[Rarity, float]]] = {
+    "shop": {
+        1: {Rarity.COMMON: 60, Rarity.UNCOMMON: 35, Rarity.RARE: 5},
+        2: {Rarity.COMMON: 30, Rarity.UNCOMMON: 50, Rarity.RARE: 18, Rarity.EPIC: 2},
+        3: {Rarity.UNCOMMON: 30, Rarity.RARE: 50, Rarity.EPIC: 18, Rarity.LEGENDARY: 2},
+    },
+    "event": {
+        1: {Rarity.COMMON: 2, Rarity.UNCOMMON: 1},
+        2: {Rarity.COMMON: 2, Rarity.UNCOMMON: 1, Rarity.RARE: 1},
+        3: {Rarity.COMMON: 2, Rarity.UNCOMMON: 1, Rarity.RARE: 1, Rarity.EPIC: 1},
+    },
+    "reward": {
+        1: {Rarity.COMMON: 70, Rarity.UNCOMMON: 25, Rarity.RARE: 5},
+        2: {Rarity.COMMON: 45, Rarity.UNCOMMON: 35, Rarity.RARE: 17, Rarity.EPIC: 3},
+        3: {Rarity.COMMON: 25, Rarity.UNCOMMON: 35, Rarity.RARE: 28, Rarity.EPIC: 10,
+            Rarity.LEGENDARY: 2},
+    },
+}
+
+# Tirages rejetés (carte exclue) avant de basculer sur un tirage exact
+MAX_REJECTIONS = 16
+
+
+class AliasTable(Generic[T]):
+    """Table d'alias (méthode de Vose): tirage pondéré en O(1).
+
+    Garde aussi les poids cumulés pour le tirage exact par bisect quand
+    trop de candidats sont exclus pour que le rejet reste efficace.
+    """
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        if len(items) != len(weights) or not items:
+            raise ValueError("Il faut au moins un élément et un poids par élément")
+
+        self.items = tuple(items)
+        self.cumulative = list(accumulate(weights))
+        n = len(self.items)
+        total = self.cumulative[-1]
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw(self, rng: random.Random) -> T:
+        """Un tirage (une seule valeur aléatoire consommée)"""
+        u = rng.random() * len(self.items)
+        i = int(u)
+        return self.items[i if u - i < self.prob[i] else self.alias[i]]
+
+    def draw_exact(self, rng: random.Random, allowed: List[int]) -> T:
+        """Tirage restreint aux indices autorisés, par bisect sur les poids cumulés"""
+        cumulative = self.cumulative
+        weights = [cumulative[i] - (cumulative[i - 1] if i else 0.0) for i in allowed]
+        partial = list(accumulate(weights))
+        k = bisect_right(partial, rng.random() * partial[-1])
+        return self.items[allowed[min(k, len(allowed) - 1)]]
+
+
+class CardSampler:
+    """Service de tirage de cartes du catalogue.
+
+    Une table d'alias par (usage, acte, biome), construite au premier tirage
+    puis réutilisée. Le pool d'un biome inclut les cartes neutres; chaque
+    carte pèse le poids de sa rareté divisé par la taille de son groupe
+    (biome, rareté), de sorte que les raretés gardent leurs proportions.
+    """
+
+    def __init__(self, catalog: CardCatalog,
+                 rarity_weights: Dict[str, Dict[int, Dict[Rarity, float]]] = RARITY_WEIGHTS):
+        self.catalog = catalog
+        self.rarity_weights = rarity_weights
+        self._tables: Dict[Tuple[str, int, Optional[Biome]], Optional[AliasTable]] = {}
+
+    def table(self, usage: str, act: int, biome: Optional[Biome] = None) -> Optional[AliasTable]:
+        """Table d'alias d'un (usage, acte, biome), None si le pool est vide"""
+        acts = self.rarity_weights[usage]
+        act = max(1, min(act, max(acts)))
+        key = (usage, act, biome)
+        if key not in self._tables:
+            self._tables[key] = self._build_table(acts[act], biome)
+        return self._tables[key]
+
+    def _build_table(self, weights: Dict[Rarity, float],
+                     biome: Optional[Biome]) -> Optional[AliasTable]:
+        biomes = [biome] if biome in (None, Biome.NEUTRE) else [biome, Biome.NEUTRE]
+        items: List[CardTemplate] = []
+        item_weights: List[float] = []
+        for rarity, weight in weights.items():
+            bucket = [t for b in biomes for t in self.catalog.query(biome=b, rarity=rarity)]
+            if not bucket:
+                continue
+            items.extend(bucket)
+            item_weights.extend([weight / len(bucket)] * len(bucket))
+        return AliasTable(items, item_weights) if items else None
+
+    def draw(self, rng: random.Random, usage: str, act: int, biome: Optional[Biome] = None,
+             exclude: Collection[str] = ()) -> Optional[CardTemplate]:
+        """Une carte, hors des identifiants exclus (None si tout est exclu)"""
+        drawn = self.draw_many(rng, 1, usage, act, biome, exclude)
+        return drawn[0] if drawn else None
+
+    def draw_many(self, rng: random.Random, count: int, usage: str, act: int,
+                  biome: Optional[Biome] = None, exclude: Collection[str] = (),
+                  unique: bool = True) -> List[CardTemplate]:
+        """Plusieurs cartes hors des identifiants exclus (ex: deck, cartes verrouillées).
+
+        Avec unique, une carte tirée est exclue des tirages suivants. Peut
+        retourner moins de count cartes si le pool est épuisé.
+        """
+        table = self.table(usage, act, biome)
+        if table is None:
+            return []
+
+        taken: set = set()
+        drawn = []
+        for _ in range(count):
+            template = None
+            for _ in range(MAX_REJECTIONS):
+                candidate = table.draw(rng)
+                if candidate.id not in exclude and candidate.id not in taken:
+                    template = candidate
+                    break
+            else:
+                allowed = [i for i, t in enumerate(table.items)
+                           if t.id not in exclude and t.id not in taken]
+                if not allowed:
+                    break
+                template = table.draw_exact(rng, allowed)
+
+            drawn.append(template)
+            if unique:
+                taken.add(template.id)
+        return drawn
+
+
+_default_sampler: Optional[CardSampler] = None
+
+
+def default_sampler() -> CardSampler:
+    """Service partagé sur le catalogue par défaut (chargé au premier appel)"""
+    global _default_sampler
+    if _default_sampler is None:
+        _default_sampler = CardSampler(load_catalog())
+    return _default_sampler
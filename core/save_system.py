@@ -12,14 +12,14 @@ from datetime import datetime
 import hashlib
 import os
 
-from entities import RunState, Card, CombatState, Biome, Rarity, StatusEffect, Keyword
+from entities import RunState, Card, Biome
 from progression import ActMap, MapNode, NodeType
 
 
 class SaveVersion:
     """Gestion des versions de sauvegarde"""
-    CURRENT = "1.0.0"
-    COMPATIBLE = ["1.0.0", "0.9.0"]  # Versions compatibles
+    CURRENT = "1.1.0"  # Cartes sauvegardées en écart à leur modèle
+    COMPATIBLE = ["1.1.0", "1.0.0", "0.9.0"]  # Versions compatibles
 
 
 @dataclass
@@ -288,66 +288,12 @@ class SaveManager:
         return run_state
 
     def _serialize_card(self, card: Card) -> Dict:
-        """Sérialise une carte avec son état permanent"""
-        return {
-            'id': card.id,
-            'name': card.name,
-            'biome': card.biome.value,
-            'rarity': card.rarity.value,
-            'cost': card.cost,
-            'base_stats': {
-                'atk': card.base_atk,
-                'dur': card.base_dur,
-                'spd': card.base_spd
-            },
-            'current_stats': {
-                'atk': card.current_atk,
-                'dur': card.current_dur,
-                'spd': card.current_spd
-            },
-            'shields': card.shields,
-            'keywords': [k.name for k in card.keywords],
-            'statuses': {s.value: v for s, v in card.permanent_statuses.items()},
-            'on_deploy': card.on_deploy,
-            'on_attack': card.on_attack,
-            'on_hit': card.on_hit,
-            'on_death': card.on_death
-        }
+        """Sérialise une carte: id de son modèle et écart à celui-ci"""
+        return card.to_dict()
 
     def _deserialize_card(self, data: Dict) -> Card:
-        """Désérialise une carte"""
-        card = Card(
-            id=data['id'],
-            name=data['name'],
-            biome=Biome(data['biome']),
-            rarity=Rarity(data['rarity']),
-            cost=data['cost'],
-            base_atk=data['base_stats']['atk'],
-            base_dur=data['base_stats']['dur'],
-            base_spd=data['base_stats']['spd']
-        )
-
-        # Restaurer l'état actuel
-        card.current_atk = data['current_stats']['atk']
-        card.current_dur = data['current_stats']['dur']
-        card.current_spd = data['current_stats']['spd']
-        card.shields = data.get('shields', 0)
-
-        # Keywords
-        for k_name in data.get('keywords', []):
-            card.keywords.add(Keyword[k_name])
-
-        # Statuts permanents
-        for status_name, value in data.get('statuses', {}).items():
-            card.permanent_statuses[StatusEffect(status_name)] = value
-
-        # Capacités
-        card.on_deploy = data.get('on_deploy', [])
-        card.on_attack = data.get('on_attack', [])
-        card.on_hit = data.get('on_hit', [])
-        card.on_death = data.get('on_death', [])
-
-        return card
+        """Désérialise une carte (formats 1.1 et antérieurs)"""
+        return Card.from_dict(data)
 
     def _serialize_map(self, act_map: ActMap) -> Dict:
         """Sérialise une carte d'acte"""
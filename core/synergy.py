@@ -0,0 +1,107 @@
+# core/synergy.py
+"""Matrice de synergies carte x carte, mise à jour par paquets de combats"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from accumulators import Z_95
+
+
+class SynergyMatrix:
+    """Co-occurrences des cartes dans les decks joueurs: parties et victoires.
+
+    plays[i, j] compte les combats dont le deck contient les cartes i et j
+    (plays[i, i]: ceux qui contiennent i), wins[i, j] ceux qui ont été
+    gagnés. Un paquet de combats est ajouté d'un coup: avec X la matrice de
+    présence (combats x cartes), plays += XᵀX et wins += X_gᵀX_g sur les
+    combats gagnés. Les cartes reçoivent un indice à leur première
+    apparition; la matrice s'agrandit par doublement.
+    """
+
+    def __init__(self, card_ids: Iterable[str] = (), capacity: int = 128):
+        self.index: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.plays = np.zeros((capacity, capacity), dtype=np.int64)
+        self.wins = np.zeros((capacity, capacity), dtype=np.int64)
+        self.combats = 0
+        self.victories = 0
+        for card_id in card_ids:
+            self._code(card_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _code(self, card_id: str) -> int:
+        code = self.index.get(card_id)
+        if code is None:
+            code = len(self.ids)
+            if code == len(self.plays):
+                self._grow(2 * code or 1)
+            self.index[card_id] = code
+            self.ids.append(card_id)
+        return code
+
+    def _grow(self, capacity: int):
+        for name in ('plays', 'wins'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, capacity), dtype=np.int64)
+            new[:len(old), :len(old)] = old
+            setattr(self, name, new)
+
+    def add_batch(self, decks: Sequence[Iterable[str]], won: Sequence[bool]):
+        """Ajoute des combats: identifiants des cartes du deck joueur et victoire"""
+        rows, cols = [], []
+        for row, deck in enumerate(decks):
+            for card_id in deck:
+                rows.append(row)
+                cols.append(self._code(card_id))
+
+        n = len(self.ids)
+        presence = np.zeros((len(decks), n))
+        presence[rows, cols] = 1.0  # Les doublons d'un deck comptent une fois
+        victory = np.asarray(won, dtype=bool)
+        # Produits en flottants (BLAS), exacts tant que les comptes restent sous 2**53
+        self.plays[:n, :n] += (presence.T @ presence).astype(np.int64)
+        self.wins[:n, :n] += (presence[victory].T @ presence[victory]).astype(np.int64)
+        self.combats += len(decks)
+        self.victories += int(victory.sum())
+
+    def merge(self, other: 'SynergyMatrix'):
+        """Ajoute les combats d'une autre matrice (ex: celle d'un processus)"""
+        codes = np.array([self._code(card_id) for card_id in other.ids], dtype=np.intp)
+        m = len(other.ids)
+        block = np.ix_(codes, codes)
+        self.plays[block] += other.plays[:m, :m]
+        self.wins[block] += other.wins[:m, :m]
+        self.combats += other.combats
+        self.victories += other.victories
+
+    def scores(self, min_plays: int = 30, z: float = Z_95) -> Dict[Tuple[str, str], float]:
+        """Synergies significatives des paires de cartes.
+
+        La synergie d'une paire est l'écart entre son taux de victoire et
+        celui attendu si les effets des deux cartes s'additionnaient:
+        p(a) + p(b) - p(tous). Seules les paires jouées au moins min_plays
+        fois dont l'écart dépasse z erreurs-types (test binomial sous
+        l'attendu) sont rendues, avec a avant b dans l'ordre d'apparition.
+        """
+        n = len(self.ids)
+        if not n or not self.combats:
+            return {}
+
+        plays = self.plays[:n, :n].astype(float)
+        wins = self.wins[:n, :n].astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = wins / plays
+            single = np.diagonal(rate)
+            expected = np.clip(single[:, None] + single[None, :] - self.victories / self.combats,
+                               1e-6, 1 - 1e-6)
+            deviation = (rate - expected) / np.sqrt(expected * (1 - expected) / plays)
+
+        mask = np.triu(plays >= max(min_plays, 1), k=1) & (np.abs(deviation) >= z)
+        synergy = rate - expected
+        return {
+            (self.ids[i], self.ids[j]): float(synergy[i, j])
+            for i, j in zip(*np.nonzero(mask))
+        }
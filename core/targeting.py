@@ -0,0 +1,52 @@
+# core/targeting.py
+"""Tables de ciblage précalculées - une recherche par attaque au lieu d'un parcours du terrain"""
+
+from typing import List, Tuple
+
+
+FIELD_SIZE = 6
+
+# Drapeaux de ciblage de l'attaquant
+PIERCE = 1  # Percée et la créature en face porte des boucliers
+FLAG_COUNT = 2
+
+# Ordre de recherche standard: la ligne avant vise d'abord la ligne avant,
+# la ligne arrière vise d'abord la ligne arrière
+FRONT_ORDER = (0, 1, 2, 3, 4, 5)
+BACK_ORDER = (3, 4, 5, 0, 1, 2)
+
+
+def target_index(position: int, occupancy: int, flags: int = 0) -> int:
+    """Indice dans TARGET_TABLE d'un (position de l'attaquant, terrain adverse, drapeaux)"""
+    return ((flags * FIELD_SIZE + position) << FIELD_SIZE) | occupancy
+
+
+def resolve_target(position: int, occupancy: int, flags: int = 0) -> int:
+    """Emplacement visé sur le terrain adverse (-1 si vide), règles de CombatResolver.
+
+    occupancy: bit i = emplacement adverse i occupé. Avec PIERCE, l'attaque
+    passe à l'arrière de la colonne si cet emplacement est occupé.
+    """
+    if flags & PIERCE:
+        back = position % 3 + 3
+        if occupancy >> back & 1:
+            return back
+
+    for slot in (FRONT_ORDER if position < 3 else BACK_ORDER):
+        if occupancy >> slot & 1:
+            return slot
+    return -1
+
+
+def build_target_table() -> Tuple[int, ...]:
+    """Toutes les cibles, indexées par target_index()"""
+    table: List[int] = [-1] * (FLAG_COUNT * FIELD_SIZE << FIELD_SIZE)
+    for flags in range(FLAG_COUNT):
+        for position in range(FIELD_SIZE):
+            for occupancy in range(1 << FIELD_SIZE):
+                table[target_index(position, occupancy, flags)] = \
+                    resolve_target(position, occupancy, flags)
+    return tuple(table)
+
+
+TARGET_TABLE = build_target_table()
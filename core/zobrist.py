@@ -0,0 +1,171 @@
+# core/zobrist.py
+"""Hachage de Zobrist des combats et table de transposition bornée"""
+
+from enum import IntEnum
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+MASK64 = (1 << 64) - 1
+
+
+class Feature(IntEnum):
+    """Caractéristiques hachées d'une carte posée (STATUS + indice pour un statut)"""
+    TEMPLATE = 0
+    KEYWORDS = 1
+    DUR = 2
+    ATK = 3
+    SPD = 4
+    SHIELDS = 5
+    TURN = 6  # Caractéristiques du combat (emplacement -1)
+    ENERGY = 7
+    STATUS = 8
+
+
+def _splitmix64(x: int) -> int:
+    """Mélange 64 bits déterministe (SplitMix64)"""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+# (emplacement, caractéristique, valeur) -> clé aléatoire, générée au premier usage
+_KEYS: Dict[Tuple[int, int, int], int] = {}
+
+
+def feature_key(square: int, feature: int, value: int) -> int:
+    """Clé d'une caractéristique sur un emplacement (0-5 ennemi, 6-11 joueur).
+
+    Les clés sont dérivées de leurs coordonnées: identiques d'un processus à
+    l'autre, elles ne dépendent pas de l'ordre dans lequel on les demande.
+    Une valeur nulle a la clé 0: une carte sans bouclier ni statut ne paie
+    que ses caractéristiques non nulles.
+    """
+    key = _KEYS.get((square, feature, value))
+    if key is None:
+        key = _splitmix64(_splitmix64((square + 1) << 8 | feature) ^ (value & MASK64)) if value else 0
+        _KEYS[(square, feature, value)] = key
+    return key
+
+
+# id de modèle -> clé (les modèles dérivés et les copies partagent la leur)
+_TEMPLATE_KEYS: Dict[str, int] = {}
+
+
+def template_key(template: Any) -> int:
+    """Identifiant 64 bits d'un modèle de carte, tiré de son id.
+
+    Un modèle dérivé (derive) garde la clé de son original: une capacité
+    modifiée sur une carte déjà posée ne désynchronise pas le hash.
+    """
+    key = _TEMPLATE_KEYS.get(template.id)
+    if key is None:
+        digest = blake2b(template.id.encode(), digest_size=8).digest()
+        key = _TEMPLATE_KEYS[template.id] = int.from_bytes(digest, 'little')
+    return key
+
+
+def card_hash(card: Any, square: int) -> int:
+    """Contribution d'une carte posée au hash du terrain"""
+    get = _KEYS.get
+    h = 0
+    # Caractéristiques TEMPLATE à SHIELDS, dans l'ordre de Feature
+    for feature, value in enumerate((card.template.zobrist_key, card.keyword_mask, card.current_dur,
+                                     card.current_atk, card.current_spd, card.shields)):
+        if value:
+            h ^= get((square, feature, value)) or feature_key(square, feature, value)
+    statuses = card.status_values
+    if any(statuses):
+        for index, value in enumerate(statuses):
+            if value:
+                h ^= feature_key(square, Feature.STATUS + index, value)
+    return h
+
+
+class TranspositionTable:
+    """Cache borné indexé par hash d'état, pour les évaluations d'une IA.
+
+    Chaque seau a deux entrées: la première garde la valeur la plus lourde
+    selon weight (remplacement par profondeur, ex: nombre de visites), la
+    seconde reçoit tout le reste (remplacement systématique). Le poids est
+    relu au moment du remplacement: une valeur mutable peut s'alourdir après
+    son stockage. Une table picklée repart vide.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, weight: Optional[Callable[[Any], float]] = None):
+        buckets = 1
+        while 2 * buckets < capacity:
+            buckets *= 2
+        self.capacity = 2 * buckets
+        self.weight = weight
+        self._mask = buckets - 1
+        self.clear()
+
+    def clear(self):
+        """Vide la table et remet les compteurs à zéro"""
+        self._keys: List[Optional[Hashable]] = [None] * self.capacity
+        self._values: List[Any] = [None] * self.capacity
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'capacity': self.capacity, 'weight': self.weight}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state['capacity'], state['weight'])
+
+    def _slot(self, key: Hashable) -> int:
+        """Emplacement de key, -1 si absente"""
+        i = (hash(key) & self._mask) * 2
+        keys = self._keys
+        if keys[i] == key:
+            return i
+        if keys[i + 1] == key:
+            return i + 1
+        return -1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valeur stockée pour key, default si absente ou évincée"""
+        i = self._slot(key)
+        if i < 0:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self._values[i]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._slot(key) >= 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def store(self, key: Hashable, value: Any):
+        """Range une valeur, en évinçant au besoin une entrée du même seau"""
+        i = self._slot(key)
+        if i >= 0:
+            self._values[i] = value
+            return
+
+        keys, values = self._keys, self._values
+        first = (hash(key) & self._mask) * 2
+        if keys[first] is None:
+            target = first
+        elif self.weight is not None and self.weight(value) >= self.weight(values[first]):
+            # La nouvelle entrée prend la place privilégiée, l'ancienne passe en seconde
+            self._evict(first + 1)
+            keys[first + 1], values[first + 1] = keys[first], values[first]
+            target = first
+        else:
+            target = first + 1
+            self._evict(target)
+
+        keys[target], values[target] = key, value
+        self._size += 1
+
+    def _evict(self, i: int):
+        if self._keys[i] is not None:
+            self._keys[i] = self._values[i] = None
+            self._size -= 1
+            self.replacements += 1
@@ -0,0 +1,10 @@
+# tests/conftest.py
+"""Outils partagés par les tests"""
+
+from core.entities import Card, Biome, Rarity
+
+
+def make_card(card_id: str = "test", *, name: str = "Test", cost: int = 1, atk: int = 2,
+              dur: int = 5, spd: int = 1, **abilities) -> Card:
+    """Carte de forêt commune, caractéristiques et capacités au choix"""
+    return Card(card_id, name, Biome.FORET, Rarity.COMMON, cost, atk, dur, spd, **abilities)
@@ -0,0 +1,83 @@
+# tests/test_abilities.py
+"""Tests pour la compilation des capacités"""
+
+from core.entities import CombatState, StatusEffect, STATUS_INDEX
+from core.abilities import Op, compile_effect, compile_ability
+from core.combat import CombatResolver
+from core.benchmarks import benchmark_triggers, status_heavy_matchups
+from tests.conftest import make_card
+
+
+class TestCompiler:
+    """Tests du compilateur d'effets"""
+
+    def test_status_then_shield(self):
+        """Test qu'un effet mixte donne l'altération puis les boucliers"""
+        program = compile_effect({"effect": StatusEffect.VENIN, "value": 2, "type": "shield"},
+                                 "on_hit")
+
+        assert program == ((Op.STATUS, StatusEffect.VENIN, 2, STATUS_INDEX[StatusEffect.VENIN]),
+                           (Op.SHIELD, None, 2, -1))
+
+    def test_unknown_effects_dropped(self):
+        """Test que les effets sans action pour leur déclencheur sont ignorés"""
+        assert compile_effect({"effect": "venin"}, "on_attack") == ()
+        assert compile_effect({"type": "shield_ally", "target": "front"}, "on_deploy") == ()
+        assert compile_effect({"effect": StatusEffect.VENIN}, "on_deploy") == ()
+
+    def test_deploy_defaults(self):
+        """Test des valeurs par défaut des effets de déploiement"""
+        program = compile_ability([{"type": "shield_ally"}, {"type": "buff_allies"}], "on_deploy")
+
+        assert program == ((Op.SHIELD_BACK_ALLY, None, 1, -1), (Op.BUFF_ALLIES, None, 0, -1))
+
+    def test_program_follows_template(self):
+        """Test que le programme est partagé et suit un modèle dérivé"""
+        card = make_card(on_attack=[{"effect": StatusEffect.BRULURE, "value": 1}])
+        assert card.program is card.clone().program
+
+        card.on_attack = []
+        assert card.program.on_attack == ()
+
+
+class TestCompiledDispatch:
+    """Tests de l'exécution des programmes par le résolveur"""
+
+    def test_attack_applies_compiled_effects(self):
+        """Test que les effets on_attack et on_hit s'appliquent à la cible"""
+        state = CombatState()
+        resolver = CombatResolver(state, rng_seed=0)
+        attacker = make_card(on_attack=[{"effect": StatusEffect.VENIN, "value": 1}],
+                         on_hit=[{"type": "shield", "value": 1}])
+        target = make_card()
+        state.player_field[0] = attacker
+        state.enemy_field[0] = target
+
+        resolver._unit_attack(attacker, True, 0)
+
+        assert target.get_status(StatusEffect.VENIN) == 1
+        assert target.shields == 1
+
+    def test_deploy_effects(self):
+        """Test des effets de déploiement compilés"""
+        state = CombatState()
+        resolver = CombatResolver(state, rng_seed=0)
+        back, front = make_card(), make_card()
+        state.player_field[3] = back
+        state.player_field[0] = front
+        card = make_card(on_deploy=[{"type": "shield_ally", "value": 2},
+                                {"type": "buff_allies", "atk": 1}])
+        state.hand.append(card)
+
+        assert resolver.play_card(card, 1)
+        assert back.shields == 2
+        assert front.current_atk == 3 and back.current_atk == 3
+        assert card.current_atk == 2
+
+    def test_status_heavy_benchmark(self):
+        """Test que le banc des decks chargés en statuts compile et rejoue ses combats"""
+        player, enemies = status_heavy_matchups(1)[0]
+        assert all(len(card.program.on_attack) == 3 for card in player + enemies)
+
+        result = benchmark_triggers(calls=100, combats=5)
+        assert result['trigger_us'] > 0 and result['combats'] > 0
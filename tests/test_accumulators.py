@@ -0,0 +1,75 @@
+# tests/test_accumulators.py
+"""Tests pour les accumulateurs statistiques et l'arrêt anticipé"""
+
+import statistics
+
+from core.accumulators import RunningStat, CardAccumulator, wilson_interval
+from core.balance import CombatSimulator
+from core.events import LogLevel, EventType
+from tests.test_balance import generate_player_deck, generate_enemy_deck
+
+
+class TestAccumulators:
+    """Tests des moments en ligne et de leur fusion"""
+
+    def test_running_stat(self):
+        """Test de la moyenne, de la variance et de la fusion"""
+        values = [3, 7, 7, 19, 24, 1, 0]
+        whole, left, right = RunningStat(), RunningStat(), RunningStat()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i < 3 else right).add(value)
+        left.merge(right)
+
+        assert left == whole
+        assert whole.mean == statistics.mean(values)
+        assert abs(whole.variance - statistics.variance(values)) < 1e-12
+
+    def test_wilson_interval(self):
+        """Test des bornes de Wilson, y compris aux extrêmes"""
+        low, high = wilson_interval(0, 10)
+        assert low == 0.0 and 0.2 < high < 0.35
+        low, high = wilson_interval(50, 100)
+        assert abs((low + high) / 2 - 0.5) < 1e-12 and 0.18 < high - low < 0.2
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_card_accumulator_merge(self):
+        """Test de la fusion d'agrégats de carte"""
+        first, second = CardAccumulator(), CardAccumulator()
+        first.add(True, True, 4, 0)
+        second.add(False, False, 2, 3)
+        first.merge(second)
+
+        assert (first.played, first.wins, first.losses, first.survived) == (2, 1, 1, 1)
+        assert first.damage_dealt.mean == 3 and first.damage_taken.total == 3
+
+
+class TestSimulatorStatistics:
+    """Tests des statistiques de run_batch_simulation"""
+
+    def test_early_stop(self):
+        """Test de l'arrêt dès que tous les intervalles sont assez étroits"""
+        simulator = CombatSimulator(seed=5)
+        summary = simulator.run_batch_simulation(2000, generate_player_deck, generate_enemy_deck,
+                                                 target_width=0.3, check_every=50)
+
+        assert summary['simulations'] < 2000 and summary['simulations'] % 50 == 0
+        assert len(summary['results']) == summary['simulations']
+        for stats in simulator.card_stats.values():
+            low, high = stats.win_rate_interval
+            assert low <= stats.win_rate <= high and high - low <= 0.3
+
+    def test_real_damage_from_events(self):
+        """Test que les dégâts par carte viennent des événements quand le combat est journalisé"""
+        simulator = CombatSimulator(seed=8, log_level=LogLevel.FULL)
+        summary = simulator.run_batch_simulation(30, generate_player_deck, generate_enemy_deck)
+
+        for result in summary['results']:
+            log = result.events
+            from_player = sum(
+                event.value for event in log
+                if event.op == EventType.DAMAGE and log.cards[event.source].id.startswith("p")
+            )
+            assert sum(result.card_damage) == from_player
+        dealt = sum(s.avg_damage_dealt * s.usage_count for s in simulator.card_stats.values())
+        assert round(dealt) == sum(sum(r.card_damage) for r in summary['results'])
@@ -0,0 +1,60 @@
+# tests/test_adaptive.py
+"""Tests pour le balayage d'équilibrage adaptatif"""
+
+from core.entities import Card, Biome, Rarity
+from core.balance import CombatSimulator
+from core.adaptive import AdaptiveSweep
+from tests.test_balance import generate_enemy_deck
+
+
+def _pool() -> list:
+    """Huit cartes qui gagnent toujours, deux dont le taux est incertain"""
+    def card(card_id: str, atk: int, dur: int, spd: int) -> Card:
+        return Card(card_id, "Test", Biome.FORET, Rarity.COMMON, 1, atk, dur, spd)
+
+    return ([card(f"fort{i}", 6, 12, 3) for i in range(8)]
+            + [card("moyen", 2, 4, 2), card("moyen2", 2, 3, 2)])
+
+
+def _sweep(mixing: float) -> AdaptiveSweep:
+    return AdaptiveSweep(CombatSimulator(seed=1), _pool(), generate_enemy_deck, deck_size=2,
+                         act=2, mixing=mixing, batch_size=128, seed=2)
+
+
+class TestAdaptiveSweep:
+    """Tests de l'allocation et de la repondération"""
+
+    def test_uniform_is_unweighted(self):
+        """Test qu'avec mixing=1 la proposition reste uniforme et les poids valent 1"""
+        sweep = _sweep(1.0)
+        estimates = sweep.run(400, round_size=200)
+
+        for estimate in estimates.values():
+            assert abs(estimate.effective_samples - estimate.plays) < 1e-6
+        assert sweep.combats == 400
+
+    def test_focuses_on_uncertain_cards(self):
+        """Test d'intervalles plus étroits à budget égal, sans biais visible"""
+        uniform = _sweep(1.0)
+        expected = uniform.run(2000, round_size=200)
+        adaptive = _sweep(0.2)
+        actual = adaptive.run(2000, round_size=200)
+
+        assert adaptive.max_width() < uniform.max_width()
+        assert actual["moyen"].plays > expected["moyen"].plays
+        for card_id, estimate in actual.items():
+            reference = expected[card_id]
+            margin = (estimate.interval[1] - estimate.interval[0]
+                      + reference.interval[1] - reference.interval[0]) / 2
+            assert abs(estimate.win_rate - reference.win_rate) <= margin
+
+    def test_early_stop_and_card_stats(self):
+        """Test de l'arrêt sur target_width et du report dans card_stats"""
+        sweep = _sweep(0.2)
+        sweep.run(5000, round_size=200, target_width=0.2)
+
+        assert sweep.combats < 5000 and sweep.max_width() <= 0.2
+        stats = sweep.simulator.card_stats["moyen"]
+        assert stats.win_rate_interval == sweep.estimates()["moyen"].interval
+        assert "moyen" not in [c['card_id'] for c in
+                               sweep.simulator.identify_problematic_cards()['underpowered']]
@@ -0,0 +1,102 @@
+# tests/test_balance.py
+"""Tests pour le simulateur d'équilibrage"""
+
+import random
+
+import pytest
+
+from core.entities import Card, Biome, Rarity, Keyword
+from core.balance import CombatSimulator, BalanceFormulas, CatalogValidator, FormulaCoefficients
+from core.catalog import load_catalog
+
+
+def generate_player_deck(act: int, rng: random.Random) -> list:
+    """Deck joueur aléatoire (niveau module pour être picklable)"""
+    return [
+        Card(f"p{rng.randint(0, 5)}", "Joueur", Biome.FORET, Rarity.COMMON,
+             rng.randint(1, 2), rng.randint(1, 3), rng.randint(2, 5), rng.randint(1, 3))
+        for _ in range(8)
+    ]
+
+
+def generate_enemy_deck(act: int, rng: random.Random) -> list:
+    """Ennemis aléatoires selon l'acte"""
+    enemies = []
+    for _ in range(1 + act):
+        enemy = Card("e", "Ennemi", Biome.DUNES, Rarity.COMMON,
+                     1, rng.randint(1, 2), rng.randint(2, 5), rng.randint(1, 3))
+        if rng.random() < 0.3:
+            enemy.keywords.add(Keyword.BOND)
+        enemies.append(enemy)
+    return enemies
+
+
+class TestBatchSimulation:
+    """Tests des modes d'exécution de run_batch_simulation"""
+
+    def test_parallel_matches_serial(self):
+        """Test qu'une exécution en processus donne exactement le résultat série"""
+        serial = CombatSimulator(seed=3)
+        expected = serial.run_batch_simulation(60, generate_player_deck, generate_enemy_deck)
+
+        parallel = CombatSimulator(seed=3)
+        actual = parallel.run_batch_simulation(60, generate_player_deck, generate_enemy_deck,
+                                               workers=2)
+
+        assert actual['results'] == expected['results']
+        assert actual['overall_win_rate'] == expected['overall_win_rate']
+        assert parallel.card_stats == serial.card_stats
+
+    def test_vectorized_matches_serial(self):
+        """Test que le moteur vectorisé donne le même résultat que la série"""
+        serial = CombatSimulator(seed=4)
+        expected = serial.run_batch_simulation(50, generate_player_deck, generate_enemy_deck)
+
+        batched = CombatSimulator(seed=4)
+        actual = batched.run_batch_simulation(50, generate_player_deck, generate_enemy_deck,
+                                              batch_size=16)
+
+        assert actual['results'] == expected['results']
+        assert batched.card_stats == serial.card_stats
+
+    def test_parallel_requires_seeded_generators(self):
+        """Test que le mode parallèle refuse les générateurs sans rng"""
+        simulator = CombatSimulator(seed=0)
+
+        with pytest.raises(ValueError):
+            simulator.run_batch_simulation(4, lambda act: [], lambda act: [], workers=2)
+
+
+class TestCatalogValidator:
+    """Tests de la validation vectorisée du catalogue"""
+
+    def test_matches_validate_card(self):
+        """Test que chaque ligne correspond à validate_card sur la carte"""
+        catalog = load_catalog()
+        result = CatalogValidator.from_catalog(catalog).validate()
+
+        assert len(result.card_ids) == len(catalog)
+        for i, template in enumerate(catalog.templates.values()):
+            expected = BalanceFormulas.validate_card(template)
+            assert result.card_ids[i] == template.id
+            assert abs(result.actual[i] - expected['actual']) < 1e-9
+            assert bool(result.valid[i]) == expected['valid']
+            assert result.recommendations[i] == expected['recommendation']
+
+    def test_what_if_and_apply(self):
+        """Test des coefficients modifiés, essayés puis adoptés"""
+        validator = CatalogValidator.from_catalog()
+        before = validator.validate()
+        trial = validator.what_if(dur=1.0, venin=0.75)
+
+        changed = FormulaCoefficients(dur=1.0, statuses=(0.75,) + (0.0,) * 6)
+        expected = CatalogValidator.from_catalog(coefficients=changed).validate()
+        assert (trial.actual == expected.actual).all()
+        assert (validator.validate().actual == before.actual).all()
+
+        validator.apply(dur=1.0, venin=0.75)
+        assert validator.coefficients == changed
+        assert list(validator.validate().to_frame()['valid']) == list(expected.valid)
+
+        with pytest.raises(KeyError):
+            validator.what_if(inconnu=1.0)
@@ -0,0 +1,149 @@
+# tests/test_batch_combat.py
+"""Tests pour le moteur de combat vectorisé"""
+
+import random
+from copy import deepcopy
+
+import numpy as np
+
+from core.entities import Card, CombatState, StatusEffect, Keyword, Biome, Rarity
+from core.combat import CombatResolver
+from core.batch_combat import BatchCombatEngine, ONGOING, VICTORY, DEFEAT
+from core.balance import CombatSimulator
+from core.policies import GreedyPolicy
+from core.benchmarks import benchmark_combats
+
+
+def _random_card(rng: random.Random, index: int) -> Card:
+    """Carte aléatoire avec mots-clés, statuts et effets"""
+    card = Card(f"card_{index}", f"Carte {index}", Biome.FORET, Rarity.COMMON,
+                rng.randint(1, 3), rng.randint(1, 4), rng.randint(1, 6), rng.randint(1, 4))
+    for keyword in Keyword:
+        if rng.random() < 0.15:
+            card.keywords.add(keyword)
+    for status in StatusEffect:
+        if rng.random() < 0.08:
+            card.apply_status(status, rng.randint(1, 2))
+    card.shields = rng.choice([0, 0, 0, 1, 2])
+    card.on_attack = [{"effect": rng.choice(list(StatusEffect)), "value": 1}] if rng.random() < 0.3 else []
+    card.on_hit = [{"type": "shield", "value": 1}] if rng.random() < 0.1 else []
+    card.on_death = [{"effect": StatusEffect.FRACTURE, "value": 1}] if rng.random() < 0.1 else []
+    if rng.random() < 0.2:
+        card.on_deploy = [{"type": "shield_ally", "target": "back", "value": 1}]
+    return card
+
+
+def _random_matchups(seed: int, count: int):
+    rng = random.Random(seed)
+    return [
+        ([_random_card(rng, i) for i in range(rng.randint(3, 12))],
+         [_random_card(rng, i) for i in range(rng.randint(1, 7))])
+        for _ in range(count)
+    ]
+
+
+def _card_state(card: Card):
+    statuses = {s: v for s, v in card.permanent_statuses.items() if v}
+    return card.current_atk, card.current_dur, card.current_spd, card.shields, statuses
+
+
+class TestBatchCombatEngine:
+    """Tests du moteur vectorisé contre CombatResolver"""
+
+    def test_matches_scalar_turns(self):
+        """Test que quelques tours donnent le même état que CombatResolver"""
+        rng = random.Random(5)
+        states = []
+        for _ in range(20):
+            state = CombatState()
+            for i in rng.sample(range(6), 3):
+                state.player_field[i] = _random_card(rng, i)
+            for i in rng.sample(range(6), 3):
+                state.enemy_field[i] = _random_card(rng, i)
+            states.append(state)
+        scalar_states = deepcopy(states)
+
+        engine = BatchCombatEngine(states, list(range(20)))
+        engine.start_combat()
+        for _ in range(3):
+            engine.process_turn()
+        engine.finalize()
+
+        for seed, state in enumerate(scalar_states):
+            resolver = CombatResolver(state, rng_seed=seed)
+            resolver.start_combat()
+            for _ in range(3):
+                resolver.process_turn()
+
+        for batch, scalar in zip(states, scalar_states):
+            for field in ("player_field", "enemy_field"):
+                batch_cards = [c and _card_state(c) for c in getattr(batch, field)]
+                scalar_cards = [c and _card_state(c) for c in getattr(scalar, field)]
+                assert batch_cards == scalar_cards
+
+    def test_simulate_combat_batch_matches_serial(self):
+        """Test que simulate_combat_batch donne les mêmes issues qu'en série"""
+        matchups = _random_matchups(1, 200)
+        copies = deepcopy(matchups)
+
+        serial = CombatSimulator(seed=7)
+        expected = [serial.simulate_combat(p, e) for p, e in matchups]
+
+        batch = CombatSimulator(seed=7).simulate_combat_batch(copies)
+
+        assert batch == expected
+        for (p1, e1), (p2, e2) in zip(matchups, copies):
+            assert [_card_state(c) for c in p1 + e1] == [_card_state(c) for c in p2 + e2]
+
+    def test_outcome(self):
+        """Test de la détection de fin de combat"""
+        empty = CombatState()
+        won = CombatState()
+        won.player_field[0] = Card("p", "P", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+        ongoing = deepcopy(won)
+        ongoing.enemy_field[0] = Card("e", "E", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+
+        engine = BatchCombatEngine([empty, won, ongoing], [0, 0, 0])
+
+        assert engine.outcome().tolist() == [VICTORY, VICTORY, ONGOING]
+        assert engine.presence(True).tolist() == [0, 3, 3]
+
+        lost = CombatState()
+        lost.enemy_field[0] = Card("e", "E", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+        assert BatchCombatEngine([lost], [0]).outcome()[0] == DEFEAT
+
+    def test_play_card_respects_energy(self):
+        """Test que le déploiement vectorisé respecte l'énergie"""
+        state = CombatState()
+        card = Card("test", "Test", Biome.FORET, Rarity.COMMON, 3, 2, 3, 1)
+        state.hand.append(card)
+        state.energy = 2
+        engine = BatchCombatEngine([state], [0])
+
+        assert engine.play_card(0, card, 0) is False
+        state.energy = 3
+        assert engine.play_card(0, card, 0) is True
+        assert state.player_field[0] is card
+        assert np.array_equal(engine.presence(True), [3])
+
+    def test_batched_greedy_matches_per_combat(self):
+        """Test que les poses gloutonnes vectorisées égalent les poses combat par combat"""
+        class PerCombatGreedy(GreedyPolicy):
+            def play_turn(self, resolver, state):
+                super().play_turn(resolver, state)
+
+        matchups = _random_matchups(3, 150)
+        copies = deepcopy(matchups)
+
+        vectorised = CombatSimulator(seed=4).simulate_combat_batch(matchups)
+        per_combat = CombatSimulator(seed=4, policy=PerCombatGreedy()).simulate_combat_batch(copies)
+
+        assert vectorised == per_combat
+        for (p1, e1), (p2, e2) in zip(matchups, copies):
+            assert [_card_state(c) for c in p1 + e1] == [_card_state(c) for c in p2 + e2]
+
+    def test_benchmark_reports_identical_outcomes(self):
+        """Test que le banc de mesure compare les deux modes sur les mêmes combats"""
+        result = benchmark_combats(combats=60, batch_size=16)
+        assert result['identical']
+        assert result['serial'] > 0 and result['batch'] > 0
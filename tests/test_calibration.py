@@ -0,0 +1,75 @@
+# tests/test_calibration.py
+"""Tests pour la calibration des coefficients de BalanceFormulas"""
+
+from core.entities import Card, Biome, Rarity, Keyword
+from core.balance import BalanceFormulas, FormulaCoefficients, DEFAULT_COEFFICIENTS
+from core.calibration import FormulaOptimizer, EvaluationSettings, rebalance
+from tests.test_balance import generate_enemy_deck
+
+
+def _templates() -> list:
+    specs = [(1, 2, 3, 1), (1, 3, 2, 2), (2, 4, 5, 1), (1, 1, 6, 3), (2, 2, 2, 2), (3, 5, 3, 2)]
+    return [
+        Card(f"c{i}", "Test", Biome.FORET, Rarity.COMMON, cost, atk, dur, spd,
+             keywords=[Keyword.BOND] if i % 2 else []).template
+        for i, (cost, atk, dur, spd) in enumerate(specs)
+    ]
+
+
+def _optimizer(**kwargs) -> FormulaOptimizer:
+    settings = EvaluationSettings(combats=200, deck_size=4, batch_size=64)
+    return FormulaOptimizer(_templates(), generate_enemy_deck, settings, population=6,
+                            elite=2, seed=3, **kwargs)
+
+
+class TestFormula:
+    """Tests de la formule paramétrée"""
+
+    def test_default_score_unchanged(self):
+        """Test que les poids par défaut redonnent la formule d'origine"""
+        card = Card("x", "X", Biome.FORET, Rarity.RARE, 2, 3, 4, 2,
+                    keywords=[Keyword.VOL, Keyword.BOND])
+        expected = 3 * 1.0 + 4 * 0.8 + 1 * 0.5 + 0.5 + 1.0 - 2 * 0.5
+
+        assert abs(BalanceFormulas.calculate_card_score(card) - expected) < 1e-9
+        assert FormulaCoefficients.from_vector(DEFAULT_COEFFICIENTS.vector()) == DEFAULT_COEFFICIENTS
+
+    def test_rebalance_towards_budget(self):
+        """Test que la DUR rapproche le score du budget, dans la limite max_change"""
+        templates = _templates()
+        balanced = rebalance(templates, DEFAULT_COEFFICIENTS, max_change=2)
+
+        for before, after in zip(templates, balanced):
+            budget = BalanceFormulas.calculate_card_budget(before.rarity)
+            assert abs(after.base_dur - before.base_dur) <= 2
+            assert (abs(BalanceFormulas.calculate_card_score(after) - budget)
+                    <= abs(BalanceFormulas.calculate_card_score(before) - budget))
+
+
+class TestFormulaOptimizer:
+    """Tests de la recherche et du cache"""
+
+    def test_run_and_disk_cache(self, tmp_path):
+        """Test du résultat et de la reprise sans resimuler grâce au cache disque"""
+        first = _optimizer(cache_dir=str(tmp_path)).run(2)
+
+        assert first.evaluations > 0
+        assert first.history == sorted(first.history, reverse=True)
+        assert first.fitness == first.history[-1]
+        assert set(first.residuals) == {t.id for t in _templates()}
+        assert first.coefficients.atk == 1.0
+
+        first.save(str(tmp_path / "formule.json"))
+        assert (tmp_path / "formule.json").exists()
+
+        second = _optimizer(cache_dir=str(tmp_path)).run(2)
+        assert second.evaluations == 0
+        assert second.coefficients == first.coefficients
+
+    def test_parallel_matches_serial(self):
+        """Test que l'évaluation en processus donne la même recherche"""
+        serial = _optimizer().run(1)
+        parallel = _optimizer(workers=2).run(1)
+
+        assert parallel.coefficients == serial.coefficients
+        assert parallel.residuals == serial.residuals
@@ -0,0 +1,104 @@
+# tests/test_catalog.py
+"""Tests pour le catalogue des cartes"""
+
+import json
+
+import pytest
+
+from core.entities import Biome, Rarity, Keyword, StatusEffect, CardDatabase
+from core.entities import ABILITIES
+from core.catalog import load_catalog, cache_path, validate_records, CATALOG_PATH
+
+
+def _write_catalog(path, cards):
+    path.write_text(json.dumps({"cards": cards}), encoding="utf-8")
+
+
+SPIDER = {"name": "Mygale", "biome": "forest", "rarity": "C", "cost": 1,
+          "atk": 1, "dur": 4, "spd": 1, "on_attack": [{"effect": "VENIN", "value": 1}]}
+
+
+class TestCardCatalog:
+    """Tests du chargement et des index"""
+
+    def test_full_catalog(self):
+        """Test que tout cards.json est chargé et indexé"""
+        catalog = load_catalog(CATALOG_PATH, use_cache=False)
+
+        assert len(catalog) == 90
+        assert len(catalog.query(biome=Biome.NEUTRE)) == 20
+        assert len(catalog.query(rarity=Rarity.LEGENDARY)) == 9
+        for template in catalog.query(Biome.VOLCAN, Rarity.UNCOMMON):
+            assert template.biome == Biome.VOLCAN
+            assert template.rarity == Rarity.UNCOMMON
+
+    def test_query_combines_criteria(self, tmp_path):
+        """Test de l'index composite (biome, rareté, coût, mot-clé)"""
+        path = tmp_path / "cards.json"
+        flyer = dict(SPIDER, name="Chouette", cost=2, keywords=["VOL"])
+        _write_catalog(path, {"spider": SPIDER, "owl": flyer})
+        catalog = load_catalog(path)
+
+        assert [t.id for t in catalog.query(Biome.FORET)] == ["spider", "owl"]
+        assert [t.id for t in catalog.query(cost=2, keyword=Keyword.VOL)] == ["owl"]
+        assert catalog.query(Biome.DUNES) == ()
+
+    def test_status_names_converted(self, tmp_path):
+        """Test que les noms de statuts deviennent des StatusEffect"""
+        path = tmp_path / "cards.json"
+        _write_catalog(path, {"spider": SPIDER})
+
+        template = load_catalog(path).templates["spider"]
+
+        assert template.on_attack[0]["effect"] is StatusEffect.VENIN
+
+    def test_cache_reused_then_invalidated(self, tmp_path):
+        """Test que le cache est relu tant que le JSON ne change pas"""
+        path = tmp_path / "cards.json"
+        _write_catalog(path, {"spider": SPIDER})
+
+        first = load_catalog(path)
+        assert cache_path(path).exists()
+        assert load_catalog(path).templates == first.templates
+
+        _write_catalog(path, {"spider": dict(SPIDER, atk=3)})
+        assert load_catalog(path).templates["spider"].base_atk == 3
+
+    def test_invalid_catalog_rejected(self, tmp_path):
+        """Test que les entrées invalides sont toutes signalées"""
+        bad = dict(SPIDER, biome="moon", keywords=["LASER"], dur=0)
+        errors = validate_records({"bad": bad})
+
+        assert len(errors) == 3
+
+        path = tmp_path / "cards.json"
+        _write_catalog(path, {"bad": bad})
+        with pytest.raises(ValueError):
+            load_catalog(path)
+
+    def test_database_uses_catalog(self, tmp_path):
+        """Test que CardDatabase crée ses cartes depuis le catalogue"""
+        path = tmp_path / "cards.json"
+        _write_catalog(path, {"spider": SPIDER})
+
+        db = CardDatabase(path)
+        card = db.create_card("spider")
+
+        assert card.base_dur == 4
+        assert db.query(rarity=Rarity.COMMON) == (card.template,)
+
+    def test_records_do_not_alias_templates(self):
+        """Test que modifier une entrée brute ne change aucun modèle"""
+        catalog = load_catalog(CATALOG_PATH, use_cache=False)
+        before = {card_id: (t.signature, t.to_dict()) for card_id, t in catalog.templates.items()}
+
+        for record in catalog.records.values():
+            for ability in ABILITIES:
+                for effect in record.get(ability, []):
+                    effect["value"] = 99
+            for value in record.values():
+                if isinstance(value, list):
+                    value.append({"type": "ajout"})
+
+        after = {card_id: (t.signature, t.to_dict()) for card_id, t in catalog.templates.items()}
+        assert after == before
@@ -180,4 +180,65 @@ class TestIntegrationCombat:
                     damaged = True
                     break
 
-        assert damaged is True
\ No newline at end of file
+        assert damaged is True
+
+class TestCombatSnapshot:
+    """Tests des instantanés pour la recherche"""
+
+    def _setup(self):
+        state = CombatState()
+        resolver = CombatResolver(state, rng_seed=3)
+        hand = [Card(f"h{i}", "Main", Biome.FORET, Rarity.COMMON, 1, 2, 4, 2) for i in range(3)]
+        state.deck = hand
+        state.enemy_field[0] = Card("e1", "Enemy 1", Biome.DUNES, Rarity.COMMON, 1, 2, 6, 1)
+        state.enemy_field[1] = Card("e2", "Enemy 2", Biome.DUNES, Rarity.COMMON, 1, 1, 3, 3)
+        state.enemy_field[1].on_hit = [{"effect": StatusEffect.VENIN, "value": 1}]
+        resolver.start_combat()
+        return state, resolver
+
+    def _play_turn(self, state, resolver):
+        resolver.play_card(state.hand[0], 0)
+        resolver.process_turn()
+        return ([(c.id, c.current_dur, c.current_atk, dict(c.permanent_statuses)) if c else None
+                 for c in state.player_field + state.enemy_field],
+                [c.id for c in state.hand], state.turn, state.get_presence(False))
+
+    def test_restore_replays_identically(self):
+        """Test qu'un tour rejoué depuis un instantané donne le même résultat"""
+        state, resolver = self._setup()
+        snapshot = resolver.snapshot()
+
+        first = self._play_turn(state, resolver)
+        resolver.restore(snapshot)
+        assert state.player_field[0] is None
+        assert len(state.hand) == 3
+        second = self._play_turn(state, resolver)
+
+        assert first == second
+        state.check_aggregates()
+
+    def test_speculate_rolls_back(self):
+        """Test que le bloc spéculatif est annulé, y compris les statuts"""
+        state, resolver = self._setup()
+        enemy = state.enemy_field[0]
+        before = (enemy.current_dur, state.energy, resolver.rng.getstate())
+
+        with resolver.speculate():
+            self._play_turn(state, resolver)
+            enemy.apply_status(StatusEffect.BRULURE, 2)
+
+        assert (enemy.current_dur, state.energy, resolver.rng.getstate()) == before
+        assert not enemy.permanent_statuses
+
+    def test_nested_checkpoints(self):
+        """Test du journal d'annulation à plusieurs niveaux"""
+        state, resolver = self._setup()
+        resolver.checkpoint()
+        resolver.play_card(state.hand[0], 0)
+        resolver.checkpoint()
+        resolver.play_card(state.hand[0], 1)
+
+        resolver.undo()
+        assert state.player_field[1] is None and state.player_field[0] is not None
+        resolver.undo()
+        assert state.player_field[0] is None
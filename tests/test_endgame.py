@@ -0,0 +1,113 @@
+# tests/test_endgame.py
+"""Tests pour le solveur exact des fins de combat"""
+
+from core.entities import Card, CombatState
+from core.combat import CombatResolver
+from core.endgame import EndgameSolver
+from core.events import LogLevel
+from core.rng import PhiloxRandom
+from core.balance import CombatSimulator
+from tests.conftest import make_card
+
+
+def _stalemate_card(card_id: str) -> Card:
+    # Chaque coup consomme un bouclier de la cible et le lui rend
+    card = make_card(card_id, atk=1, dur=5, on_hit=[{"type": "shield", "value": 1}])
+    card.shields = 1
+    return card
+
+
+class TestEndgameSolver:
+    """Tests de l'énumération des départages"""
+
+    def test_tie_break_decides(self):
+        """Test d'un duel où l'unité qui agit en premier gagne"""
+        state = CombatState()
+        state.player_field[0] = make_card("p", atk=5, dur=2)
+        state.enemy_field[0] = make_card("e", atk=5, dur=2)
+        resolver = CombatResolver(state, rng_seed=0)
+        before = state.zobrist_hash()
+
+        outcome = EndgameSolver().solve(resolver, 10)
+
+        assert (outcome.win, outcome.loss, outcome.timeout) == (0.5, 0.5, 0.0)
+        assert outcome.expected_turns == 1
+        assert state.zobrist_hash() == before and state.turn == 1
+
+    def test_loop_is_timeout(self):
+        """Test qu'une position qui revient est comptée comme timeout"""
+        state = CombatState()
+        state.player_field[0] = _stalemate_card("p")
+        state.enemy_field[0] = _stalemate_card("e")
+        resolver = CombatResolver(state, rng_seed=0)
+
+        outcome = EndgameSolver().solve(resolver, 50)
+
+        assert outcome.timeout == 1.0 and outcome.expected_turns == 50
+
+    def test_matches_resolver_frequencies(self):
+        """Test que les probabilités suivent les départages retirés à chaque tour"""
+        def state():
+            state = CombatState()
+            state.player_field[0] = make_card("p", atk=1, dur=1)
+            state.player_field[3] = make_card("q", atk=1, dur=2)
+            state.enemy_field[0] = make_card("e", atk=1, dur=3)
+            return state
+
+        outcome = EndgameSolver().solve(CombatResolver(state(), rng_seed=0), 10)
+        assert (outcome.win, outcome.loss, outcome.expected_turns) == (0.75, 0.25, 2.5)
+
+        wins = 0
+        for seed in range(2000):
+            combat = state()
+            resolver = CombatResolver(combat, rng_seed=seed, log_level=LogLevel.OFF)
+            while combat.is_combat_over() is None:
+                resolver.process_turn()
+            wins += combat.is_combat_over()
+        assert abs(wins / 2000 - outcome.win) < 0.04
+
+    def test_too_many_orders(self):
+        """Test du refus quand l'énumération dépasse max_orders"""
+        state = CombatState()
+        for i in range(4):
+            state.player_field[i] = make_card(f"p{i}", atk=1, dur=3)
+        state.enemy_field[0] = make_card("e", atk=1, dur=3)
+        resolver = CombatResolver(state, rng_seed=0)
+
+        assert EndgameSolver(max_orders=100).solve(resolver, 5) is None
+        assert EndgameSolver().solve(resolver, 5).win == 1.0
+
+
+class TestEndgameShortcut:
+    """Tests du raccourci de simulate_combat"""
+
+    def test_shortcut_matches_full_simulation(self):
+        """Test que le raccourci donne le même résultat que tous les tours joués"""
+        results = []
+        for shortcut in (True, False):
+            simulator = CombatSimulator(seed=4, endgame_shortcut=shortcut)
+            results.append(simulator.simulate_combat(
+                [_stalemate_card("p")], [_stalemate_card("e"), _stalemate_card("e2")], max_turns=40
+            ))
+
+        assert results[0] == results[1]
+        assert results[0].turns == 40
+
+    def test_fast_forward_skips_loop(self):
+        """Test que les périodes d'une boucle sont sautées"""
+        def resolver():
+            state = CombatState()
+            state.player_field[0] = _stalemate_card("p")
+            state.enemy_field[0] = _stalemate_card("e")
+            return CombatResolver(state, rng_seed=PhiloxRandom(3))
+
+        skipped, played = resolver(), resolver()
+        assert EndgameSolver().fast_forward(skipped, 100) == 100
+        assert skipped.state.turn == 101
+        assert skipped.events.turn < 5
+
+        # Les départages des tours sautés sont consommés comme s'ils avaient été joués
+        for _ in range(100):
+            played.process_turn()
+        assert skipped.rng.getstate() == played.rng.getstate()
+        assert skipped.state.zobrist_hash() == played.state.zobrist_hash()
@@ -1,6 +1,7 @@
 # tests/test_entities.py
 """Tests pour les entités du jeu"""
 
+import json
 import pytest
 from hypothesis import given, strategies as st
 from typing import List
@@ -151,6 +152,135 @@ class TestCard:
         assert restored.shields == 1
         assert StatusEffect.VENIN in restored.permanent_statuses
 
+    def test_clone_is_independent(self):
+        """Test que la copie partage les capacités mais pas l'état"""
+        card = Card("test", "Test", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1,
+                    keywords={Keyword.BOND},
+                    on_attack=[{"effect": StatusEffect.VENIN, "value": 1}])
+        card.apply_status(StatusEffect.VENIN, 1)
+
+        copy = card.clone()
+        assert copy == card
+        assert copy.on_attack is card.on_attack
+
+        copy.keywords.add(Keyword.GARDE)
+        copy.apply_status(StatusEffect.VENIN, 2)
+        copy.take_damage(1)
+
+        assert set(card.keywords) == {Keyword.BOND}
+        assert card.permanent_statuses[StatusEffect.VENIN] == 1
+        assert copy.permanent_statuses[StatusEffect.VENIN] == 3
+        assert card.current_dur == 3
+
+    def test_keyword_and_status_views(self):
+        """Test des vues set/dict sur le masque et le tableau de statuts"""
+        card = Card("test", "Test", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+
+        assert not card.keywords
+        card.keywords.add(Keyword.VOL)
+        card.keywords.add(Keyword.VOL)
+        assert card.keywords == {Keyword.VOL}
+        assert card.has_keyword(Keyword.VOL)
+        card.keywords.discard(Keyword.VOL)
+        assert Keyword.VOL not in card.keywords
+
+        assert StatusEffect.BRULURE not in card.permanent_statuses
+        assert card.permanent_statuses.get(StatusEffect.BRULURE, 0) == 0
+        card.permanent_statuses[StatusEffect.BRULURE] = 2
+        assert dict(card.permanent_statuses) == {StatusEffect.BRULURE: 2}
+        assert card.get_status(StatusEffect.BRULURE) == 2
+
+
+class TestCardTemplate:
+    """Tests des modèles de cartes partagés"""
+
+    def test_instances_share_template(self):
+        """Test que les cartes du catalogue partagent leur modèle"""
+        db = CardDatabase()
+        card1 = db.create_card("forest_azure_spider")
+        card2 = db.create_card("forest_azure_spider")
+
+        assert card1 is not card2
+        assert card1.template is card2.template
+        assert card1.on_attack is db.templates["forest_azure_spider"].on_attack
+
+    def test_writing_static_field_detaches(self):
+        """Test que modifier une capacité ne touche pas le modèle du catalogue"""
+        db = CardDatabase()
+        card = db.create_card("forest_azure_spider")
+        template = card.template
+
+        card.on_attack = []
+        card.base_dur = 10
+
+        assert card.on_attack == ()
+        assert card.base_dur == 10
+        assert template.on_attack
+        assert db.create_card("forest_azure_spider").base_dur == template.base_dur
+
+    def test_template_is_frozen_and_hashable(self):
+        """Test que les capacités et extra d'un modèle sont figés et le modèle hachable"""
+        db = CardDatabase()
+        template = next(t for t in db.templates.values() if t.on_attack and t.extra)
+
+        assert hash(template) == hash(template.derive())
+        assert len({template, template.derive()}) == 1
+        with pytest.raises(TypeError):
+            template.on_attack[0]["value"] = 99
+        with pytest.raises(TypeError):
+            template.extra["ajout"] = 1
+
+        # La sérialisation rend des copies modifiables
+        data = template.to_dict()
+        data['on_attack'][0]["value"] = 99
+        data['extra'].clear()
+        assert template.to_dict() != data
+        assert template.on_attack[0]["value"] != 99 and template.extra
+
+    def test_save_stores_delta(self):
+        """Test que la sauvegarde ne contient que l'écart au modèle"""
+        db = CardDatabase()
+        card = db.create_card("dunes_solar_fennec")
+
+        assert card.to_dict() == {'template': "dunes_solar_fennec"}
+
+        card.take_damage(1)
+        card.apply_status(StatusEffect.SAIGNEMENT, 2)
+        data = card.to_dict()
+
+        assert data == {'template': "dunes_solar_fennec", 'dur': 1,
+                        'statuses': {'saignement': 2}}
+        assert Card.from_dict(data) == card
+
+    def test_derived_card_json_round_trip(self):
+        """Test qu'une carte sur modèle dérivé passe par JSON avec ses statuts"""
+        db = CardDatabase()
+        card = db.create_card("forest_azure_spider")
+        card.base_atk += 1
+
+        data = json.loads(json.dumps(card.to_dict()))
+        assert data['definition']['on_attack'] == [{"effect": "VENIN", "value": 1}]
+
+        loaded = Card.from_dict(data)
+        assert loaded.template == card.template
+        assert loaded.on_attack[0]["effect"] is StatusEffect.VENIN
+        assert loaded.base_atk == db.templates["forest_azure_spider"].base_atk + 1
+
+    def test_legacy_save_format(self):
+        """Test du chargement d'une carte au format de sauvegarde 1.0"""
+        data = {
+            'id': "old", 'name': "Ancienne", 'biome': "forest", 'rarity': "C", 'cost': 1,
+            'base_stats': {'atk': 1, 'dur': 3, 'spd': 2},
+            'current_stats': {'atk': 1, 'dur': 2, 'spd': 2},
+            'shields': 1, 'keywords': ["GARDE"], 'statuses': {'venin': 1}
+        }
+
+        card = Card.from_dict(data)
+
+        assert card.current_dur == 2
+        assert card.has_keyword(Keyword.GARDE)
+        assert card.get_status(StatusEffect.VENIN) == 1
+
 
 class TestCombatState:
     """Tests pour l'état de combat"""
@@ -184,3 +314,57 @@ class TestCombatState:
         state.player_field[0] = None
         state.enemy_field[0] = card
         assert state.is_combat_over() is False
+
+    def test_aggregates_follow_board(self):
+        """Test des agrégats incrémentaux (pose, retrait, dégâts)"""
+        state = CombatState()
+        card1 = Card("test1", "Test 1", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+        card2 = Card("test2", "Test 2", Biome.FORET, Rarity.COMMON, 1, 2, 4, 1)
+
+        state.enemy_field[1] = card1
+        state.enemy_field[4] = card2
+        assert state.occupied_mask(False) == 0b10010
+        assert state.living_count(False) == 2
+
+        assert state.damage_card(card1, 5) is False
+        assert state.get_presence(False) == 2  # -2 + 4
+        assert state.living_count(False) == 1
+        assert state.occupied_mask(False) == 0b10010  # La carte morte reste posée
+
+        state.enemy_field[1] = None
+        assert state.get_presence(False) == 4
+        assert state.occupied_mask(False) == 0b10000
+        state.check_aggregates()
+
+    def test_field_replacement_and_copy(self):
+        """Test que remplacer ou copier le terrain recalcule les agrégats"""
+        import copy
+
+        card = Card("test", "Test", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+        state = CombatState(player_field=[card, None, None, None, None, None])
+        assert state.get_presence(True) == 3
+
+        state.player_field = [None] * 6
+        assert state.get_presence(True) == 0
+
+        state.player_field[0] = card
+        clone = copy.deepcopy(state)
+        clone.damage_card(clone.player_field[0], 1)
+        assert clone.get_presence(True) == 2
+        assert state.get_presence(True) == 3
+
+    def test_debug_detects_direct_mutation(self):
+        """Test que le mode débogage signale une DUR modifiée hors damage_card"""
+        state = CombatState()
+        card = Card("test", "Test", Biome.FORET, Rarity.COMMON, 1, 2, 3, 1)
+        state.player_field[0] = card
+        card.current_dur = 1
+
+        CombatState.debug_aggregates = True
+        try:
+            with pytest.raises(AssertionError):
+                state.get_presence(True)
+            state.recompute_aggregates()
+            assert state.get_presence(True) == 1
+        finally:
+            CombatState.debug_aggregates = False
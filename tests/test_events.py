@@ -0,0 +1,71 @@
+# tests/test_events.py
+"""Tests pour le flux d'événements de combat"""
+
+from core.entities import CombatState, StatusEffect
+from core.combat import CombatResolver
+from core.events import CombatEventLog, EventType, LogLevel, STATUS_CODES
+from tests.conftest import make_card
+
+
+class TestCombatEventLog:
+    """Tests du canal d'événements"""
+
+    def test_off_records_nothing(self):
+        """Test qu'au niveau OFF aucun événement n'est compté"""
+        log = CombatEventLog(LogLevel.OFF)
+        log.emit(EventType.DAMAGE, None, make_card(dur=3), 3, 0)
+
+        assert len(log) == 0
+        assert log.count(EventType.DAMAGE) == 0
+
+    def test_counters_without_events(self):
+        """Test qu'au niveau COUNTERS seuls les compteurs sont tenus"""
+        log = CombatEventLog(LogLevel.COUNTERS)
+        target = make_card(dur=3)
+        log.emit(EventType.DAMAGE, None, target, 3, 0)
+        log.emit(EventType.DAMAGE, None, target, 2, 0)
+
+        assert len(log) == 0
+        assert log.count(EventType.DAMAGE) == 2
+        assert log.value_totals[EventType.DAMAGE] == 5
+
+    def test_ring_buffer_overwrites(self):
+        """Test que le tampon circulaire garde les derniers événements"""
+        log = CombatEventLog(LogLevel.FULL, capacity=4)
+        for turn in range(6):
+            log.emit(EventType.TURN_START, value=turn)
+
+        assert len(log) == 4
+        assert log.dropped == 2
+        assert [event.value for event in log] == [2, 3, 4, 5]
+        assert [seq for seq, _ in log.events_since(0)] == [2, 3, 4, 5]
+        assert log.to_array().shape == (4, 6)
+
+    def test_format_matches_text_log(self):
+        """Test que le formateur reproduit le texte du journal"""
+        log = CombatEventLog()
+        source, target = make_card(name="Loup", dur=3), make_card(name="Ours", dur=3)
+        log.emit(EventType.ATTACK, source, target, 3)
+        log.emit(EventType.STATUS_APPLY, source, target, 2, STATUS_CODES[StatusEffect.VENIN])
+
+        assert log.format() == ["Loup attaque Ours pour 3 dégâts",
+                                "Loup applique venin 2 à Ours"]
+
+
+class TestResolverEvents:
+    """Tests des événements émis par CombatResolver"""
+
+    def test_resolver_emits_deploy(self):
+        """Test que le déploiement est émis avec la carte et la position"""
+        state = CombatState()
+        card = make_card(dur=3)
+        state.hand.append(card)
+        resolver = CombatResolver(state)
+
+        assert resolver.play_card(card, 2)
+        event = list(resolver.events)[-1]
+
+        assert event.op == EventType.DEPLOY
+        assert resolver.events.cards[event.source] is card
+        assert event.value == 2
+        assert resolver.action_log[-1] == "Déploiement: Test en position 2"
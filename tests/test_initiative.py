@@ -0,0 +1,145 @@
+# tests/test_initiative.py
+"""Tests pour l'ordre d'initiative"""
+
+import copy
+import random
+
+from core.entities import CombatState, StatusEffect
+from core.initiative import InitiativeScheduler
+from core.combat import CombatResolver
+from tests.conftest import make_card
+
+
+class TestInitiativeScheduler:
+    """Tests de l'ordonnanceur par seaux de vitesse"""
+
+    def setup_method(self):
+        self.state = CombatState()
+        self.scheduler = InitiativeScheduler(random.Random(0))
+        self.scheduler.attach(self.state)
+
+    def test_order_by_speed(self):
+        """Test que les unités agissent par vitesse décroissante"""
+        slow, fast, mid = make_card("slow", spd=1), make_card("fast", spd=3), make_card("mid", spd=2)
+        self.state.player_field[0] = slow
+        self.state.enemy_field[2] = fast
+        self.state.player_field[4] = mid
+
+        order = self.scheduler.order()
+
+        assert [card for card, _, _ in order] == [fast, mid, slow]
+        assert order[0][1:] == (False, 2)
+
+    def test_deploy_and_death_update_order(self):
+        """Test que poses et retraits du terrain sont suivis"""
+        first, second = make_card("a", spd=2), make_card("b", spd=2)
+        self.state.player_field[0] = first
+        before = self.scheduler.order()
+
+        self.state.enemy_field[0] = second
+        assert len(self.scheduler.order()) == 2
+        assert len(before) == 1  # L'ancienne liste n'est pas modifiée
+
+        self.state.player_field[0] = None
+        assert [card for card, _, _ in self.scheduler.order()] == [second]
+
+    def test_order_cached_between_turns(self):
+        """Test que l'ordre n'est pas reconstruit sans changement"""
+        self.state.player_field[0] = make_card("a", spd=2)
+        self.state.player_field[1] = make_card("b", spd=2)
+
+        assert self.scheduler.order() is self.scheduler.order()
+
+    def test_speed_changes(self):
+        """Test des changements de vitesse, par set_speed ou directs"""
+        a, b = make_card("a", spd=2), make_card("b", spd=1)
+        self.state.player_field[0] = a
+        self.state.player_field[1] = b
+
+        self.scheduler.set_speed(a, 1)
+        b.current_spd = 3
+
+        assert [card for card, _, _ in self.scheduler.order()] == [b, a]
+        assert a.current_spd == 1
+
+    def test_ties_redrawn_each_turn(self):
+        """Test qu'à vitesse égale l'ordre est retiré à chaque tour, dans les seaux en place"""
+        cards = [make_card(str(i), spd=2) for i in range(6)]
+        for i, card in enumerate(cards):
+            self.state.player_field[i] = card
+        self.state.enemy_field[0] = make_card("lent", spd=1)
+        bucket = self.scheduler._buckets[2][1]
+
+        orders = set()
+        for _ in range(20):
+            self.scheduler.new_turn()
+            order = [card.id for card, _, _ in self.scheduler.order()]
+            assert order[-1] == "lent"
+            orders.add(tuple(order))
+        assert len(orders) > 1
+        assert self.scheduler._buckets[2][1] is bucket
+
+        # Sans nouveau tour, l'ordre reste celui du tour en cours
+        first = list(self.scheduler.order())
+        self.scheduler.set_speed(cards[0], 1)
+        self.scheduler.set_speed(cards[0], 2)
+        assert self.scheduler.order() == first
+
+    def test_imposed_keys(self):
+        """Test des clés imposées par case (joueur 0-5 puis ennemi 0-5)"""
+        a, b = make_card("a", spd=2), make_card("b", spd=2)
+        self.state.player_field[1] = a
+        self.state.enemy_field[4] = b
+        keys = [0.0] * 12
+
+        keys[10] = 1.0
+        self.scheduler.new_turn(keys)
+        assert [card for card, _, _ in self.scheduler.order()] == [b, a]
+
+        keys[1] = 2.0
+        self.scheduler.new_turn(keys)
+        assert [card for card, _, _ in self.scheduler.order()] == [a, b]
+
+    def test_copied_state_not_tracked(self):
+        """Test qu'une copie de l'état ne notifie pas l'ordonnanceur d'origine"""
+        self.state.player_field[0] = make_card("a", spd=2)
+
+        clone = copy.deepcopy(self.state)
+        clone.player_field[1] = make_card("b", spd=2)
+
+        assert len(self.scheduler) == 1
+
+
+class TestResolverInitiative:
+    """Tests de l'initiative dans CombatResolver"""
+
+    def _play(self, seed: int):
+        state = CombatState()
+        resolver = CombatResolver(state, rng_seed=seed)
+        for i in range(6):
+            state.enemy_field[i] = make_card(f"e{i}", spd=2)
+        state.player_field[3] = make_card("p", spd=2)
+        state.terrain_modifiers = {'type': 'BROUILLARD'}
+        resolver.start_combat()
+        return [card.id for card, _, _ in resolver._get_units_by_speed()]
+
+    def test_reproducible_for_seed(self):
+        """Test que l'ordre ne dépend que de la graine"""
+        assert self._play(5) == self._play(5)
+
+    def test_fog_and_curse_reorder(self):
+        """Test que Brouillard et Malédiction déplacent les unités"""
+        state = CombatState()
+        resolver = CombatResolver(state, rng_seed=1)
+        cursed = make_card("cursed", spd=3)
+        cursed.apply_status(StatusEffect.MALEDICTION, 1)
+        state.player_field[0] = cursed
+        state.player_field[3] = make_card("back", spd=3)
+        state.enemy_field[0] = make_card("front", spd=2)
+        state.terrain_modifiers = {'type': 'BROUILLARD'}
+
+        resolver.start_combat()
+
+        order = resolver._get_units_by_speed()
+        assert [card.current_spd for card, _, _ in order] == [2, 2, 2]
+        assert {card.id for card, _, _ in order} == {"cursed", "back", "front"}
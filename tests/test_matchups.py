@@ -0,0 +1,88 @@
+# tests/test_matchups.py
+"""Tests pour la matrice des affrontements archétypes x pools d'ennemis"""
+
+from core.entities import Card, Biome, Rarity, CardDatabase
+from core.balance import CombatSimulator
+from core.matchups import Archetype, EnemyPool, MatchupRunner, enemy_pools
+from tests.test_balance import generate_player_deck, generate_enemy_deck
+
+
+def _template(card_id: str, atk: int, dur: int):
+    return Card(card_id, card_id, Biome.FORET, Rarity.COMMON, 1, atk, dur, 2).template
+
+
+def _setup():
+    archetypes = [
+        Archetype("fort", tuple(_template(f"f{i}", 5, 8) for i in range(3))),
+        Archetype("faible", tuple(_template(f"w{i}", 1, 2) for i in range(3))),
+    ]
+    pools = [
+        EnemyPool("doux", Biome.FORET, 1, ((_template("e1", 2, 5), _template("e2", 2, 4)),)),
+        EnemyPool("dur", Biome.VOLCAN, 2, ((_template("e3", 4, 9), _template("e4", 4, 9)),)),
+    ]
+    return archetypes, pools
+
+
+class TestMatchupRunner:
+    """Tests du calcul de la matrice"""
+
+    def test_matrix_orders_archetypes(self):
+        """Test que la matrice distingue les archétypes et les pools"""
+        archetypes, pools = _setup()
+        matrix = MatchupRunner(combats=60, batch_size=16).run(archetypes, pools)
+        rates = matrix.win_rates
+
+        assert matrix.win_rates.shape == (2, 2)
+        assert (matrix.combats == 60).all()
+        assert rates[0, 0] > rates[1, 0]
+        assert rates[0, 0] >= rates[0, 1]
+        assert matrix.to_frame().loc["fort", "doux"] == rates[0, 0]
+
+    def test_changed_card_only_resimulates_its_cells(self):
+        """Test que seules les cellules des cartes modifiées sont resimulées"""
+        archetypes, pools = _setup()
+        runner = MatchupRunner(combats=40, batch_size=16)
+        first = runner.run(archetypes, pools)
+        assert first.simulated == 4 and first.reused == 0
+
+        weaker = archetypes[0].cards[0].derive(base_atk=1)
+        archetypes[0] = Archetype("fort", (weaker,) + archetypes[0].cards[1:])
+        second = runner.run(archetypes, pools)
+
+        assert second.simulated == 2 and second.reused == 2
+        assert (second.wins[1] == first.wins[1]).all()
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test que la répartition entre processus ne change pas les résultats"""
+        archetypes, pools = _setup()
+        serial = MatchupRunner(combats=30, batch_size=8).run(archetypes, pools)
+        parallel = MatchupRunner(combats=30, batch_size=8, workers=2,
+                                 cache_dir=str(tmp_path)).run(archetypes, pools)
+        assert (serial.wins == parallel.wins).all()
+
+        reopened = MatchupRunner(combats=30, batch_size=8, cache_dir=str(tmp_path))
+        assert reopened.run(archetypes, pools).reused == 4
+
+
+class TestEnemyPools:
+    """Tests des pools tirés des cartes d'acte"""
+
+    def test_pools_resolved_and_reported(self, tmp_path):
+        """Test que les pools sont résolus en cartes et la carte de chaleur écrite"""
+        card_db = CardDatabase()
+        pools = enemy_pools(card_db, acts=(1, 2), encounters=3)
+
+        assert len(pools) == 12
+        assert all(2 <= len(encounter) <= 3 for pool in pools for encounter in pool.encounters)
+        assert [p.encounters for p in pools] == [p.encounters for p in enemy_pools(
+            card_db, acts=(1, 2), encounters=3)]
+
+        archetypes, _ = _setup()
+        matrix = MatchupRunner(combats=10).run(archetypes[:1], pools[:2])
+        report = tmp_path / "report.html"
+        simulator = CombatSimulator(seed=1)
+        simulator.run_batch_simulation(20, generate_player_deck, generate_enemy_deck)
+        simulator.generate_report(str(report), matchups=matrix)
+        html = report.read_text(encoding='utf-8')
+        assert "Matrice des Affrontements" in html
+        assert pools[0].name in html
@@ -0,0 +1,169 @@
+# tests/test_result_store.py
+"""Tests pour le magasin colonnaire de résultats"""
+
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import weakref
+
+from core.entities import Card, Biome, Rarity
+from core import balance
+from core.balance import CombatSimulator
+from core.result_store import ResultStore
+from tests.test_balance import generate_player_deck, generate_enemy_deck
+
+
+class CatalogueDeck:
+    """Deck tiré par identifiant dans une table de modèles modifiable"""
+
+    def __init__(self, templates: dict, prefix: str, size: int):
+        self.templates = templates
+        self.ids = sorted(card_id for card_id in templates if card_id.startswith(prefix))
+        self.size = size
+
+    def __call__(self, act, rng):
+        return [self.templates[rng.choice(self.ids)].instantiate() for _ in range(self.size)]
+
+
+def _catalogue() -> dict:
+    specs = {"p0": (2, 4, 2), "p1": (1, 3, 1), "p2": (3, 2, 3), "p3": (1, 5, 2),
+             "e0": (2, 5, 2), "e1": (3, 4, 1), "e2": (1, 8, 2)}
+    return {card_id: Card(card_id, card_id, Biome.FORET, Rarity.COMMON, 1, atk, dur, spd).template
+            for card_id, (atk, dur, spd) in specs.items()}
+
+
+class TestResultStore:
+    """Tests de l'écriture par blocs et des réductions"""
+
+    def test_matches_in_memory_results(self):
+        """Test que le magasin donne les mêmes résultats et statistiques que la liste"""
+        memory = CombatSimulator(seed=6)
+        expected = memory.run_batch_simulation(40, generate_player_deck, generate_enemy_deck)
+
+        streamed = CombatSimulator(seed=6)
+        store = ResultStore(chunk_size=7)
+        actual = streamed.run_batch_simulation(40, generate_player_deck, generate_enemy_deck,
+                                               store=store)
+
+        assert 'results' not in actual and actual['store'] is store
+        assert [tuple(vars(r).values())[:8] for r in expected['results']] == list(store.rows())
+        assert actual['overall_win_rate'] == expected['overall_win_rate']
+        assert actual['avg_turns'] == expected['avg_turns']
+        assert streamed.card_stats == memory.card_stats
+
+    def test_reopen_from_disk(self, tmp_path):
+        """Test de la réanalyse d'un magasin rouvert, puis d'un ajout"""
+        simulator = CombatSimulator(seed=2)
+        with ResultStore(str(tmp_path), chunk_size=16) as store:
+            first = simulator.run_batch_simulation(30, generate_player_deck, generate_enemy_deck,
+                                                   batch_size=8, store=store)
+
+        reopened = ResultStore.open(str(tmp_path))
+        analysis = CombatSimulator()
+        assert len(reopened) == 30
+        assert analysis.load_results(reopened)['overall_win_rate'] == first['overall_win_rate']
+        assert analysis.card_stats == simulator.card_stats
+
+        second = simulator.run_batch_simulation(10, generate_player_deck, generate_enemy_deck,
+                                                store=reopened)
+        assert len(reopened) == 40
+        assert second['overall_win_rate'] == reopened.summary(30)['overall_win_rate']
+
+    def test_card_index(self):
+        """Test que les lignes d'une carte ne lisent que les blocs qui la contiennent"""
+        store = ResultStore(chunk_size=5)
+        CombatSimulator(seed=1).run_batch_simulation(20, generate_player_deck,
+                                                     generate_enemy_deck, store=store)
+        performance = store.card_performance()
+
+        for card_id in store.cards:
+            played = sum(len(rows['card']) for _, rows in store.card_rows(card_id))
+            wins = sum(int(rows['won'].sum()) for _, rows in store.card_rows(card_id))
+            assert played == performance[card_id].played
+            assert wins == performance[card_id].wins
+        assert list(store.card_rows("absente")) == []
+
+    def test_parallel_streams_chunks(self):
+        """Test que les processus renvoient des blocs identiques à la série"""
+        serial = ResultStore()
+        CombatSimulator(seed=3).run_batch_simulation(24, generate_player_deck,
+                                                     generate_enemy_deck, store=serial)
+        parallel = ResultStore(chunk_size=4)
+        CombatSimulator(seed=3).run_batch_simulation(24, generate_player_deck,
+                                                     generate_enemy_deck, workers=2,
+                                                     store=parallel)
+
+        assert list(parallel.rows()) == list(serial.rows())
+        assert parallel.card_performance() == serial.card_performance()
+
+    def test_parallel_releases_drained_shards(self, monkeypatch):
+        """Test que le parent ne garde pas les tranches déjà versées dans le magasin"""
+        futures = []
+        alive = []
+
+        class RecordingExecutor(ProcessPoolExecutor):
+            def submit(self, *args, **kwargs):
+                gc.collect()
+                alive.append(sum(ref() is not None for ref in futures))
+                future = super().submit(*args, **kwargs)
+                futures.append(weakref.ref(future))
+                return future
+
+        monkeypatch.setattr(balance, "ProcessPoolExecutor", RecordingExecutor)
+        store = ResultStore(chunk_size=2)
+        CombatSimulator(seed=3).run_batch_simulation(120, generate_player_deck,
+                                                     generate_enemy_deck, workers=2,
+                                                     store=store)
+
+        assert len(futures) == 60 and len(store) == 120
+        # Fenêtre de workers * SHARDS_PER_WORKER tranches, au Future près
+        assert max(alive) <= 2 * balance.SHARDS_PER_WORKER + 1
+
+
+class TestResimulation:
+    """Tests de la resimulation incrémentale après une modification de cartes"""
+
+    def _run(self, templates, store):
+        simulator = CombatSimulator(seed=9)
+        simulator.run_batch_simulation(60, CatalogueDeck(templates, "p", 3),
+                                       CatalogueDeck(templates, "e", 2), batch_size=16,
+                                       store=store)
+        return simulator
+
+    def test_matches_full_rerun(self, tmp_path):
+        """Test que seuls les combats de la carte modifiée sont rejoués, comme un recalcul complet"""
+        templates = _catalogue()
+        store = ResultStore(str(tmp_path / "inc"), chunk_size=16)
+        simulator = self._run(templates, store)
+        involved = sum(
+            len(set(rows['row'].tolist())) for _, rows in store.card_rows("p2")
+        )
+
+        templates["p2"] = templates["p2"].derive(base_atk=6)
+        summary = simulator.resimulate(store, templates)
+
+        assert 0 < summary['resimulated'] == involved < len(store)
+        full_store = ResultStore(str(tmp_path / "full"), chunk_size=16)
+        full = self._run(templates, full_store)
+        assert list(store.rows()) == list(full_store.rows())
+        assert simulator.card_stats == full.card_stats
+        assert store.card_performance() == full_store.card_performance()
+
+        assert simulator.resimulate(store, templates)['resimulated'] == 0
+
+    def test_reopened_store(self, tmp_path):
+        """Test qu'un magasin rouvert détecte les cartes modifiées depuis son écriture"""
+        templates = _catalogue()
+        with ResultStore(str(tmp_path), chunk_size=16) as store:
+            self._run(templates, store)
+
+        templates["e1"] = templates["e1"].derive(base_dur=1)
+        reopened = ResultStore.open(str(tmp_path))
+        analysis = CombatSimulator()
+        summary = analysis.resimulate(reopened, templates)
+
+        assert summary['resimulated'] > 0
+        fresh = CombatSimulator()
+        fresh.load_results(ResultStore.open(str(tmp_path)))
+        assert analysis.card_stats == fresh.card_stats
+        keys = {card_id: template.content_key for card_id, template in templates.items()}
+        assert ResultStore.open(str(tmp_path)).stale_combats(keys) == {}
@@ -0,0 +1,106 @@
+# tests/test_rng.py
+"""Tests pour les flux aléatoires à compteur"""
+
+import pickle
+import random
+
+from core.rng import PhiloxRandom, RngStreams, Purpose, BLOCK, advance, shuffle, shuffle_many
+from core.balance import CombatSimulator
+from tests.test_balance import generate_player_deck, generate_enemy_deck
+
+
+class TestPhiloxRandom:
+    """Tests d'un flux"""
+
+    def test_block_matches_sequential_draws(self):
+        """Test que block() rend les mêmes valeurs que des random() successifs"""
+        sequential = PhiloxRandom(42, 3)
+        values = [sequential.random() for _ in range(BLOCK * 2 + 5)]
+
+        blocked = PhiloxRandom(42, 3)
+        first = blocked.block(7)
+        rest = blocked.block(BLOCK * 2 - 2)
+        assert list(first) + list(rest) == values
+        assert all(0 <= v < 1 for v in values)
+
+    def test_skip_matches_draws(self):
+        """Test que skip(n) et advance() reprennent le flux après n random()"""
+        for n in (0, 5, BLOCK - 3, BLOCK * 3 + 1):
+            drawn, skipped = PhiloxRandom(9, 2), PhiloxRandom(9, 2)
+            drawn.random()
+            skipped.random()
+            [drawn.random() for _ in range(n)]
+            skipped.skip(n)
+            assert skipped.random() == drawn.random()
+
+        drawn, advanced = random.Random(4), random.Random(4)
+        [drawn.random() for _ in range(7)]
+        advance(advanced, 7)
+        assert advanced.random() == drawn.random()
+
+    def test_shuffle_many_matches_shuffle(self):
+        """Test que les mélanges groupés donnent les mêmes permutations, flux par flux"""
+        lists = [list(range(n)) for n in (0, 1, 5, 12, 3)]
+        grouped = [items[:] for items in lists]
+        for index, items in enumerate(lists):
+            shuffle(PhiloxRandom(8, index), items)
+        shuffle_many([PhiloxRandom(8, index) for index in range(len(grouped))], grouped)
+
+        assert grouped == lists
+        assert sorted(lists[3]) == list(range(12)) and lists[3] != list(range(12))
+
+    def test_state_and_pickle_round_trip(self):
+        """Test que l'état sauvegardé et le pickle reprennent le flux au même point"""
+        rng = PhiloxRandom(7, 1)
+        [rng.random() for _ in range(BLOCK + 3)]
+        state = rng.getstate()
+        copy = pickle.loads(pickle.dumps(rng))
+        expected = [rng.randint(0, 100) for _ in range(BLOCK)]
+
+        assert [copy.randint(0, 100) for _ in range(BLOCK)] == expected
+        rng.setstate(state)
+        assert [rng.randint(0, 100) for _ in range(BLOCK)] == expected
+
+        rng.seed()
+        assert rng.random() == PhiloxRandom(7, 1).random()
+
+    def test_addresses_are_independent(self):
+        """Test que graine, index et usage désignent des flux distincts"""
+        streams = RngStreams(5)
+        draws = {
+            tuple(rng.getrandbits(64) for _ in range(4))
+            for rng in (streams.stream(0), streams.stream(1),
+                        streams.stream(0, Purpose.DECK), RngStreams(6).stream(0))
+        }
+        assert len(draws) == 4
+        assert streams.stream(2).random() == streams.streams(0, 3)[2].random()
+        assert streams.stream(0).substream(Purpose.REWARD).address == (5, 0, Purpose.REWARD)
+
+
+class TestReproducibleBatches:
+    """Tests de la reproductibilité des lots de simulations"""
+
+    def test_replay_single_combat(self):
+        """Test qu'un combat d'un lot se rejoue seul à partir de la graine du lot"""
+        simulator = CombatSimulator(seed=11)
+        summary = simulator.run_batch_simulation(30, generate_player_deck, generate_enemy_deck)
+
+        for index in (0, 17, 29):
+            replay = CombatSimulator(seed=0).replay_combat(
+                summary['seed'], index, generate_player_deck, generate_enemy_deck
+            )
+            original = summary['results'][index]
+            assert (replay.winner, replay.turns, replay.player_damage_dealt) == \
+                (original.winner, original.turns, original.player_damage_dealt)
+
+    def test_parallel_and_batched_match_serial(self):
+        """Test que les tranches en processus et le moteur vectorisé ne changent pas les issues"""
+        def outcomes(**kwargs):
+            summary = CombatSimulator(seed=3).run_batch_simulation(
+                40, generate_player_deck, generate_enemy_deck, **kwargs
+            )
+            return [(r.winner, r.turns) for r in summary['results']]
+
+        serial = outcomes()
+        assert outcomes(workers=2) == serial
+        assert outcomes(batch_size=16) == serial
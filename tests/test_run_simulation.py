@@ -0,0 +1,57 @@
+# tests/test_run_simulation.py
+"""Tests pour le simulateur de runs complètes"""
+
+import random
+
+from core.entities import Card, Biome, Rarity, RunState
+from core.progression import ActMap, MapNode, NodeType
+from core.run_simulation import RunSimulator, PreferredPath, LEVELS_PER_ACT
+
+
+def _weak_deck(card_db, rng):
+    return [Card("faible", "Faible", Biome.FORET, Rarity.COMMON, 1, 1, 1, 1)]
+
+
+class TestRunSimulator:
+    """Tests des runs en lockstep"""
+
+    def test_report_curves(self):
+        """Test des courbes de survie par acte"""
+        report = RunSimulator(seed=1, acts=2).simulate(40)
+
+        assert report.runs == 40 and len(report.results) == 40
+        curve = report.survival_curve()
+        assert len(curve) == 2 * LEVELS_PER_ACT
+        assert all(a >= b for a, b in zip(curve, curve[1:]))
+        assert report.victory_rate == curve[-1]
+        assert sum(report.deaths_by_node.values()) == 40 - sum(r.victory for r in report.results)
+
+    def test_independent_of_batching(self):
+        """Test que le découpage en paquets ne change pas les runs"""
+        first = RunSimulator(seed=5, acts=1).simulate(30)
+        second = RunSimulator(seed=5, acts=1, batch_size=4).simulate(30)
+
+        assert first.results == second.results
+
+    def test_weak_deck_dies(self):
+        """Test qu'une run meurt au premier combat perdu et perd ses cartes"""
+        report = RunSimulator(seed=2, acts=1, deck_factory=_weak_deck).simulate(10)
+
+        assert report.victory_rate == 0.0
+        assert all(r.levels_survived == 0 and r.death_node == "combat" for r in report.results)
+        assert report.survival[1][0] == 0.0
+
+
+class TestPathPolicies:
+    """Tests des politiques de chemin"""
+
+    def test_preferred_path(self):
+        """Test que le type le mieux classé est choisi"""
+        nodes = [MapNode(i, node_type, Biome.FORET, 0, 0)
+                 for i, node_type in enumerate([NodeType.COMBAT, NodeType.ELITE, NodeType.REST])]
+        act_map = ActMap(1, Biome.FORET, nodes)
+        run = RunState(current_deck=[])
+        policy = PreferredPath([NodeType.REST, NodeType.COMBAT])
+
+        assert policy.choose(act_map, [0, 1, 2], run, random.Random(0)) == 2
+        assert policy.choose(act_map, [0, 1], run, random.Random(0)) == 0
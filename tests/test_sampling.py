@@ -0,0 +1,84 @@
+# tests/test_sampling.py
+"""Tests pour le tirage pondéré de cartes"""
+
+import random
+from collections import Counter
+
+from core.catalog import CardCatalog
+from core.entities import Biome, Rarity, CardDatabase
+from core.sampling import AliasTable, CardSampler, RARITY_WEIGHTS
+
+
+class TestAliasTable:
+    """Tests de la table d'alias"""
+
+    def test_distribution_matches_weights(self):
+        """Test que les fréquences suivent les poids"""
+        table = AliasTable(["a", "b", "c"], [1, 2, 7])
+        rng = random.Random(0)
+
+        counts = Counter(table.draw(rng) for _ in range(20000))
+
+        assert abs(counts["a"] / 20000 - 0.1) < 0.01
+        assert abs(counts["b"] / 20000 - 0.2) < 0.015
+        assert abs(counts["c"] / 20000 - 0.7) < 0.015
+
+    def test_draw_exact_respects_allowed(self):
+        """Test du tirage restreint par bisect"""
+        table = AliasTable(["a", "b", "c"], [1, 2, 7])
+        rng = random.Random(1)
+
+        assert {table.draw_exact(rng, [0, 1]) for _ in range(200)} == {"a", "b"}
+
+
+class TestCardSampler:
+    """Tests du service de tirage sur le catalogue"""
+
+    def setup_method(self):
+        self.db = CardDatabase()
+        self.sampler = CardSampler(self.db.catalog)
+
+    def test_biome_pool_includes_neutral(self):
+        """Test que le pool d'un biome contient ses cartes et les neutres"""
+        table = self.sampler.table("reward", 1, Biome.VOLCAN)
+
+        assert {t.biome for t in table.items} == {Biome.VOLCAN, Biome.NEUTRE}
+        assert {t.rarity for t in table.items} <= set(RARITY_WEIGHTS["reward"][1])
+        assert self.sampler.table("reward", 1, Biome.VOLCAN) is table
+
+    def test_rarity_proportions(self):
+        """Test que les raretés gardent leurs poids malgré la taille des groupes"""
+        rng = random.Random(2)
+        drawn = self.sampler.draw_many(rng, 5000, "shop", 1, Biome.FORET, unique=False)
+
+        counts = Counter(t.rarity for t in drawn)
+        assert abs(counts[Rarity.COMMON] / 5000 - 0.60) < 0.03
+        assert abs(counts[Rarity.RARE] / 5000 - 0.05) < 0.015
+
+    def test_exclusions_and_unique(self):
+        """Test que les cartes exclues ou déjà tirées ne sortent pas"""
+        table = self.sampler.table("event", 1, Biome.DUNES)
+        ids = [t.id for t in table.items]
+        exclude = set(ids[:-3])
+
+        drawn = self.sampler.draw_many(random.Random(3), 10, "event", 1, Biome.DUNES, exclude)
+
+        assert sorted(t.id for t in drawn) == sorted(ids[-3:])
+
+    def test_everything_excluded(self):
+        """Test qu'un pool entièrement exclu ne donne rien"""
+        table = self.sampler.table("event", 1)
+        exclude = {t.id for t in table.items}
+
+        assert self.sampler.draw(random.Random(4), "event", 1, exclude=exclude) is None
+
+    def test_missing_rarity_is_skipped(self):
+        """Test qu'une rareté absente du pool ne fait pas échouer la table"""
+        templates = {card_id: t for card_id, t in self.db.catalog.templates.items()
+                     if t.rarity != Rarity.LEGENDARY}
+        sampler = CardSampler(CardCatalog({}, templates))
+
+        drawn = sampler.draw_many(random.Random(5), 3, "reward", 3, Biome.FORET)
+
+        assert len(drawn) == 3
+        assert {t.biome for t in drawn} <= {Biome.FORET, Biome.NEUTRE}
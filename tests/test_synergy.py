@@ -0,0 +1,89 @@
+# tests/test_synergy.py
+"""Tests pour la matrice de synergies"""
+
+import random
+from itertools import combinations
+
+import numpy as np
+
+from core.balance import CombatSimulator
+from core.synergy import SynergyMatrix
+from tests.test_balance import generate_player_deck, generate_enemy_deck
+
+
+class TestSynergyMatrix:
+    """Tests des co-occurrences et des scores"""
+
+    def test_counts_match_pairs(self):
+        """Test que les produits matriciels comptent comme une boucle sur les paires"""
+        rng = random.Random(0)
+        decks = [[f"c{rng.randint(0, 9)}" for _ in range(5)] for _ in range(200)]
+        won = [rng.random() < 0.5 for _ in decks]
+        matrix = SynergyMatrix(capacity=2)  # Force l'agrandissement
+        matrix.add_batch(decks[:150], won[:150])
+        matrix.add_batch(decks[150:], won[150:])
+
+        for a, b in combinations(sorted(matrix.ids), 2):
+            together = [w for deck, w in zip(decks, won) if a in deck and b in deck]
+            i, j = matrix.index[a], matrix.index[b]
+            assert matrix.plays[i, j] == matrix.plays[j, i] == len(together)
+            assert matrix.wins[i, j] == sum(together)
+        assert matrix.combats == 200 and matrix.victories == sum(won)
+
+    def test_merge(self):
+        """Test de la fusion de matrices aux vocabulaires différents"""
+        whole, first, second = SynergyMatrix(), SynergyMatrix(), SynergyMatrix(["z"])
+        batches = [([["a", "b"], ["b", "c"]], [True, False]), ([["c", "a"], ["z"]], [True, True])]
+        for decks, won in batches:
+            whole.add_batch(decks, won)
+        first.add_batch(*batches[0])
+        second.add_batch(*batches[1])
+        first.merge(second)
+
+        order = [first.index[card_id] for card_id in whole.ids]
+        n = len(whole)
+        assert np.array_equal(first.plays[np.ix_(order, order)], whole.plays[:n, :n])
+        assert np.array_equal(first.wins[np.ix_(order, order)], whole.wins[:n, :n])
+
+    def test_significant_synergy(self):
+        """Test qu'une paire gagnante est détectée et que le bruit est filtré"""
+        rng = random.Random(1)
+        decks, won = [], []
+        for _ in range(4000):
+            deck = rng.sample([f"c{i}" for i in range(8)], 3)
+            decks.append(deck)
+            won.append(True if {"c0", "c1"} <= set(deck) else rng.random() < 0.5)
+        matrix = SynergyMatrix()
+        matrix.add_batch(decks, won)
+
+        scores = matrix.scores(z=4.0)
+        assert list(scores) == [("c0", "c1")] and scores["c0", "c1"] > 0.2
+
+
+class TestSimulatorSynergies:
+    """Tests de calculate_synergies"""
+
+    def test_parallel_matches_serial(self):
+        """Test que la matrice fusionnée des processus est celle de la série"""
+        serial = CombatSimulator(seed=3)
+        serial.run_batch_simulation(40, generate_player_deck, generate_enemy_deck)
+        parallel = CombatSimulator(seed=3)
+        parallel.run_batch_simulation(40, generate_player_deck, generate_enemy_deck, workers=2)
+
+        n = len(serial.synergy)
+        order = [parallel.synergy.index[card_id] for card_id in serial.synergy.ids]
+        assert np.array_equal(parallel.synergy.plays[np.ix_(order, order)],
+                              serial.synergy.plays[:n, :n])
+        assert parallel.calculate_synergies(min_plays=5, z=0.5) == \
+            serial.calculate_synergies(min_plays=5, z=0.5)
+
+    def test_fills_card_statistics(self):
+        """Test que les scores sont reportés dans synergy_scores des deux cartes"""
+        simulator = CombatSimulator(seed=2)
+        simulator.run_batch_simulation(150, generate_player_deck, generate_enemy_deck)
+        synergies = simulator.calculate_synergies(min_plays=10, z=0.0)
+
+        assert synergies
+        for (a, b), score in synergies.items():
+            assert simulator.card_stats[a].synergy_scores[b] == score
+            assert simulator.card_stats[b].synergy_scores[a] == score
@@ -0,0 +1,61 @@
+# tests/test_targeting.py
+"""Tests pour les tables de ciblage"""
+
+from core.entities import CombatState
+from core.targeting import TARGET_TABLE, PIERCE, target_index, resolve_target
+from tests.conftest import make_card
+
+
+def _mask(*slots: int) -> int:
+    return sum(1 << slot for slot in slots)
+
+
+class TestTargetTable:
+    """Tests de la table (position, terrain adverse, drapeaux)"""
+
+    def test_table_matches_rules(self):
+        """Test que chaque entrée de la table suit les règles de ciblage"""
+        assert len(TARGET_TABLE) == 2 * 6 * 64
+        for flags in (0, PIERCE):
+            for position in range(6):
+                for occupancy in range(64):
+                    target = TARGET_TABLE[target_index(position, occupancy, flags)]
+                    assert target == resolve_target(position, occupancy, flags)
+                    assert (target == -1) == (occupancy == 0)
+
+    def test_front_and_back_lines(self):
+        """Test de l'ordre de recherche des lignes avant et arrière"""
+        occupancy = _mask(2, 4)
+
+        assert TARGET_TABLE[target_index(1, occupancy)] == 2
+        assert TARGET_TABLE[target_index(5, occupancy)] == 4
+        assert TARGET_TABLE[target_index(3, _mask(0))] == 0
+
+    def test_pierce_needs_back_slot(self):
+        """Test que Percée ne vise l'arrière que s'il est occupé"""
+        assert TARGET_TABLE[target_index(1, _mask(0, 1, 4), PIERCE)] == 4
+        assert TARGET_TABLE[target_index(1, _mask(0, 1), PIERCE)] == 0
+
+
+class TestWeakestSlot:
+    """Tests de l'index de la carte la plus faible (Bond)"""
+
+    def test_weakest_follows_damage_and_removal(self):
+        """Test que l'index suit les dégâts, les poses et les retraits"""
+        state = CombatState()
+        cards = [make_card(dur=5), make_card(dur=3), make_card(dur=3)]
+        for i, card in enumerate(cards):
+            state.enemy_field[i] = card
+
+        assert state.weakest_slot(False) == 1  # À égalité, le premier emplacement
+
+        state.damage_card(cards[0], 2)
+        assert state.weakest_slot(False) == 0
+
+        state.enemy_field[0] = None
+        assert state.weakest_slot(False) == 1
+
+        state.enemy_field[5] = make_card(dur=1)
+        assert state.weakest_slot(False) == 5
+        assert state.weakest_slot(True) == -1
+        state.check_aggregates()
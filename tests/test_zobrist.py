@@ -0,0 +1,102 @@
+# tests/test_zobrist.py
+"""Tests pour le hachage de Zobrist et la table de transposition"""
+
+from operator import itemgetter
+
+from core.entities import CombatState, StatusEffect, STATUS_INDEX
+from core.combat import CombatResolver
+from core.zobrist import TranspositionTable
+from tests.conftest import make_card
+
+
+class TestZobristHash:
+    """Tests du hash incrémental de CombatState"""
+
+    def test_hash_follows_mutations(self):
+        """Test que le hash incrémental suit un recalcul après chaque modification"""
+        state = CombatState()
+        card, other = make_card(dur=4), make_card("autre", dur=4)
+        empty = state.zobrist_hash()
+
+        state.player_field[0] = card
+        state.enemy_field[2] = other
+        placed = state.zobrist_hash()
+        assert placed != empty
+
+        state.damage_card(card, 1)
+        state.add_status(other, STATUS_INDEX[StatusEffect.FRACTURE], 1)
+        state.add_shields(card, 2)
+        state.set_atk(card, 5)
+        state.set_speed(other, 3)
+        state.check_aggregates()
+        assert state.zobrist_hash() != placed
+
+        state.player_field[0] = None
+        state.enemy_field[2] = None
+        assert state.zobrist_hash() == empty
+
+    def test_same_position_same_hash(self):
+        """Test que deux chemins vers la même position donnent le même hash"""
+        first, second = CombatState(), CombatState()
+        a, b = make_card(dur=4), make_card(dur=4)
+
+        first.player_field[0] = a
+        first.damage_card(a, 2)
+        second.player_field[0] = make_card(dur=2)
+        assert first.zobrist_hash() == second.zobrist_hash()
+
+        second.energy = 2
+        assert first.zobrist_hash() != second.zobrist_hash()
+
+        first.player_field[0] = None
+        first.player_field[1] = b
+        assert first.zobrist_hash() != CombatState(player_field=[b] + [None] * 5).zobrist_hash()
+
+    def test_combat_keeps_hash_in_sync(self):
+        """Test du hash pendant un combat et après restauration d'un instantané"""
+        state = CombatState()
+        state.deck = [make_card(f"h{i}", dur=4) for i in range(3)]
+        state.enemy_field[0] = make_card("e1", dur=6)
+        state.enemy_field[1] = make_card("e2", dur=3)
+        state.enemy_field[1].on_hit = [{"effect": StatusEffect.FRACTURE, "value": 1},
+                                       {"type": "shield", "value": 1}]
+        resolver = CombatResolver(state, rng_seed=1)
+        resolver.start_combat()
+        snapshot = resolver.snapshot()
+        before = state.zobrist_hash()
+
+        resolver.play_card(state.hand[0], 0)
+        resolver.process_turn()
+        state.check_aggregates()
+        assert state.zobrist_hash() != before
+
+        resolver.restore(snapshot)
+        assert state.zobrist_hash() == before
+
+
+class TestTranspositionTable:
+    """Tests de la table bornée et de sa politique de remplacement"""
+
+    def test_store_and_get(self):
+        """Test des lectures, mises à jour et compteurs"""
+        table = TranspositionTable(8)
+        table.store(1, "a")
+        table.store(1, "b")
+
+        assert table.get(1) == "b" and 1 in table and len(table) == 1
+        assert table.get(2, "absent") == "absent"
+        assert (table.hits, table.misses) == (1, 1)
+
+    def test_heaviest_entry_survives(self):
+        """Test que l'entrée la plus lourde d'un seau n'est pas évincée"""
+        table = TranspositionTable(2, weight=itemgetter(0))  # Un seul seau
+        heavy = [0]
+        table.store("lourd", heavy)
+        heavy[0] = 10  # Le poids est relu au remplacement
+
+        for i in range(5):
+            table.store(i, [i])
+
+        assert table.get("lourd") is heavy
+        assert table.get(4) == [4] and 3 not in table
+        assert len(table) == 2 and table.replacements == 4
@@ -7,9 +7,12 @@ from typing import List, Optional, Dict, Tuple, Any
 from dataclasses import dataclass
 import math
 import json
+from collections import deque
 
 from core.entities import Card, CombatState, RunState, Biome, StatusEffect
 from core.combat import CombatResolver
+from core.events import EventType
+from ui.animations import AnimationType
 
 # Configuration graphique
 SCREEN_WIDTH = 1280
@@ -125,6 +128,22 @@ class CardSprite:
                               str(value), WHITE, size=8)
                 status_x += 12
 
+# Animation déclenchée par chaque type d'événement de combat
+EVENT_ANIMATIONS: Dict[EventType, AnimationType] = {
+    EventType.DRAW: AnimationType.CARD_DRAW,
+    EventType.DEPLOY: AnimationType.CARD_PLAY,
+    EventType.ATTACK: AnimationType.ATTACK,
+    EventType.DAMAGE: AnimationType.DAMAGE,
+    EventType.SHIELD_BLOCK: AnimationType.SHIELD_BREAK,
+    EventType.CARAPACE: AnimationType.SHIELD_BREAK,
+    EventType.SHIELD_GAIN: AnimationType.BUFF,
+    EventType.STATUS_APPLY: AnimationType.STATUS_APPLY,
+    EventType.VENIN_TICK: AnimationType.DEBUFF,
+    EventType.BLEED: AnimationType.DEBUFF,
+    EventType.BURN: AnimationType.DEBUFF,
+    EventType.DEATH: AnimationType.DEATH,
+}
+
 class CombatScene:
     """Scène de combat"""
 
@@ -144,10 +163,16 @@ class CombatScene:
         self.animation_queue: List[Dict] = []
         self.animation_timer: float = 0
 
+        # Position de lecture dans le flux d'événements du résolveur
+        self.event_cursor: int = 0
+        self.combat_feed: deque = deque(maxlen=8)
+
     def init_combat(self, state: CombatState):
         """Initialise un nouveau combat"""
         self.state = state
         self.resolver = CombatResolver(state)
+        self.event_cursor = 0
+        self.combat_feed.clear()
         self.resolver.start_combat()
 
         # Créer les sprites pour la main
@@ -204,6 +229,10 @@ class CombatScene:
         for sprite in self.card_sprites.values():
             sprite.update(dt)
 
+        # Consommer les nouveaux événements de combat
+        if self.resolver:
+            self._consume_events()
+
         # Traiter la queue d'animations
         if self.animation_queue:
             self.animation_timer += dt
@@ -211,6 +240,16 @@ class CombatScene:
                 self.animation_queue.pop(0)
                 self.animation_timer = 0
 
+    def _consume_events(self):
+        """Transforme les nouveaux événements en animations et en texte"""
+        log = self.resolver.events
+        for sequence, event in log.events_since(self.event_cursor):
+            self.event_cursor = sequence + 1
+            self.combat_feed.append(log.format_event(event).strip())
+            animation = EVENT_ANIMATIONS.get(event.op)
+            if animation:
+                self.animation_queue.append({'type': animation, 'event': event})
+
     def _handle_click(self, mouse_pos: Tuple[int, int]):
         """Gère les clics souris"""
         # Sélection d'une carte en main
@@ -338,3 +377,8 @@ class CombatScene:
         # Instructions
         self.font.render_to(self.screen, (SCREEN_WIDTH - 200, 20),
                           "ESPACE: Fin de tour", LIGHT_GRAY, size=14)
+
+        # Derniers événements du combat
+        for i, line in enumerate(self.combat_feed):
+            self.font.render_to(self.screen, (SCREEN_WIDTH - 300, 60 + i * 18),
+                              line, LIGHT_GRAY, size=12)